@@ -2,5 +2,5 @@
 from .menu import Menu
 from .arquivo_midia import ArquivoDeMidia
 from .playlist import Playlist
-from .usuarios import Usuario
+from .usuario import Usuario
 from .analises import Analises
@@ -4,6 +4,7 @@
 import sys
 import os
 import math
+import heapq
 
 from datetime import datetime
 from pathlib import Path
@@ -12,14 +13,21 @@ from pathlib import Path
 # Evita dependências externas; assume que Musica, Playlist e Usuario
 # já estão definidos no pacote Streaming
 from .arquivo_midia import ArquivoDeMidia  # para contexto de tipos/atributos
+from .colunar import CatalogoColunar
+from .ranking import RankingReproducoes
+from .relatorio import (MotorRelatorio, ColetorResumo, ColetorTopMusicas, ColetorPlaylistPopular,
+                        ColetorUsuarioAtivo, ColetorMediasAvaliacoes)
 from .playlist import Playlist
-from .usuarios import Usuario  # seu arquivo chama 'usuarios.py' (classe Usuario)
+from .usuario import Usuario  # arquivo 'usuario.py' (classe Usuario)
 
 class Analises:
     """
     Classe que possui os métodos estáticos para análises.
     As saídas são destinadas a relatórios ou estatísticas.
     Apenas calcula a partir das coleções fornecidas, sem alterar o estado dos objetos.
+    No lugar da lista de músicas pode ser passado um CatalogoColunar
+    (CatalogoMidia.ativar_colunas): os agregados passam a ser calculados
+    sobre as colunas, de forma vetorizada quando o NumPy está instalado.
     """
 
     # Estatísticas e relatórios solicitados
@@ -27,13 +35,16 @@ class Analises:
     def top_musicas_reproduzidas(musicas, top_n = 10):
         """
         Retorna uma lista com as n = 10 músicas mais reproduzidas.
-        Critério: ordena por atributo  decrescente de reproducoes.
+        Critério: ordem decrescente de reproducoes (empates na ordem da lista).
+        Aceita também um RankingReproducoes (CatalogoMidia.ativar_ranking),
+        que responde sem percorrer o catálogo.
         """
-        # cópia para não alterar a lista original
-        ordenadas = list(musicas)
-        # ordena decrescente por 'reproducoes'; usa 0 se atributo não existir
-        ordenadas.sort(key=lambda m: m.reproducoes, reverse=True)
-        return ordenadas[:max(0, int(top_n))]
+        if isinstance(musicas, CatalogoColunar):
+            return musicas.top_reproduzidas(top_n)
+        if isinstance(musicas, RankingReproducoes):
+            return musicas.top(top_n)
+        # seleção parcial O(N log n): não copia nem ordena a lista inteira
+        return heapq.nlargest(max(0, int(top_n)), musicas, key=lambda m: m.reproducoes)
 
     @staticmethod
     def playlist_mais_popular(playlists):
@@ -53,18 +64,20 @@ class Analises:
         """
         if not usuarios:
             return None
-        return max(usuarios, key=lambda u: len(u.historico)) if usuarios else None
+        return max(usuarios, key=lambda u: u.total_reproducoes) if usuarios else None
 
     @staticmethod
     def media_avaliacoes(musicas):
         """
         Retorna um dicionário com as médias {titulo_da_musica: media_avaliacao(float)}.
         Média simples das notas em avaliacoes; se vazio, média 0.0.
+        Usa os agregados mantidos pela Musica (O(1) por música).
         """
+        if isinstance(musicas, CatalogoColunar):
+            return {m.titulo.strip(): media for m, media in zip(musicas, musicas.medias_avaliacoes())}
         medias = {}
         for m in musicas:
-            avals = m.avaliacoes or []
-            medias[m.titulo.strip()] = (sum(avals) / len(avals)) if avals else 0.0
+            medias[m.titulo.strip()] = m.media_avaliacoes()
         return medias
 
     @staticmethod
@@ -72,67 +85,28 @@ class Analises:
         """
         Retorna a total de reproduções feitas por todos os usuários.
         """
-        return sum(len(u.historico or []) for u in usuarios)
+        return sum(u.total_reproducoes for u in usuarios)
 
 
     @staticmethod
-    def salvar_relatorio(musicas, playlists, usuarios, top_n=10, pasta="Relatório", arquivo="relatorio.txt"):       
-
-        # Coletas a partir dos próprios métodos da classe
-        top = Analises.top_musicas_reproduzidas(musicas, top_n)
-        pl_pop = Analises.playlist_mais_popular(playlists)
-        user_ativo = Analises.usuario_mais_ativo(usuarios)
-        medias = Analises.media_avaliacoes(musicas)
-        total_rep = Analises.total_reproducoes(usuarios)
-
-        # Monta o texto
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        linhas = []
-        linhas.append("=== Relatório de Análises ===")
-        linhas.append(f"Gerado em: {ts}")
-        linhas.append("")
-        linhas.append("— Resumo —")
-        linhas.append(f"Total de usuários: {len(usuarios)}")
-        linhas.append(f"Total de músicas: {len(musicas)}")
-        linhas.append(f"Total de playlists: {len(playlists)}")
-        linhas.append(f"Total de reproduções (históricos de usuários): {total_rep}")
-        linhas.append("")
-
-        linhas.append(f"— Top {top_n} músicas por reproduções —")
-        if top:
-            for i, m in enumerate(top, start=1):
-                linhas.append(f"{i:02d}. '{m.titulo}' — {m.artista} | reproduções: {m.reproducoes}")
-        else:
-            linhas.append("Nenhuma música cadastrada.")
-        linhas.append("")
-
-        linhas.append("— Playlist mais popular —")
-        if pl_pop:
-            linhas.append(f"'{pl_pop.nome}' — criador: {pl_pop.usuario} | itens: {len(pl_pop)} | reproduções: {pl_pop.reproducoes}")
-        else:
-            linhas.append("Nenhuma playlist cadastrada.")
-        linhas.append("")
-
-        linhas.append("— Usuário mais ativo —")
-        if user_ativo:
-            linhas.append(f"{user_ativo.nome} — músicas no histórico: {len(getattr(user_ativo, 'historico', []))}")
-        else:
-            linhas.append("Nenhum usuário cadastrado.")
-        linhas.append("")
-
-        linhas.append("— Médias de avaliações por música —")
-        if medias:
-            for titulo, media in medias.items():
-                linhas.append(f"'{titulo}': {media:.2f}")
-        else:
-            linhas.append("Nenhuma música com avaliações.")
-        linhas.append("")
-
-        # Grava no arquivo Relatório/relatorio.txt
-        dirp = Path(pasta)
-        dirp.mkdir(parents=True, exist_ok=True)
-        destino = dirp / arquivo
-        destino.write_text("\n".join(linhas), encoding="utf-8")
-        return destino
+    def coletores_padrao(top_n=10, ranking=None, metricas=None) -> list:
+        """
+        Coletores das seções do relatório padrão, na ordem em que são gravadas.
+        Com metricas (MetricasIncrementais), só as médias por música percorrem a coleção.
+        """
+        return [ColetorResumo(metricas), ColetorTopMusicas(top_n, ranking, metricas),
+                ColetorPlaylistPopular(metricas), ColetorUsuarioAtivo(metricas), ColetorMediasAvaliacoes()]
 
- 
+    @staticmethod
+    def salvar_relatorio(musicas, playlists, usuarios, top_n=10, pasta="Relatório", arquivo="relatorio.txt",
+                         ranking=None, coletores=None, metricas=None):
+        """
+        Grava o relatório em pasta/arquivo e retorna o caminho.
+        Usa o MotorRelatorio: uma única passada por coleção alimenta todas as
+        métricas, e o texto é gravado linha a linha no arquivo.
+        coletores: coletores extras (ver relatorio.Coletor), gravados após as seções padrão.
+        metricas: MetricasIncrementais mantidas pelos eventos; o relatório passa a
+        custar O(tamanho da saída), sem percorrer usuários, históricos e playlists.
+        """
+        motor = MotorRelatorio(Analises.coletores_padrao(top_n, ranking, metricas) + list(coletores or []))
+        return motor.gerar(Path(pasta) / arquivo, usuarios=usuarios, musicas=musicas, playlists=playlists)
@@ -1,48 +1,152 @@
 # midia.py
 
+import sys
+from array import array
 from datetime import datetime
 from pathlib import Path
 
+from .catalogo import CatalogoMidia
+from .contadores import TravasParticionadas
+from .eventos import BarramentoEventos, MIDIA_REPRODUZIDA, MUSICA_AVALIADA
+from .registro_erros import registrar as _log_error
+from .saida import Saida, REPRODUZINDO
+
 class ArquivoDeMidia:
     """
     Classe de um arquivo de mídia genérico (música, podcast, álbum, etc.)
     A igualdade (__eq__) considera apenas título e artista, sendo case insensitive.
     Duração em segundos (int). Reproduções (int) inicia em zero.
     Atributos adicionais são definidos nas subclasses.
+    Usa __slots__ (sem __dict__ por instância) para catálogos com milhões de itens;
+    textos repetidos entre mídias (artista, gênero, host...) são internados (sys.intern).
     """
 
-    # Lista de instâncias de qualquer objeto de mídia
+    __slots__ = ("_catalogo", "_registro", "_titulo", "duracao", "_artista", "_reproducoes",
+                 "__weakref__")
+
+    # Catálogo ativo: registro das mídias (músicas e podcasts) com índices por título
     # Utilizado para busca por título da midia, tanto para música quanto podcast
     # Utilizado na classe playlist para verificar se a mídia existe 
-    # Atributo de classe (compartilhado por todas as instâncias)
-    registroMidia = []  
+    # Atributo de classe; o StreamingApp troca pelo seu próprio catálogo (usar_catalogo)
+    catalogo = CatalogoMidia()
+
+    # Travas do contador de reproduções (uma por faixa de mídias, não uma por mídia)
+    _travas = TravasParticionadas(64)
     
-    def __init__(self, titulo: str, duracao: int, artista: str, reproducoes: int = 0):
+    def __init__(self, titulo: str, duracao: int, artista: str, reproducoes: int = 0,
+                 catalogo: CatalogoMidia = None):
         
-        self.titulo = titulo
+        self._catalogo = None                # catálogo onde a mídia está cadastrada
+        self._registro = None                # referência usada pelo catálogo (posição no cadastro)
+        self._titulo = titulo
         self.duracao = duracao               # duração em segundos (int)
-        self.artista = artista
+        self._artista = sys.intern(artista or "")  # artista se repete em várias mídias: uma cópia só
         self.reproducoes = reproducoes       # contador de execuções iniciado em zero
    
-        # adiciona qualquer instância (música ou podcast) como objeto 
-        # em um registro geral de mídia
-        ArquivoDeMidia.registroMidia.append(self)
+        # cadastra qualquer instância (música ou podcast) no catálogo informado
+        # ou no catálogo ativo; o catálogo guarda só uma referência fraca
+        (catalogo if catalogo is not None else ArquivoDeMidia.catalogo).registrar(self)
+
+    # Troca o catálogo ativo (onde as novas mídias são cadastradas e buscadas)
+    @staticmethod
+    def usar_catalogo(catalogo: CatalogoMidia) -> CatalogoMidia:
+        """Define o catálogo ativo e retorna o anterior."""
+        anterior = ArquivoDeMidia.catalogo
+        ArquivoDeMidia.catalogo = catalogo
+        return anterior
+
+    # Título e artista são chaves do índice do catálogo:
+    # ao alterar qualquer um deles, a mídia é reindexada
+    @property
+    def titulo(self) -> str:
+        return self._titulo
+
+    @titulo.setter
+    def titulo(self, valor: str) -> None:
+        anterior = self._titulo
+        self._titulo = valor
+        if self._catalogo is not None:
+            self._catalogo.reindexar(self, anterior)
+
+    @property
+    def artista(self) -> str:
+        return self._artista
+
+    @artista.setter
+    def artista(self, valor: str) -> None:
+        self._artista = sys.intern(valor or "")
+        if self._catalogo is not None:
+            self._catalogo.reindexar(self)
+
+    # O ranking da busca depende das reproduções: o catálogo é avisado a cada alteração
+    @property
+    def reproducoes(self) -> int:
+        return self._reproducoes
+
+    @reproducoes.setter
+    def reproducoes(self, valor: int) -> None:
+        self._reproducoes = valor
+        if self._catalogo is not None:
+            self._catalogo.reproducoes_alteradas(self)
+
+    # 'reproducoes += n' é ler-somar-gravar: com várias threads tocando, perde incrementos
+    def incrementar_reproducoes(self, n: int = 1) -> int:
+        """Soma n às reproduções sem perder incrementos entre threads; retorna o novo valor."""
+        with self._travas.para(self):
+            valor = self._reproducoes = self._reproducoes + n
+        if self._catalogo is not None:
+            self._catalogo.reproducoes_alteradas(self)
+        return valor
+
+    # Campos usados pelo índice de busca por prefixo/substring
+    def campos_busca(self) -> tuple:
+        """Retorna os textos da mídia indexados pela busca (IndiceBusca)."""
+        return (self.titulo, self.artista)
 
+    # Métodos de busca no catálogo ativo (todas O(1) pelo índice)
     @classmethod
     def buscar_por_titulo(cls, titulo: str):
-        t = titulo.strip().lower()
-        for m in cls.registroMidia:
-            if m.titulo.strip().lower() == t:
-                return m
-        return None
+        """Retorna a primeira mídia cadastrada com o título (ignora espaços e case) ou None."""
+        return cls.catalogo.buscar(titulo)
+
+    @classmethod
+    def buscar_por_titulo_exato(cls, titulo: str):
+        """Retorna a mídia cujo título é exatamente o informado (respeita maiúsculas) ou None."""
+        return cls.catalogo.buscar_exato(titulo)
+
+    @classmethod
+    def buscar_todos_por_titulo(cls, titulo: str) -> list:
+        """Retorna todas as mídias com o título informado (ignora espaços e case)."""
+        return cls.catalogo.buscar_todos(titulo)
+
+    @classmethod
+    def buscar_por_titulo_artista(cls, titulo: str, artista: str):
+        """Retorna a mídia com o título e artista informados (ignora espaços e case) ou None."""
+        return cls.catalogo.buscar_por_titulo_artista(titulo, artista)
+
+    # Remove a mídia do catálogo onde ela está cadastrada
+    @classmethod
+    def remover_do_registro(cls, midia) -> bool:
+        """Retira a mídia do cadastro. Retorna True se removeu, False se não estava cadastrada."""
+        if midia._catalogo is None:
+            return False
+        return midia._catalogo.remover(midia)
    
     # Métodos obrigatórios especiais
     # Simula a execução do arquivo de mídia, mostra na tela as informações 
     # contendo título, artista e duração
-    def reproduzir(self) -> None:
-        """Simula a execução do arquivo de mídia, incrementando reproduções e exibindo info."""
-        self.reproducoes += 1
-        print(f"-> Reproduzindo: '{self.titulo}' — {self.artista} de {self.duracao} segundos. (Total de reproduções: {self.reproducoes})")
+    def reproduzir(self, usuario=None, playlist=None, exibir: bool = True) -> None:
+        """
+        Simula a execução do arquivo de mídia, incrementando reproduções e exibindo info.
+        usuario/playlist: quem ouviu e de qual playlist (opcionais, vão no evento).
+        exibir=False: só conta a reprodução (ouvintes simulados do ReprodutorAssincrono).
+        A linha "Reproduzindo" vai para a saída ativa (Saida.ativa), não direto para o print.
+        """
+        valor = self.incrementar_reproducoes()
+        BarramentoEventos.ativo.publicar(MIDIA_REPRODUZIDA, self, usuario, playlist)
+        if exibir:
+            Saida.ativa.emitir(REPRODUZINDO, titulo=self.titulo, artista=self.artista,
+                               duracao=self.duracao, reproducoes=valor)
 
     #  Compara dois arquivos de mídia (mesmo título e artista).
     def __eq__(self, other) -> bool:
@@ -74,15 +178,100 @@ class Musica(ArquivoDeMidia):
     """
     Classe música.
     - genero: string (Rock, Pop, Rap, Clássico, etc.)
-    - avaliacoes: lista com notas inteiras de 0 a 5
+    - avaliacoes: notas inteiras de 0 a 5, guardadas em array de bytes
+      (1 byte por nota); o array só é criado na primeira avaliação
+    Acima de LIMITE_NOTAS avaliações, mantém também um histograma (quantidade
+    de cada nota 0 a 5); quantidade, média, distribuição e percentis são
+    calculados sobre ele ou sobre no máximo LIMITE_NOTAS notas, ou seja, O(1).
+    Com Musica.guardar_avaliacoes = False (ou descartar_avaliacoes()) só o
+    histograma é guardado: a memória deixa de crescer com o volume de notas.
     """
 
+    __slots__ = ("genero", "_avaliacoes", "_histograma")
+
+    # Guarda as notas individuais além do histograma (False: só o histograma)
+    guardar_avaliacoes = True
+    # Até esse número de notas os agregados são calculados direto das notas
+    # (músicas pouco avaliadas não pagam a memória do histograma)
+    LIMITE_NOTAS = 16
+
     def __init__(self, titulo: str, duracao: int, artista: str,
                  genero: str = "Desconhecido", reproducoes: int = 0,
-                 avaliacoes=None):
-        super().__init__(titulo, duracao, artista, reproducoes)
-        self.genero = (genero or "Não informado").strip().title()
-        self.avaliacoes = list(avaliacoes) if isinstance(avaliacoes, list) else []
+                 avaliacoes=None, catalogo: CatalogoMidia = None):
+        # Atributos próprios antes do super(): o cadastro no catálogo
+        # (feito em ArquivoDeMidia.__init__) já indexa o gênero na busca
+        self.genero = sys.intern((genero or "Não informado").strip().title())
+        self._avaliacoes = None
+        self._histograma = None
+        if avaliacoes:
+            self._definir_notas(avaliacoes)
+        super().__init__(titulo, duracao, artista, reproducoes, catalogo)
+
+    # Notas em array('B'); aceita qualquer iterável de inteiros de 0 a 5.
+    # Se as notas individuais não são guardadas, retorna uma cópia montada
+    # a partir do histograma (em ordem crescente de nota).
+    # Novas notas devem ser registradas com avaliar().
+    @property
+    def avaliacoes(self) -> array:
+        if self._avaliacoes is not None:
+            return self._avaliacoes
+        notas = array("B")
+        for nota, qtd in enumerate(self._histograma or ()):
+            notas.extend(array("B", [nota]) * qtd)
+        return notas
+
+    @avaliacoes.setter
+    def avaliacoes(self, notas) -> None:
+        self._definir_notas(notas)
+        if self._catalogo is not None:
+            self._catalogo.avaliacoes_alteradas(self)
+
+    def _definir_notas(self, notas) -> None:
+        validas = self._notas_validas(notas)
+        self._histograma = None
+        self._avaliacoes = validas or None
+        if not validas:
+            return
+        if not self.guardar_avaliacoes:
+            self.descartar_avaliacoes()
+        elif len(validas) > self.LIMITE_NOTAS:
+            self._criar_histograma()
+
+    def _criar_histograma(self) -> None:
+        notas = self._avaliacoes or ()
+        self._histograma = array("Q", (notas.count(n) for n in range(6)))
+
+    @staticmethod
+    def _notas_validas(notas) -> array:
+        return array("B", (n for n in notas if isinstance(n, int) and 0 <= n <= 5))
+
+    def definir_distribuicao(self, contagens) -> None:
+        """
+        Troca as avaliações pela quantidade de cada nota (posição 0 a 5, como em
+        distribuicao_avaliacoes()), ex.: ao carregar de um banco que guarda só o
+        histograma. Até LIMITE_NOTAS avaliações as notas são remontadas em ordem
+        crescente; acima disso fica só o histograma.
+        """
+        contagens = array("Q", contagens)
+        if len(contagens) != 6:
+            raise ValueError(f"Distribuição com {len(contagens)} posições (esperado 6, notas de 0 a 5).")
+        total = sum(contagens)
+        if self.guardar_avaliacoes and total <= self.LIMITE_NOTAS:
+            self._definir_notas([nota for nota, qtd in enumerate(contagens) for _ in range(qtd)])
+        else:
+            self._avaliacoes = None
+            self._histograma = contagens if total else None
+        if self._catalogo is not None:
+            self._catalogo.avaliacoes_alteradas(self)
+
+    def descartar_avaliacoes(self) -> None:
+        """Libera as notas individuais; agregados continuam disponíveis pelo histograma."""
+        if self._histograma is None and self._avaliacoes:
+            self._criar_histograma()
+        self._avaliacoes = None
+
+    def campos_busca(self) -> tuple:
+        return (self.titulo, self.artista, self.genero)
 
     def avaliar(self, nota: int) -> bool:
         """
@@ -96,27 +285,88 @@ class Musica(ArquivoDeMidia):
         if nota < 0 or nota > 5:
             _log_error(f"Musica.avaliar: nota fora do intervalo 0 a 5 ({nota}) para '{self.titulo}'.")
             return False
-       
-        self.avaliacoes.append(nota)
+
+        if self._avaliacoes is not None:
+            self._avaliacoes.append(nota)
+            if self._histograma is not None:
+                self._histograma[nota] += 1
+            elif len(self._avaliacoes) > self.LIMITE_NOTAS:
+                self._criar_histograma()
+        elif self._histograma is not None:
+            self._histograma[nota] += 1
+        elif self.guardar_avaliacoes:
+            self._avaliacoes = array("B", [nota])
+        else:
+            self._histograma = array("Q", bytes(48))
+            self._histograma[nota] += 1
+        if self._catalogo is not None:
+            self._catalogo.avaliacoes_alteradas(self, nota)
+        BarramentoEventos.ativo.publicar(MUSICA_AVALIADA, self, nota)
         return True
 
+    # Agregados das avaliações (O(1): histograma de 6 posições ou até LIMITE_NOTAS notas)
+    def _contagens(self):
+        if self._histograma is not None:
+            return self._histograma
+        notas = self._avaliacoes
+        return [notas.count(n) for n in range(6)] if notas else None
+
+    @property
+    def quantidade_avaliacoes(self) -> int:
+        if self._histograma is None:
+            return len(self._avaliacoes or ())
+        return sum(self._histograma)
+
+    @property
+    def soma_avaliacoes(self) -> int:
+        if self._histograma is None:
+            return sum(self._avaliacoes or ())
+        return sum(n * q for n, q in enumerate(self._histograma))
+
+    def media_avaliacoes(self) -> float:
+        """Média das notas (0.0 se não há avaliações)."""
+        qtd = self.quantidade_avaliacoes
+        return self.soma_avaliacoes / qtd if qtd else 0.0
+
+    def distribuicao_avaliacoes(self) -> list:
+        """Quantidade de avaliações de cada nota: posição 0 a 5."""
+        contagens = self._contagens()
+        return list(contagens) if contagens else [0] * 6
+
+    def percentil_avaliacoes(self, p: float) -> int | None:
+        """
+        Menor nota tal que pelo menos p% das avaliações são menores ou iguais a ela
+        (p=50: mediana). Retorna None se não há avaliações.
+        """
+        qtd = self.quantidade_avaliacoes
+        if not qtd:
+            return None
+        alvo = max(1, -(-qtd * min(max(p, 0), 100) // 100))
+        acumulado = 0
+        for nota, q in enumerate(self._contagens()):
+            acumulado += q
+            if acumulado >= alvo:
+                return nota
+        return 5
+
     # Métodos obrigatórios gerais
     # ToString
     def __str__(self) -> str:
-        # Calcula a média das avaliações
-        avg = sum(self.avaliacoes) / len(self.avaliacoes) if self.avaliacoes else 0
+        # Média das avaliações pelo histograma (não percorre as notas)
+        qtd = self.quantidade_avaliacoes
+        avg = self.media_avaliacoes()
         # Formata a string com as informações da música
         return (f"[Música] '{self.titulo}' — {self.artista} | "
             f"Gênero: {self.genero} | "
             f"Duração: {self.duracao}s | "
             f"Reproduções: {self.reproducoes} | "
-            f"Avaliações: {len(self.avaliacoes)} (média {avg:.2f})")
+            f"Avaliações: {qtd} (média {avg:.2f})")
 
     # Representação oficial
     def __repr__(self) -> str:
         return (f"Musica(titulo='{self.titulo}', duracao={self.duracao}, artista='{self.artista}', "
                 f"genero='{self.genero}', reproducoes={self.reproducoes}, "
-                f"avaliacoes={self.avaliacoes})")
+                f"avaliacoes={list(self.avaliacoes)})")
 
 
 # Subclasse obrigatória: Podcast
@@ -128,18 +378,24 @@ class Podcast(ArquivoDeMidia):
     - host: string com o nome do apresentador
     """
 
+    __slots__ = ("episodio", "temporada", "host")
+
     def __init__(self, titulo: str, duracao: int, artista: str,
                  episodio: int, temporada: str, host: str,
-                 reproducoes: int = 0):
-        super().__init__(titulo, duracao, artista, reproducoes)
-
+                 reproducoes: int = 0, catalogo: CatalogoMidia = None):
         if not isinstance(episodio, int) or episodio < 1:
-            _log_error(f"Podcast: número de episódio inválido '{episodio}' para '{self.titulo}'; ajustando para 1.")
+            _log_error(f"Podcast: número de episódio inválido '{episodio}' para '{titulo}'; ajustando para 1.")
             episodio = 1
 
+        # Atributos próprios antes do super(): o cadastro no catálogo
+        # (feito em ArquivoDeMidia.__init__) já indexa host e temporada na busca
         self.episodio = episodio
-        self.temporada = (temporada or "Temporada").strip()
-        self.host = (host or "Não informado").strip()
+        self.temporada = sys.intern((temporada or "Temporada").strip())
+        self.host = sys.intern((host or "Não informado").strip())
+        super().__init__(titulo, duracao, artista, reproducoes, catalogo)
+
+    def campos_busca(self) -> tuple:
+        return (self.titulo, self.host, self.temporada)
 
     # Métodos obrigatórios gerais
     # ToString
@@ -156,13 +412,14 @@ class Podcast(ArquivoDeMidia):
                 f"reproducoes={self.reproducoes})")
 
 
+# Teste rápido ao executar o módulo diretamente (python -m Streaming.arquivo_midia)
+if __name__ == "__main__":
+    m1 = Musica("Yesterday", 125, "The Beatles")
+    m2 = Musica("Bohemian Rhapsody", 354, "Queen")
 
-m1 = Musica("Yesterday", 125, "The Beatles")
-m2 = Musica("Bohemian Rhapsody", 354, "Queen")
-
-print(len(ArquivoDeMidia.registroMidia))  
-# 2 (porque temos duas mídias criadas)
+    print(len(ArquivoDeMidia.catalogo))
+    # 2 (porque temos duas mídias criadas)
 
-achada = ArquivoDeMidia.buscar_por_titulo("Yesterday")
-print(achada)
-# imprime a instância de Musica "Yesterday"
\ No newline at end of file
+    achada = ArquivoDeMidia.buscar_por_titulo("Yesterday")
+    print(achada)
+    # imprime a instância de Musica "Yesterday"
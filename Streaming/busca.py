@@ -0,0 +1,302 @@
+# Streaming/busca.py
+
+import heapq
+import unicodedata
+import weakref
+from array import array
+from itertools import compress, repeat
+from operator import contains
+
+# Separador entre os campos de uma mídia no texto indexado.
+# Nunca aparece em uma consulta, então não há casamento atravessando campos.
+SEPARADOR = "\x1f"
+
+# Tamanho máximo dos prefixos de palavras indexados (busca por prefixo/autocompletar)
+TAMANHO_PREFIXO = 4
+
+
+def normalizar_busca(texto: str) -> str:
+    """Normaliza texto para busca: minúsculas, sem acentos e sem espaços extras."""
+    texto = (texto or "").lower()
+    if not texto.isascii():
+        texto = "".join(c for c in unicodedata.normalize("NFKD", texto)
+                        if not unicodedata.combining(c))
+    return " ".join(texto.split())
+
+
+def _termos(campos) -> tuple:
+    """
+    Retorna (texto indexado, trigramas, prefixos das palavras) dos campos.
+    No texto indexado toda palavra é precedida por espaço, então
+    "alguma palavra começa com q" equivale a " " + q estar no texto.
+    """
+    trigramas, prefixos = set(), set()
+    normalizados = []
+    for campo in campos:
+        c = normalizar_busca(campo)
+        normalizados.append(c)
+        for i in range(len(c) - 2):
+            trigramas.add(c[i:i + 3])
+        for palavra in c.split():
+            for n in range(1, min(len(palavra), TAMANHO_PREFIXO) + 1):
+                prefixos.add(palavra[:n])
+    return " " + f" {SEPARADOR} ".join(normalizados), trigramas, prefixos
+
+
+class IndiceBusca:
+    """
+    Índice de busca por prefixo e substring sobre os campos das mídias
+    (Musica: título/artista/gênero; Podcast: título/host/temporada),
+    com ranking top-k por 'reproducoes'.
+
+    O índice tem duas camadas:
+    - principal: documentos numerados em ordem decrescente de reproduções
+      (no momento da última ordenação), com listas de ids em arrays ('I').
+      Como as listas estão em ordem de ranking, a busca para assim que
+      encontra k resultados.
+    - delta: mídias adicionadas ou reproduzidas desde a última ordenação,
+      em dicionários de conjuntos; são poucas e ranqueadas com heap.
+    Uma mídia reproduzida sai da camada principal (vira lápide) e passa
+    para a delta, então o ranking é sempre exato. Quando a delta cresce
+    demais, o índice é reordenado (reordenar()).
+    Assim como o catálogo, o índice guarda só referências fracas às mídias.
+
+    Busca por substring usa a lista do trigrama mais raro da consulta;
+    busca por prefixo usa a lista dos prefixos (até 4 letras) das palavras.
+    Em ambos os casos o casamento é confirmado no texto normalizado.
+    """
+
+    # Fração do índice que a camada delta (e as lápides) podem ocupar antes da reordenação
+    LIMITE_DELTA = 0.25
+
+    def __init__(self, midias=()):
+        # Camada principal
+        self._docs = []              # documento -> weakref da mídia, ou None (lápide)
+        self._textos = []
+        self._doc_por_midia = {}     # id(midia) -> documento na camada principal
+        self._trigramas = {}
+        self._prefixos = {}
+        self._lapides = 0
+        # Camada delta
+        self._delta = {}             # id(midia) -> (weakref, texto, trigramas, prefixos)
+        self._delta_trigramas = {}
+        self._delta_prefixos = {}
+
+        for m in sorted(midias, key=lambda m: m.reproducoes, reverse=True):
+            self._indexar_principal(m)
+
+    def _indexar_principal(self, midia) -> None:
+        doc = len(self._docs)
+        texto, trigramas, prefixos = _termos(midia.campos_busca())
+        self._docs.append(weakref.ref(midia))
+        self._textos.append(texto)
+        self._doc_por_midia[id(midia)] = doc
+        for t in trigramas:
+            lista = self._trigramas.get(t)
+            if lista is None:
+                lista = self._trigramas[t] = array("I")
+            lista.append(doc)
+        for p in prefixos:
+            lista = self._prefixos.get(p)
+            if lista is None:
+                lista = self._prefixos[p] = array("I")
+            lista.append(doc)
+
+    def _indexar_delta(self, midia) -> None:
+        texto, trigramas, prefixos = _termos(midia.campos_busca())
+        chave = id(midia)
+        self._delta[chave] = (weakref.ref(midia), texto, trigramas, prefixos)
+        for t in trigramas:
+            self._delta_trigramas.setdefault(t, set()).add(chave)
+        for p in prefixos:
+            self._delta_prefixos.setdefault(p, set()).add(chave)
+
+    def _tirar_delta(self, chave) -> bool:
+        item = self._delta.pop(chave, None)
+        if item is None:
+            return False
+        _, _, trigramas, prefixos = item
+        for indice, termos in ((self._delta_trigramas, trigramas), (self._delta_prefixos, prefixos)):
+            for t in termos:
+                conjunto = indice.get(t)
+                if conjunto is not None:
+                    conjunto.discard(chave)
+                    if not conjunto:
+                        del indice[t]
+        return True
+
+    def _tirar_principal(self, chave) -> bool:
+        doc = self._doc_por_midia.pop(chave, None)
+        if doc is None:
+            return False
+        self._docs[doc] = None
+        self._textos[doc] = ""
+        self._lapides += 1
+        return True
+
+    # Métodos de atualização incremental
+    # Indexa uma nova mídia (entra na camada delta)
+    def adicionar(self, midia) -> None:
+        """Indexa a mídia. Indexar a mesma instância duas vezes não tem efeito."""
+        chave = id(midia)
+        if chave in self._doc_por_midia or chave in self._delta:
+            return
+        self._indexar_delta(midia)
+        self._verificar_limite()
+
+    # Remove a mídia do índice
+    def remover(self, midia) -> bool:
+        """Remove a mídia do índice. Retorna True se removeu, False se não estava indexada."""
+        return self.remover_chave(id(midia))
+
+    def remover_chave(self, chave) -> bool:
+        """Remove pelo id da mídia (usado pelo catálogo quando a mídia já foi coletada)."""
+        return self._tirar_principal(chave) or self._tirar_delta(chave)
+
+    # Reindexa uma mídia após alteração nos campos de busca
+    def atualizar(self, midia) -> None:
+        """Atualiza o índice após mudança nos textos da mídia (título, artista, gênero...)."""
+        if self.remover(midia):
+            self.adicionar(midia)
+
+    # Chamado quando as reproduções da mídia mudam (o ranking dela deixa de ser o da ordenação)
+    def marcar_alterada(self, midia) -> None:
+        """Move a mídia para a camada delta, onde é ranqueada pelo valor atual de reproduções."""
+        chave = id(midia)
+        if chave in self._delta or chave not in self._doc_por_midia:
+            return
+        self._tirar_principal(chave)
+        self._indexar_delta(midia)
+        self._verificar_limite()
+
+    def _verificar_limite(self) -> None:
+        if len(self._delta) + self._lapides > max(1024, self.LIMITE_DELTA * len(self._docs)):
+            self.reordenar()
+
+    def reordenar(self) -> None:
+        """
+        Reconstrói a camada principal com todas as mídias, na ordem atual de reproduções.
+        Os textos não são processados de novo: as listas da camada principal são
+        renumeradas para a nova ordem e as da delta (termos já calculados) entram nelas.
+        """
+        vivos = []   # (mídia, documento antigo ou None, item da delta ou None)
+        for doc, ref in enumerate(self._docs):
+            m = ref() if ref is not None else None
+            if m is not None:
+                vivos.append((m, doc, None))
+        for item in self._delta.values():
+            m = item[0]()
+            if m is not None:
+                vivos.append((m, None, item))
+        vivos.sort(key=lambda v: v[0].reproducoes, reverse=True)
+
+        novo = [-1] * len(self._docs)   # documento antigo -> novo (-1: lápide ou coletada)
+        docs, textos, doc_por_midia = [], [], {}
+        entradas_trigramas, entradas_prefixos = {}, {}
+        for n, (m, doc, item) in enumerate(vivos):
+            doc_por_midia[id(m)] = n
+            if doc is not None:
+                novo[doc] = n
+                docs.append(self._docs[doc])
+                textos.append(self._textos[doc])
+            else:
+                ref, texto, trigramas, prefixos = item
+                docs.append(ref)
+                textos.append(texto)
+                for t in trigramas:
+                    entradas_trigramas.setdefault(t, []).append(n)
+                for p in prefixos:
+                    entradas_prefixos.setdefault(p, []).append(n)
+
+        self._docs, self._textos, self._doc_por_midia = docs, textos, doc_por_midia
+        self._trigramas = self._renumerar(self._trigramas, novo, entradas_trigramas)
+        self._prefixos = self._renumerar(self._prefixos, novo, entradas_prefixos)
+        self._lapides = 0
+        self._delta, self._delta_trigramas, self._delta_prefixos = {}, {}, {}
+
+    @staticmethod
+    def _renumerar(indice: dict, novo: list, entradas: dict) -> dict:
+        # Listas na nova numeração (em ordem, como exige a busca), sem lápides
+        resultado = {}
+        for termo in indice.keys() | entradas.keys():
+            docs = [d for d in map(novo.__getitem__, indice.get(termo, ())) if d >= 0]
+            docs.extend(entradas.get(termo, ()))
+            if docs:
+                docs.sort()
+                resultado[termo] = array("I", docs)
+        return resultado
+
+    # Métodos de consulta
+    def buscar(self, consulta: str, k: int = 10, prefixo: bool = False, tipo=None) -> list:
+        """
+        Retorna as k mídias mais reproduzidas que casam com a consulta.
+        - prefixo=False: a consulta pode estar em qualquer posição dos campos.
+        - prefixo=True: alguma palavra de algum campo começa com a consulta.
+        - tipo: classe opcional para filtrar (ex.: Musica ou Podcast).
+        Consultas com menos de 3 letras são sempre tratadas como prefixo.
+        """
+        q = normalizar_busca(consulta)
+        if not q or k <= 0:
+            return []
+        if prefixo or len(q) < 3:
+            # Prefixo da primeira palavra: a lista já é um filtro quase exato
+            agulha = " " + q
+            chave = q.split()[0][:TAMANHO_PREFIXO]
+            lista = self._prefixos.get(chave, ())
+            chaves_delta = self._delta_prefixos.get(chave, ())
+        else:
+            agulha = q
+            lista = self._menor_lista(q, self._trigramas)
+            chaves_delta = self._menor_lista(q, self._delta_trigramas) if self._delta else ()
+
+        # Camada principal: lista em ordem de ranking, para nos k primeiros válidos.
+        # O teste "agulha in texto" roda em C (compress/map); lápides têm texto vazio.
+        textos = self._textos
+        achados = compress(lista, map(contains, map(textos.__getitem__, lista), repeat(agulha)))
+        docs = self._docs
+        resultado = []
+        for d in achados:
+            m = docs[d]()
+            if m is None:
+                continue
+            if tipo is None or isinstance(m, tipo):
+                resultado.append(m)
+                if len(resultado) == k:
+                    break
+
+        # Camada delta: poucas mídias, ranqueadas pelo valor atual
+        for chave_midia in chaves_delta:
+            ref, texto, _, _ = self._delta[chave_midia]
+            m = ref()
+            if m is not None and agulha in texto and (tipo is None or isinstance(m, tipo)):
+                resultado.append(m)
+        return heapq.nlargest(k, resultado, key=lambda m: m.reproducoes)
+
+    def autocompletar(self, prefixo: str, k: int = 10, tipo=None) -> list:
+        """Sugestões para o que o usuário está digitando (busca por prefixo)."""
+        return self.buscar(prefixo, k=k, prefixo=True, tipo=tipo)
+
+    # Escolhe a lista do trigrama mais raro da consulta
+    @staticmethod
+    def _menor_lista(q: str, indice: dict):
+        menor = None
+        for i in range(len(q) - 2):
+            lista = indice.get(q[i:i + 3])
+            if lista is None:
+                # Trigrama inexistente: nenhuma mídia pode casar
+                return ()
+            if menor is None or len(lista) < len(menor):
+                menor = lista
+        return menor
+
+    # Métodos especiais
+    def __len__(self):
+        """Retorna a quantidade de mídias indexadas."""
+        return len(self._doc_por_midia) + len(self._delta)
+
+    def __str__(self):
+        return (f"Índice de busca | {len(self)} mídias | "
+                f"{len(self._trigramas)} trigramas | {len(self._delta)} na camada delta")
+
+    def __repr__(self):
+        return f"IndiceBusca(midias={len(self)}, delta={len(self._delta)})"
@@ -0,0 +1,367 @@
+# Streaming/catalogo.py
+
+import bisect
+import threading
+import weakref
+
+from .busca import IndiceBusca
+from .colunar import CatalogoColunar
+from .ranking import RankingReproducoes
+
+
+def normalizar_titulo(texto: str) -> str:
+    """Normaliza um título/artista para busca: ignora espaços nas pontas e case."""
+    return (texto or "").strip().lower()
+
+
+class _Ref(weakref.ref):
+    """Referência fraca que também guarda a posição da mídia no catálogo."""
+
+    __slots__ = ("chave_id", "posicao", "coluna")
+
+
+def _posicao(ref) -> int:
+    return ref.posicao
+
+
+class CatalogoMidia:
+    """
+    Registro e índice do catálogo de mídias (músicas e podcasts).
+    Cada StreamingApp possui o seu; o catálogo ativo (ArquivoDeMidia.catalogo)
+    é onde as novas mídias são cadastradas.
+    Mantém um índice baseado em dicionário:
+        _por_titulo (dict): título normalizado -> mídia, ou lista se o título se repete
+    Só títulos repetidos ocupam uma lista (economia de memória em catálogos
+    grandes). As listas preservam a ordem de cadastro, então a primeira mídia
+    é a primeira cadastrada (mesmo resultado da antiga busca linear).
+    A busca por título é O(1). A busca por (título, artista) não tem chave
+    composta (economiza um índice por item): filtra as mídias com o mesmo
+    título, então custa O(quantidade de mídias com aquele título), e não O(1);
+    não depende do tamanho do catálogo.
+
+    O catálogo guarda apenas referências fracas (weakref): quando ninguém
+    mais usa a mídia (app, playlists, parser), ela é coletada e sai dos
+    índices sozinha. Também há ciclo de vida explícito: registrar,
+    remover e limpar.
+    Opcionalmente mantém um IndiceBusca (prefixo/substring), ativado com ativar_busca(),
+    um CatalogoColunar (colunas para análises), ativado com ativar_colunas(),
+    e um RankingReproducoes (placar das mais reproduzidas), ativado com ativar_ranking().
+    Com um carregador (ex.: PersistenciaSQLite), buscar() consulta o carregador
+    quando o título não está no catálogo: as mídias entram sob demanda.
+    Cadastro, remoção e os avisos de reprodução passam por uma trava do
+    catálogo: mídias tocadas por várias threads não corrompem os índices.
+    """
+
+    def __init__(self):
+        self._ordem = []       # _Ref das mídias em ordem de cadastro (None = removida)
+        self._removidas = 0
+        self._coletadas = 0    # mídias coletadas cuja referência morta ainda está em _por_titulo
+        self._por_titulo = {}
+        self.busca = None      # IndiceBusca, criado sob demanda por ativar_busca()
+        self.colunas = None    # CatalogoColunar, criado sob demanda por ativar_colunas()
+        self.ranking = None    # RankingReproducoes, criado sob demanda por ativar_ranking()
+        self.carregador = None # função titulo -> mídia ou None, chamada quando buscar() não acha
+        self._trava = threading.RLock()
+        # Um só callback para todas as referências (evita um método ligado por mídia)
+        self._callback = self._coletada
+
+    # Cria o índice de busca com as mídias atuais; depois ele é mantido a cada cadastro
+    def ativar_busca(self) -> IndiceBusca:
+        """Ativa (se necessário) e retorna o índice de busca por prefixo/substring."""
+        if self.busca is None:
+            self._guardar_ids()
+            self.busca = IndiceBusca(self)
+        return self.busca
+
+    # Cria as colunas com as mídias atuais do tipo informado; depois são mantidas a cada cadastro
+    def ativar_colunas(self, tipo=None) -> CatalogoColunar:
+        """Ativa (se necessário) e retorna o armazenamento colunar (ex.: tipo=Musica)."""
+        if self.colunas is None:
+            self.colunas = CatalogoColunar(tipo)
+            for ref in self._ordem:
+                if ref is not None:
+                    self.colunas.adicionar(ref)
+        return self.colunas
+
+    # Cria o placar com as mídias atuais do tipo informado; depois é mantido a cada reprodução
+    def ativar_ranking(self, tipo=None, capacidade: int = 50) -> RankingReproducoes:
+        """Ativa (se necessário) e retorna o placar das mídias mais reproduzidas."""
+        if self.ranking is None:
+            self._guardar_ids()
+            self.ranking = RankingReproducoes(self, tipo, capacidade)
+        return self.ranking
+
+    # Métodos de ciclo de vida
+    # Cadastra a mídia nos índices
+    def registrar(self, midia) -> None:
+        """
+        Adiciona a mídia ao catálogo. Registrar a mesma instância duas vezes não tem efeito.
+        Uma mídia pertence a um só catálogo: se estava em outro, sai dele.
+        """
+        anterior = midia._catalogo
+        if anterior is self:
+            return
+        if anterior is not None:
+            anterior.remover(midia)
+        with self._trava:
+            self._registrar(midia)
+
+    def _registrar(self, midia) -> None:
+        # O callback roda quando a mídia é coletada: o id ainda não foi reutilizado
+        ref = _Ref(midia, self._callback)
+        ref.chave_id = id(midia) if self._usa_ids() else None
+        ref.posicao = len(self._ordem)
+        ref.coluna = None
+        self._ordem.append(ref)
+        self._incluir(self._por_titulo, normalizar_titulo(midia.titulo), ref)
+        midia._catalogo = self
+        midia._registro = ref
+        if self.busca is not None:
+            self.busca.adicionar(midia)
+        if self.colunas is not None:
+            self.colunas.adicionar(ref)
+        if self.ranking is not None:
+            self.ranking.adicionar(midia)
+
+    # Retira a mídia dos índices
+    def remover(self, midia) -> bool:
+        """
+        Remove a mídia do catálogo pelo título atual (a chave do índice).
+        Retorna True se removeu, False se a mídia não estava no catálogo.
+        """
+        with self._trava:
+            return self._tirar(midia, normalizar_titulo(midia.titulo))
+
+    def _tirar(self, midia, chave: str) -> bool:
+        if midia._catalogo is not self:
+            return False
+        self._descartar(self._por_titulo, chave, midia._registro)
+        self._esquecer(midia._registro)
+        midia._catalogo = None
+        midia._registro = None
+        return True
+
+    # Esvazia o catálogo (ex.: antes de recarregar os arquivos .md)
+    def limpar(self) -> None:
+        """Remove todas as mídias do catálogo."""
+        with self._trava:
+            for m in self:
+                m._catalogo = None
+                m._registro = None
+            self._ordem.clear()
+            self._removidas = 0
+            self._coletadas = 0
+            self._por_titulo.clear()
+            if self.busca is not None:
+                self.busca = IndiceBusca()
+            if self.colunas is not None:
+                self.colunas = CatalogoColunar(self.colunas.tipo)
+            if self.ranking is not None:
+                self.ranking = RankingReproducoes(self, self.ranking.tipo, self.ranking.capacidade)
+
+    # Atualiza as chaves de uma mídia cujo título ou artista mudou
+    def reindexar(self, midia, titulo_anterior: str = None) -> None:
+        """
+        Atualiza os índices após alteração de título ou artista (feito
+        automaticamente) ou de outro campo indexado, como gênero, host ou
+        duração. Se o título mudou, titulo_anterior é a chave antiga.
+        A mídia mantém a posição de cadastro (na iteração e entre as mídias
+        de mesmo título).
+        """
+        with self._trava:
+            if midia._catalogo is not self:
+                return
+            ref = midia._registro
+            chave = normalizar_titulo(midia.titulo)
+            antiga = chave if titulo_anterior is None else normalizar_titulo(titulo_anterior)
+            if antiga != chave:
+                self._descartar(self._por_titulo, antiga, ref)
+                self._incluir(self._por_titulo, chave, ref)
+            if self.busca is not None:
+                self.busca.atualizar(midia)
+            if self.colunas is not None:
+                self.colunas.remover(ref)
+                self.colunas.adicionar(ref)
+
+    # Avisa os índices que dependem do ranking que as reproduções da mídia mudaram
+    def reproducoes_alteradas(self, midia) -> None:
+        """Chamado pela mídia a cada alteração em 'reproducoes' (de qualquer thread)."""
+        with self._trava:
+            # O valor é lido com a trava: o último aviso sempre deixa o valor mais novo
+            if self.busca is not None:
+                self.busca.marcar_alterada(midia)
+            if self.colunas is not None and midia._registro is not None:
+                self.colunas.atualizar_reproducoes(midia._registro, midia.reproducoes)
+            if self.ranking is not None:
+                self.ranking.alterada(midia)
+
+    # Avisa as colunas de notas (nota=None: todas as notas foram trocadas)
+    def avaliacoes_alteradas(self, midia, nota: int = None) -> None:
+        """Chamado pela música a cada avaliação registrada."""
+        if self.colunas is None:
+            return
+        if nota is None:
+            self.colunas.atualizar_notas(midia._registro)
+        else:
+            self.colunas.registrar_nota(midia._registro, nota)
+
+    def _coletada(self, ref) -> None:
+        # Só esquece se a referência ainda é a vigente (não foi removida antes)
+        with self._trava:
+            if ref.posicao < len(self._ordem) and self._ordem[ref.posicao] is ref:
+                # A chave do título não fica na referência: a entrada morta sai
+                # do índice na próxima compactação (e as buscas a ignoram)
+                self._coletadas += 1
+                self._esquecer(ref)
+
+    def _esquecer(self, ref) -> None:
+        self._ordem[ref.posicao] = None
+        self._removidas += 1
+        if self.busca is not None:
+            self.busca.remover_chave(ref.chave_id)
+        if self.colunas is not None:
+            self.colunas.remover(ref)
+        if self.ranking is not None:
+            self.ranking.remover_chave(ref.chave_id)
+        # Compacta a lista de ordem quando metade são lacunas
+        if self._removidas * 2 > len(self._ordem):
+            self._ordem = [r for r in self._ordem if r is not None]
+            for i, r in enumerate(self._ordem):
+                r.posicao = i
+            self._removidas = 0
+            if self._coletadas:
+                self._varrer_titulos()
+
+    def _varrer_titulos(self) -> None:
+        # Tira do índice de títulos as referências de mídias já coletadas
+        indice = self._por_titulo
+        for chave, atual in list(indice.items()):
+            if type(atual) is not list:
+                if atual() is None:
+                    del indice[chave]
+                continue
+            vivas = [r for r in atual if r() is not None]
+            if len(vivas) > 1:
+                atual[:] = vivas
+            elif vivas:
+                indice[chave] = vivas[0]
+            else:
+                del indice[chave]
+        self._coletadas = 0
+
+    # Os índices opcionais (busca, ranking) identificam a mídia pelo id, inclusive
+    # depois de coletada: o id só é guardado na referência enquanto algum deles existe
+    def _usa_ids(self) -> bool:
+        return self.busca is not None or self.ranking is not None
+
+    def _guardar_ids(self) -> None:
+        if self._usa_ids():
+            return
+        for ref in self._ordem:
+            m = ref() if ref is not None else None
+            if m is not None:
+                ref.chave_id = id(m)
+
+    @staticmethod
+    def _incluir(indice: dict, chave, ref) -> None:
+        # As listas ficam em ordem de cadastro (posição); quem acabou de ser cadastrado vai no fim
+        atual = indice.get(chave)
+        # Uma referência morta (mídia coletada) no lugar é substituída
+        if atual is None or (type(atual) is not list and atual() is None):
+            indice[chave] = ref
+        elif type(atual) is list:
+            bisect.insort(atual, ref, key=_posicao)
+        else:
+            indice[chave] = [atual, ref] if atual.posicao < ref.posicao else [ref, atual]
+
+    @staticmethod
+    def _descartar(indice: dict, chave, ref) -> None:
+        atual = indice.get(chave)
+        if atual is ref:
+            del indice[chave]
+        elif type(atual) is list:
+            for i, r in enumerate(atual):
+                if r is ref:
+                    del atual[i]
+                    break
+            # Volta a guardar a referência direta quando sobra uma só
+            if len(atual) == 1:
+                indice[chave] = atual[0]
+
+    @staticmethod
+    def _refs(indice: dict, chave) -> tuple:
+        atual = indice.get(chave)
+        if atual is None:
+            return ()
+        return tuple(atual) if type(atual) is list else (atual,)
+
+    @staticmethod
+    def _primeira(indice: dict, chave):
+        atual = indice.get(chave)
+        if atual is None:
+            return None
+        if type(atual) is not list:
+            return atual()
+        for ref in atual:
+            m = ref()
+            if m is not None:
+                return m
+        return None
+
+    # Métodos de busca
+    # Busca case insensitive: retorna a primeira mídia cadastrada com o título
+    def buscar(self, titulo: str):
+        """Retorna a primeira mídia com o título (ignora espaços e case) ou None."""
+        midia = self._primeira(self._por_titulo, normalizar_titulo(titulo))
+        if midia is None and self.carregador is not None:
+            midia = self.carregador(titulo)
+        return midia
+
+    # Busca exata: respeita maiúsculas/minúsculas, ignora apenas espaços nas pontas
+    def buscar_exato(self, titulo: str):
+        """Retorna a primeira mídia cujo título é exatamente igual ao informado ou None."""
+        t = (titulo or "").strip()
+        for ref in self._refs(self._por_titulo, normalizar_titulo(t)):
+            m = ref()
+            if m is not None and m.titulo.strip() == t:
+                return m
+        return None
+
+    # Busca múltipla: todas as mídias com o mesmo título (ex.: versões de artistas diferentes)
+    def buscar_todos(self, titulo: str) -> list:
+        """Retorna a lista de todas as mídias com o título informado."""
+        refs = self._refs(self._por_titulo, normalizar_titulo(titulo))
+        return [m for m in (r() for r in refs) if m is not None]
+
+    # Busca por título e artista: filtra as mídias com o mesmo título normalizado
+    def buscar_por_titulo_artista(self, titulo: str, artista: str):
+        """Retorna a primeira mídia com o título e artista informados (ignora espaços e case) ou None."""
+        artista = normalizar_titulo(artista)
+        for ref in self._refs(self._por_titulo, normalizar_titulo(titulo)):
+            m = ref()
+            if m is not None and normalizar_titulo(m.artista) == artista:
+                return m
+        return None
+
+    # Métodos especiais
+    def __iter__(self):
+        """Percorre as mídias cadastradas, em ordem de cadastro."""
+        for ref in list(self._ordem):
+            m = ref() if ref is not None else None
+            if m is not None:
+                yield m
+
+    def __len__(self):
+        """Retorna a quantidade de mídias cadastradas."""
+        return len(self._ordem) - self._removidas
+
+    def __contains__(self, midia):
+        """Permite usar 'midia in catalogo' (por identidade do objeto)."""
+        return getattr(midia, "_catalogo", None) is self
+
+    def __str__(self):
+        return (f"Catálogo de mídias | {len(self)} mídias | "
+                f"{len(self._por_titulo)} títulos distintos")
+
+    def __repr__(self):
+        return f"CatalogoMidia(midias={len(self)}, titulos={len(self._por_titulo)})"
@@ -0,0 +1,147 @@
+# Streaming/colunar.py
+
+import heapq
+from array import array
+
+# NumPy é opcional: com ela os agregados são vetorizados sobre os próprios
+# arrays (sem cópia, via buffer); sem ela, usa as funções nativas do Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CatalogoColunar:
+    """
+    Armazenamento colunar das mídias para análises rápidas em catálogos grandes.
+    Cada coluna é um array contíguo de inteiros de 64 bits, indexado pela posição da mídia:
+        duracao, reproducoes, soma_notas, qtd_notas
+    É mantido pelo CatalogoMidia (ver CatalogoMidia.ativar_colunas): cadastro,
+    remoção, reproduções e avaliações atualizam as colunas na hora.
+    Cada posição guarda também a referência do cadastro (_Ref) para recuperar a mídia.
+    Apenas mídias do tipo informado (ex.: Musica) entram nas colunas.
+    """
+
+    COLUNAS = ("duracao", "reproducoes", "soma_notas", "qtd_notas")
+
+    def __init__(self, tipo=None):
+        self.tipo = tipo
+        self._refs = []
+        for nome in self.COLUNAS:
+            setattr(self, nome, array("q"))
+
+    # Métodos de manutenção (chamados pelo CatalogoMidia)
+    def adicionar(self, ref) -> None:
+        """Inclui a mídia referenciada, se for do tipo da loja; guarda a posição em ref.coluna."""
+        midia = ref()
+        if midia is None or (self.tipo is not None and not isinstance(midia, self.tipo)):
+            return
+        ref.coluna = len(self._refs)
+        self._refs.append(ref)
+        soma, qtd = self._notas(midia)
+        self.duracao.append(int(midia.duracao or 0))
+        self.reproducoes.append(int(midia.reproducoes or 0))
+        self.soma_notas.append(soma)
+        self.qtd_notas.append(qtd)
+
+    def remover(self, ref) -> None:
+        """Retira a mídia movendo a última posição para o buraco (O(1))."""
+        i = ref.coluna
+        if i is None:
+            return
+        ultima = len(self._refs) - 1
+        if i != ultima:
+            movida = self._refs[ultima]
+            self._refs[i] = movida
+            movida.coluna = i
+            for nome in self.COLUNAS:
+                coluna = getattr(self, nome)
+                coluna[i] = coluna[ultima]
+        self._refs.pop()
+        for nome in self.COLUNAS:
+            getattr(self, nome).pop()
+        ref.coluna = None
+
+    def atualizar_reproducoes(self, ref, valor: int) -> None:
+        if ref.coluna is not None:
+            self.reproducoes[ref.coluna] = int(valor)
+
+    def registrar_nota(self, ref, nota: int) -> None:
+        """Soma uma nova nota da mídia (O(1))."""
+        if ref.coluna is not None:
+            self.soma_notas[ref.coluna] += nota
+            self.qtd_notas[ref.coluna] += 1
+
+    def atualizar_notas(self, ref) -> None:
+        """Recalcula soma e quantidade de notas da mídia (após trocar todas as notas)."""
+        midia = ref()
+        if ref.coluna is not None and midia is not None:
+            self.soma_notas[ref.coluna], self.qtd_notas[ref.coluna] = self._notas(midia)
+
+    @staticmethod
+    def _notas(midia) -> tuple:
+        # Agregados da Musica (histograma); outras mídias não têm avaliações
+        return getattr(midia, "soma_avaliacoes", 0), getattr(midia, "quantidade_avaliacoes", 0)
+
+    # Agregados
+    def top_reproduzidas(self, n: int = 10) -> list:
+        """
+        As n mídias com mais reproduções, em ordem decrescente
+        (empates na ordem das posições, como numa ordenação estável).
+        """
+        n = max(0, min(int(n), len(self._refs)))
+        if n == 0:
+            return []
+        if np is not None:
+            rep = np.frombuffer(self.reproducoes, dtype=np.int64)
+            # Valor de corte do top-n; depois completa os empates pela posição
+            corte = np.partition(rep, len(rep) - n)[len(rep) - n]
+            maiores = np.flatnonzero(rep > corte)
+            iguais = np.flatnonzero(rep == corte)[:n - len(maiores)]
+            posicoes = np.concatenate((maiores, iguais))
+            posicoes = posicoes[np.lexsort((posicoes, -rep[posicoes]))].tolist()
+            del rep
+        else:
+            posicoes = heapq.nlargest(n, range(len(self._refs)), key=self.reproducoes.__getitem__)
+        return [self._refs[i]() for i in posicoes]
+
+    def medias_avaliacoes(self) -> list:
+        """Média das notas de cada posição (0.0 se a mídia não tem avaliações)."""
+        if np is not None and self._refs:
+            soma = np.frombuffer(self.soma_notas, dtype=np.int64)
+            qtd = np.frombuffer(self.qtd_notas, dtype=np.int64)
+            medias = np.divide(soma, qtd, out=np.zeros(len(qtd)), where=qtd > 0).tolist()
+            del soma, qtd
+            return medias
+        return [s / q if q else 0.0 for s, q in zip(self.soma_notas, self.qtd_notas)]
+
+    def total_reproducoes(self) -> int:
+        """Soma das reproduções de todas as mídias da loja."""
+        if np is not None and self._refs:
+            return int(np.frombuffer(self.reproducoes, dtype=np.int64).sum())
+        return sum(self.reproducoes)
+
+    def duracao_total(self) -> int:
+        """Soma das durações (segundos) de todas as mídias da loja."""
+        if np is not None and self._refs:
+            return int(np.frombuffer(self.duracao, dtype=np.int64).sum())
+        return sum(self.duracao)
+
+    # Métodos especiais
+    def __len__(self):
+        """Retorna a quantidade de mídias nas colunas."""
+        return len(self._refs)
+
+    def __iter__(self):
+        """Percorre as mídias na ordem das posições."""
+        for ref in list(self._refs):
+            m = ref()
+            if m is not None:
+                yield m
+
+    def __str__(self):
+        motor = "NumPy" if np is not None else "array"
+        return f"Catálogo colunar | {len(self)} mídias | agregados via {motor}"
+
+    def __repr__(self):
+        return f"CatalogoColunar(midias={len(self)}, numpy={np is not None})"
@@ -0,0 +1,105 @@
+# Streaming/contadores.py
+
+import threading
+import weakref
+
+
+class TravasParticionadas:
+    """
+    Conjunto fixo de travas (striped locks): cada objeto usa a trava da sua
+    faixa (pelo id), então objetos diferentes quase nunca disputam a mesma
+    trava e nenhum objeto precisa guardar a sua (as mídias usam __slots__ e
+    podem ser milhões). Usado pelo contador 'reproducoes' de ArquivoDeMidia.
+    """
+
+    def __init__(self, quantidade: int = 64):
+        # Potência de 2: a faixa sai de uma máscara de bits
+        n = 1
+        while n < quantidade:
+            n *= 2
+        self._travas = tuple(threading.Lock() for _ in range(n))
+        self._mascara = n - 1
+
+    def para(self, objeto) -> threading.Lock:
+        """Trava da faixa do objeto (os 4 bits baixos do id são alinhamento, sempre iguais)."""
+        return self._travas[(id(objeto) >> 4) & self._mascara]
+
+    def __len__(self):
+        return len(self._travas)
+
+    def __repr__(self):
+        return f"TravasParticionadas(quantidade={len(self._travas)})"
+
+
+class _Marca:
+    """Guardada no threading.local de cada thread: é coletada quando a thread termina."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _recolher(ref_contador, fragmento) -> None:
+    contador = ref_contador()
+    if contador is not None:
+        contador._recolher(fragmento)
+
+
+class ContadorFragmentado:
+    """
+    Contador com um fragmento por thread, somados na leitura.
+    Cada thread só escreve no seu fragmento, então incrementar não usa trava
+    e nenhum incremento se perde; ler custa O(threads vivas que já incrementaram).
+    Quando uma thread termina, o fragmento dela é somado à base e descartado,
+    então threads de vida curta não acumulam fragmentos.
+    Bom para poucos contadores muito disputados (ex.: reproduções de uma
+    playlist popular tocada por várias threads).
+    """
+
+    __slots__ = ("_estado", "_local", "_trava", "__weakref__")
+
+    def __init__(self, valor: int = 0):
+        # (base, fragmentos): trocado inteiro sob a trava, então a leitura não precisa dela
+        self._estado = (int(valor), ())
+        self._local = threading.local()
+        self._trava = threading.Lock() # só para trocar _estado
+
+    def incrementar(self, n: int = 1) -> None:
+        try:
+            fragmento = self._local.fragmento
+        except AttributeError:
+            fragmento = self._novo_fragmento()
+        fragmento[0] += n
+
+    def _novo_fragmento(self) -> list:
+        fragmento = [0]
+        marca = _Marca()
+        with self._trava:
+            base, fragmentos = self._estado
+            self._estado = (base, fragmentos + (fragmento,))
+        self._local.fragmento = fragmento
+        self._local.marca = marca
+        # A thread termina -> o threading.local solta a marca -> o fragmento vai para a base
+        # (referência fraca ao contador: a thread não o mantém vivo)
+        weakref.finalize(marca, _recolher, weakref.ref(self), fragmento)
+        return fragmento
+
+    def _recolher(self, fragmento: list) -> None:
+        with self._trava:
+            base, fragmentos = self._estado
+            self._estado = (base + fragmento[0], tuple(f for f in fragmentos if f is not fragmento))
+
+    @property
+    def valor(self) -> int:
+        base, fragmentos = self._estado
+        return base + sum(f[0] for f in fragmentos)
+
+    def definir(self, valor: int) -> None:
+        """Passa a valer 'valor' (incrementos simultâneos a esta chamada são mantidos)."""
+        with self._trava:
+            base, fragmentos = self._estado
+            self._estado = (int(valor) - sum(f[0] for f in fragmentos), fragmentos)
+
+    def __int__(self):
+        return self.valor
+
+    def __repr__(self):
+        return f"ContadorFragmentado(valor={self.valor}, fragmentos={len(self._estado[1])})"
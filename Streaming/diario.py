@@ -0,0 +1,257 @@
+# Streaming/diario.py
+
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from . import eventos
+
+# Formato do segmento: cabeçalho MAGICO e depois registros colados, cada um
+# começando pelo tipo (1 byte). Nomes (mídia, usuário, playlist) aparecem uma
+# vez por segmento num registro NOME e depois são referidos pelo número;
+# cada segmento pode ser lido sozinho.
+MAGICO = b"SPLOG\x00\x01\n"
+NOME = 1         # (número, tamanho) + texto utf-8
+REPRODUCAO = 2   # (instante em µs, mídia, usuário, playlist); 0 = sem usuário/playlist
+HISTORICO = 3    # (instante em µs, usuário, título)
+
+_NOME = struct.Struct("<BIH")
+_REPRODUCAO = struct.Struct("<BqIII")
+_HISTORICO = struct.Struct("<BqII")
+_SEPARADOR = "\x1f"   # entre título e artista no nome da mídia
+
+
+class DiarioReproducoes:
+    """
+    Diário (log só de acréscimos) das reproduções, em arquivos binários:
+        - cada reprodução de mídia (ArquivoDeMidia.reproduzir): mídia, usuário,
+          playlist de onde veio (se houver) e instante
+        - cada registro no histórico (Usuario.registrar_reproducao): usuário, título e instante
+    Os eventos chegam pelo barramento e vão para um buffer na memória; o buffer
+    é gravado de uma vez (group commit, com fsync se sincronizar=True) a cada
+    'lote' eventos ou a cada 'intervalo_ms' (thread de fundo). Depois de uma
+    gravação, o segmento que passou de 'tamanho_segmento' bytes é fechado e um
+    novo começa (reproducoes-000001.log, reproducoes-000002.log...).
+    reaplicar() relê os segmentos e reconstrói 'reproducoes' das mídias e
+    'historico' dos usuários.
+    Em caso de queda, perde-se no máximo o buffer ainda não gravado; um registro
+    cortado no fim do último segmento é ignorado na leitura.
+    """
+
+    def __init__(self, pasta="dados/reproducoes", barramento=None, lote: int = 4096,
+                 intervalo_ms: float = 50, tamanho_segmento: int = 64 << 20, sincronizar: bool = True):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.barramento = barramento if barramento is not None else eventos.BarramentoEventos.ativo
+        self.lote = lote
+        self.intervalo_ms = intervalo_ms
+        self.tamanho_segmento = tamanho_segmento
+        self.sincronizar = sincronizar
+        self.eventos_gravados = 0
+        self.gravacoes = 0
+        self._trava = threading.Lock()
+        self._buffer = bytearray()
+        self._pendentes = 0
+        self._arquivo = None
+        self._numero = max((self._numero_segmento(p) for p in self.segmentos()), default=0)
+        self._abrir_segmento()
+        for evento, funcao in self._inscricoes():
+            self.barramento.inscrever(evento, funcao)
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._gravar_periodicamente, name="diario-reproducoes", daemon=True)
+        self._thread.start()
+
+    def _inscricoes(self) -> tuple:
+        return ((eventos.MIDIA_REPRODUZIDA, self.registrar_reproducao),
+                (eventos.REPRODUCAO_REGISTRADA, self.registrar_historico))
+
+    # Métodos de segmentos
+    def segmentos(self) -> list:
+        """Arquivos de segmento, do mais antigo ao mais novo."""
+        return sorted(self.pasta.glob("reproducoes-*.log"), key=self._numero_segmento)
+
+    @staticmethod
+    def _numero_segmento(caminho: Path) -> int:
+        return int(caminho.stem.rsplit("-", 1)[1])
+
+    def _abrir_segmento(self) -> None:
+        # Sempre um segmento novo: o anterior pode ter terminado num registro cortado
+        self._numero += 1
+        self._arquivo = open(self.pasta / f"reproducoes-{self._numero:06d}.log", "ab", buffering=0)
+        self._arquivo.write(MAGICO)
+        self._tamanho = len(MAGICO)
+        self._nomes = {}   # texto -> número neste segmento
+
+    # Métodos de registro (chamados pelos eventos)
+    def _numero_nome(self, texto: str) -> int:
+        # Chamado com a trava: registra o nome no segmento na primeira vez
+        numero = self._nomes.get(texto)
+        if numero is None:
+            numero = self._nomes[texto] = len(self._nomes) + 1
+            # Corta em 64 KiB sem partir um caractere de vários bytes ao meio
+            dados = texto.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+            self._buffer += _NOME.pack(NOME, numero, len(dados))
+            self._buffer += dados
+        return numero
+
+    def registrar_reproducao(self, midia, usuario=None, playlist=None) -> None:
+        """Registra uma reprodução da mídia (evento MIDIA_REPRODUZIDA)."""
+        instante = time.time_ns() // 1000
+        with self._trava:
+            nomes = self._nomes
+            chave = midia.titulo + _SEPARADOR + midia.artista
+            n_midia = nomes.get(chave) or self._numero_nome(chave)
+            n_usuario = 0 if usuario is None else (nomes.get(usuario.nome) or self._numero_nome(usuario.nome))
+            n_playlist = 0 if playlist is None else (nomes.get(playlist.nome) or self._numero_nome(playlist.nome))
+            self._buffer += _REPRODUCAO.pack(REPRODUCAO, instante, n_midia, n_usuario, n_playlist)
+            self._pendentes += 1
+            if self._pendentes >= self.lote:
+                self._gravar()
+
+    def registrar_historico(self, usuario, musica) -> None:
+        """Registra a entrada no histórico do usuário (evento REPRODUCAO_REGISTRADA)."""
+        instante = time.time_ns() // 1000
+        titulo = str(getattr(musica, "titulo", musica))
+        with self._trava:
+            n_usuario = self._nomes.get(usuario.nome) or self._numero_nome(usuario.nome)
+            n_titulo = self._nomes.get(titulo) or self._numero_nome(titulo)
+            self._buffer += _HISTORICO.pack(HISTORICO, instante, n_usuario, n_titulo)
+            self._pendentes += 1
+            if self._pendentes >= self.lote:
+                self._gravar()
+
+    # Métodos de gravação
+    def gravar(self) -> None:
+        """Grava agora o que está no buffer (group commit)."""
+        with self._trava:
+            self._gravar()
+
+    def _gravar(self) -> None:
+        if not self._buffer:
+            return
+        self._arquivo.write(self._buffer)
+        if self.sincronizar:
+            os.fsync(self._arquivo.fileno())
+        self._tamanho += len(self._buffer)
+        self.eventos_gravados += self._pendentes
+        self.gravacoes += 1
+        self._buffer = bytearray()
+        self._pendentes = 0
+        if self._tamanho >= self.tamanho_segmento:
+            self._arquivo.close()
+            self._abrir_segmento()
+
+    def _gravar_periodicamente(self) -> None:
+        while not self._parar.wait(self.intervalo_ms / 1000):
+            if self._pendentes:
+                self.gravar()
+
+    def fechar(self) -> None:
+        """Grava o buffer, para a thread, cancela as inscrições e fecha o segmento."""
+        self._parar.set()
+        self._thread.join()
+        for evento, funcao in self._inscricoes():
+            self.barramento.cancelar(evento, funcao)
+        with self._trava:
+            if self._pendentes:
+                self._gravar()
+            self._arquivo.close()
+            if self._tamanho == len(MAGICO):   # segmento sem eventos
+                Path(self._arquivo.name).unlink(missing_ok=True)
+
+    # Métodos de leitura
+    def ler(self):
+        """
+        Gera os eventos gravados, do mais antigo ao mais novo:
+            ("reproducao", instante_us, (titulo, artista), usuario ou None, playlist ou None)
+            ("historico", instante_us, usuario, titulo)
+        """
+        for caminho in self.segmentos():
+            yield from self._ler_segmento(caminho.read_bytes())
+
+    @staticmethod
+    def _ler_segmento(dados: bytes):
+        if not dados.startswith(MAGICO):
+            return
+        nomes = [None]
+        pos = len(MAGICO)
+        fim = len(dados)
+        reproducao, historico, nome = _REPRODUCAO.size, _HISTORICO.size, _NOME.size
+        while pos < fim:
+            tipo = dados[pos]
+            if tipo == REPRODUCAO and pos + reproducao <= fim:
+                _, instante, m, u, p = _REPRODUCAO.unpack_from(dados, pos)
+                pos += reproducao
+                titulo, _, artista = nomes[m].partition(_SEPARADOR)   # nome cortado: sem o artista
+                yield ("reproducao", instante, (titulo, artista),
+                       nomes[u] if u else None, nomes[p] if p else None)
+            elif tipo == HISTORICO and pos + historico <= fim:
+                _, instante, u, t = _HISTORICO.unpack_from(dados, pos)
+                pos += historico
+                yield ("historico", instante, nomes[u], nomes[t])
+            elif tipo == NOME and pos + nome <= fim:
+                _, numero, tamanho = _NOME.unpack_from(dados, pos)
+                if pos + nome + tamanho > fim:
+                    return
+                nomes.append(dados[pos + nome:pos + nome + tamanho].decode("utf-8"))
+                pos += nome + tamanho
+            else:
+                return   # registro cortado (queda durante a gravação)
+
+    def reaplicar(self, catalogo, usuarios=(), zerar: bool = True) -> dict:
+        """
+        Reconstrói 'reproducoes' das mídias do catálogo (CatalogoMidia) e o
+        'historico' dos usuários a partir do diário. Com zerar=True os valores
+        atuais são descartados (o diário é a fonte); senão, são somados.
+        Retorna as quantidades aplicadas e as que não acharam mídia/usuário.
+        """
+        self.gravar()
+        contagem = Counter()
+        historicos = {}
+        for evento in self.ler():
+            if evento[0] == "reproducao":
+                contagem[evento[2]] += 1
+            else:
+                historicos.setdefault(evento[2], []).append((evento[3], evento[1] / 1e6))
+
+        resumo = {"reproducoes": 0, "historico": 0, "midias_ausentes": 0, "usuarios_ausentes": 0}
+        if zerar:
+            for m in catalogo:
+                if m.reproducoes:
+                    m.reproducoes = 0
+        for (titulo, artista), qtd in contagem.items():
+            m = catalogo.buscar_por_titulo_artista(titulo, artista)
+            if m is None:
+                resumo["midias_ausentes"] += qtd
+                continue
+            m.reproducoes += qtd
+            resumo["reproducoes"] += qtd
+        por_nome = {}
+        for u in usuarios:
+            por_nome.setdefault(u.nome, u)
+        for nome, titulos in historicos.items():
+            u = por_nome.get(nome)
+            if u is None:
+                resumo["usuarios_ausentes"] += len(titulos)
+                continue
+            if zerar:
+                u.historico = titulos
+            else:
+                u.historico.extend(titulos)
+            resumo["historico"] += len(titulos)
+        if zerar:
+            for nome, u in por_nome.items():
+                if nome not in historicos:
+                    u.historico = []
+        return resumo
+
+    # Métodos especiais
+    def __str__(self):
+        return (f"Diário de reproduções | {self.pasta} | segmento {self._numero} | "
+                f"{self.eventos_gravados} eventos em {self.gravacoes} gravações")
+
+    def __repr__(self):
+        return f"DiarioReproducoes(pasta={str(self.pasta)!r}, lote={self.lote}, intervalo_ms={self.intervalo_ms})"
@@ -0,0 +1,65 @@
+# Streaming/eventos.py
+
+# Eventos publicados pelas classes do pacote e pelo StreamingApp
+MIDIA_REPRODUZIDA = "midia_reproduzida"            # (midia, usuario ou None, playlist ou None)
+MUSICA_AVALIADA = "musica_avaliada"                # (musica, nota)
+PLAYLIST_REPRODUZIDA = "playlist_reproduzida"      # (playlist)
+REPRODUCAO_REGISTRADA = "reproducao_registrada"    # (usuario, musica)
+USUARIO_ADICIONADO = "usuario_adicionado"          # (usuario)
+PLAYLIST_ADICIONADA = "playlist_adicionada"        # (playlist)
+PLAYLIST_SUBSTITUIDA = "playlist_substituida"      # (antiga, nova)
+PLAYLIST_ALTERADA = "playlist_alterada"            # (playlist, midia, adicionada) item acrescentado no fim ou removido
+
+
+class BarramentoEventos:
+    """
+    Barramento simples de eventos (publicar/inscrever).
+    As classes publicam no barramento ativo (BarramentoEventos.ativo);
+    cada StreamingApp cria o seu e o ativa com BarramentoEventos.usar(),
+    como faz com o catálogo de mídias.
+    Os inscritos são chamados na hora, na ordem de inscrição.
+    Sem inscritos, publicar custa apenas uma consulta ao dicionário.
+    """
+
+    ativo = None   # barramento onde os eventos são publicados (definido abaixo)
+
+    def __init__(self):
+        self._inscritos = {}   # evento -> lista de funções
+
+    @staticmethod
+    def usar(barramento: "BarramentoEventos") -> "BarramentoEventos":
+        """Define o barramento ativo e retorna o anterior."""
+        anterior = BarramentoEventos.ativo
+        BarramentoEventos.ativo = barramento
+        return anterior
+
+    def inscrever(self, evento: str, funcao) -> None:
+        """Chama funcao(*dados) sempre que o evento for publicado."""
+        self._inscritos.setdefault(evento, []).append(funcao)
+
+    def cancelar(self, evento: str, funcao) -> bool:
+        """Remove a inscrição. Retorna True se removeu, False se não estava inscrita."""
+        funcoes = self._inscritos.get(evento, [])
+        if funcao in funcoes:
+            funcoes.remove(funcao)
+            return True
+        return False
+
+    def publicar(self, evento: str, *dados) -> None:
+        """Entrega os dados do evento a todos os inscritos."""
+        for funcao in self._inscritos.get(evento, ()):
+            funcao(*dados)
+
+    # Métodos especiais
+    def __len__(self):
+        """Retorna a quantidade de inscrições."""
+        return sum(len(f) for f in self._inscritos.values())
+
+    def __str__(self):
+        return f"Barramento de eventos | {len(self._inscritos)} eventos | {len(self)} inscrições"
+
+    def __repr__(self):
+        return f"BarramentoEventos(eventos={len(self._inscritos)}, inscricoes={len(self)})"
+
+
+BarramentoEventos.ativo = BarramentoEventos()
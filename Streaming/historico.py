@@ -0,0 +1,339 @@
+# Streaming/historico.py
+
+import os
+import re
+import struct
+import threading
+import time
+import weakref
+import zlib
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+# Registro do arquivo de excedente: (instante, número do título). O arquivo só
+# vale enquanto o histórico existe, então pode usar a numeração da TabelaTitulos
+_REGISTRO = struct.Struct("<dI")
+# Registros lidos por vez ao percorrer o excedente inteiro (64 KiB)
+_REGISTROS_POR_BLOCO = (64 << 10) // _REGISTRO.size
+
+
+class TabelaTitulos:
+    """
+    Títulos ouvidos, numerados uma vez para os históricos que usam a tabela:
+    o histórico guarda só o número (4 bytes) em vez de uma string por reprodução.
+    Cada número conta quantas entradas de histórico o usam (reter/soltar); quando
+    nenhuma usa, o título sai da tabela e o número é reaproveitado, então a tabela
+    não cresce com títulos que já saíram de todos os históricos.
+    A tabela ativa (TabelaTitulos.ativa) é a usada pelos novos históricos.
+    """
+
+    ativa = None   # definida logo abaixo da classe
+
+    def __init__(self):
+        self._titulos = []      # número -> título (None = número livre)
+        self._numeros = {}      # título -> número
+        self._usos = array("I") # número -> entradas de histórico que o usam
+        self._livres = []
+        self._trava = threading.Lock()
+
+    @staticmethod
+    def usar(tabela: "TabelaTitulos") -> "TabelaTitulos":
+        """Troca a tabela ativa (usada pelos novos históricos) e retorna a anterior."""
+        anterior = TabelaTitulos.ativa
+        TabelaTitulos.ativa = tabela
+        return anterior
+
+    def reter(self, titulo: str) -> int:
+        """Número do título para mais uma entrada; cadastra na primeira vez."""
+        with self._trava:
+            return self._reter(titulo)
+
+    def soltar(self, numero: int, quantidade: int = 1) -> None:
+        """Devolve 'quantidade' entradas do número; sem entradas, o título sai da tabela."""
+        with self._trava:
+            self._soltar(numero, quantidade)
+
+    def trocar(self, numero: int, titulo: str) -> int:
+        """soltar(numero) e reter(titulo) de uma vez (entrada substituída no buffer)."""
+        with self._trava:
+            novo = self._reter(titulo)   # antes de soltar: o mesmo título não sai e volta
+            self._soltar(numero, 1)
+            return novo
+
+    def _reter(self, titulo: str) -> int:
+        numero = self._numeros.get(titulo)
+        if numero is None:
+            if self._livres:
+                numero = self._livres.pop()
+                self._titulos[numero] = titulo
+            else:
+                numero = len(self._titulos)
+                self._titulos.append(titulo)
+                self._usos.append(0)
+            self._numeros[titulo] = numero
+        self._usos[numero] += 1
+        return numero
+
+    def _soltar(self, numero: int, quantidade: int) -> None:
+        restam = self._usos[numero] - quantidade
+        self._usos[numero] = restam
+        if restam == 0:
+            del self._numeros[self._titulos[numero]]
+            self._titulos[numero] = None
+            self._livres.append(numero)
+
+    def titulo(self, numero: int) -> str:
+        return self._titulos[numero]
+
+    def __len__(self):
+        """Títulos em uso."""
+        return len(self._numeros)
+
+    def __repr__(self):
+        return f"TabelaTitulos(titulos={len(self)}, livres={len(self._livres)})"
+
+
+TabelaTitulos.ativa = TabelaTitulos()
+
+
+def _soltar(tabela: TabelaTitulos, numeros: array, disco: dict) -> None:
+    # Devolve à tabela os números do buffer e do excedente (histórico descartado ou limpo)
+    usos = dict(disco)
+    for numero in numeros:
+        usos[numero] = usos.get(numero, 0) + 1
+    for numero, quantidade in usos.items():
+        tabela.soltar(numero, quantidade)
+    del numeros[:]
+    disco.clear()
+
+
+def _apagar(arquivo) -> None:
+    arquivo.close()
+    try:
+        os.unlink(arquivo.name)
+    except OSError:
+        pass
+
+
+class HistoricoCompacto:
+    """
+    Histórico de reproduções de um usuário em buffer circular de arrays:
+    número do título (array 'I', ver TabelaTitulos) e instante (array 'd',
+    segundos desde a época), 12 bytes por reprodução em vez de uma string.
+    - Guarda as últimas 'capacidade' reproduções; as mais antigas saem do
+      buffer. Com 'pasta_excedente' elas vão para um arquivo temporário do
+      histórico (registros de tamanho fixo, gravados em blocos de 64 KiB e
+      apagado junto com o objeto) e continuam consultáveis; sem ela, são
+      descartadas.
+    - 'total' conta todas as reproduções registradas, inclusive descartadas: é o
+      contador O(1) usado pelas análises e métricas.
+    - Continua se comportando como a lista de títulos de antes: len(), iteração
+      (do mais antigo ao mais novo), índices/fatias e append(titulo).
+    - Consultas: pagina() (mais recentes primeiro) e entre() (intervalo de tempo,
+      por busca binária, já que os instantes são registrados em ordem).
+    """
+
+    __slots__ = ("capacidade", "total", "_tabela", "_numeros", "_instantes", "_inicio", "_caminho",
+                 "_arquivo", "_no_disco", "_disco_usos", "_pendente", "__weakref__")
+
+    # Padrões para os novos históricos (ex.: HistoricoCompacto.pasta_excedente = "dados/historico")
+    capacidade_padrao = 10_000
+    pasta_excedente = None
+
+    def __init__(self, itens=(), capacidade: int = None, nome: str = "historico"):
+        self.capacidade = max(1, capacidade or self.capacidade_padrao)
+        self.total = 0
+        self._tabela = TabelaTitulos.ativa
+        self._numeros = array("I")
+        self._instantes = array("d")
+        self._inicio = 0           # posição do mais antigo quando o buffer está cheio
+        self._caminho = None       # arquivo de excedente (aberto na primeira saída do buffer)
+        self._arquivo = None
+        self._no_disco = 0
+        self._disco_usos = {}      # número -> entradas no excedente (retidas na tabela)
+        self._pendente = bytearray()   # registros que saíram do buffer, ainda não gravados
+        # Os números voltam para a tabela quando o histórico é descartado (não no fim do processo)
+        weakref.finalize(self, _soltar, self._tabela, self._numeros, self._disco_usos).atexit = False
+        if self.pasta_excedente is not None:
+            seguro = re.sub(r"[^\w-]+", "_", nome)[:40]
+            self._caminho = (Path(self.pasta_excedente) /
+                             f"{seguro}-{zlib.crc32(nome.encode()):08x}-{os.getpid()}-{id(self):x}.hist")
+        self.extend(itens)
+
+    # Métodos de registro
+    def append(self, titulo, instante: float = None) -> None:
+        """Registra uma reprodução (título ou mídia com 'titulo'); instante padrão: agora."""
+        titulo = str(getattr(titulo, "titulo", titulo))
+        instante = time.time() if instante is None else float(instante)
+        self.total += 1
+        if len(self._numeros) < self.capacidade:
+            self._numeros.append(self._tabela.reter(titulo))
+            self._instantes.append(instante)
+            return
+        i = self._inicio
+        saiu = self._numeros[i]
+        if self._caminho is not None:
+            self._pendente += _REGISTRO.pack(self._instantes[i], saiu)
+            self._no_disco += 1
+            self._disco_usos[saiu] = self._disco_usos.get(saiu, 0) + 1
+            if len(self._pendente) >= 1 << 16:
+                self._gravar_excedente()
+            numero = self._tabela.reter(titulo)
+        else:
+            numero = self._tabela.trocar(saiu, titulo)   # a entrada descartada solta o título dela
+        self._numeros[i] = numero
+        self._instantes[i] = instante
+        self._inicio = (i + 1) % self.capacidade
+
+    def extend(self, itens) -> None:
+        """Registra vários itens: títulos ou pares (titulo, instante)."""
+        for item in itens:
+            if type(item) is tuple:
+                self.append(item[0], item[1])
+            else:
+                self.append(item)
+
+    def limpar(self) -> None:
+        self.total = 0
+        _soltar(self._tabela, self._numeros, self._disco_usos)   # esvazia os mesmos objetos
+        self._instantes = array("d")
+        self._inicio = 0
+        self._no_disco = 0
+        self._pendente = bytearray()
+        if self._arquivo is not None:
+            self._arquivo.truncate(0)
+
+    # Excedente em disco
+    def _gravar_excedente(self) -> None:
+        if not self._pendente:
+            return
+        if self._arquivo is None:
+            self._caminho.parent.mkdir(parents=True, exist_ok=True)
+            self._arquivo = open(self._caminho, "w+b")
+            weakref.finalize(self, _apagar, self._arquivo)
+        self._arquivo.seek(0, os.SEEK_END)
+        self._arquivo.write(self._pendente)
+        self._pendente = bytearray()
+
+    def _ler_registros(self, inicio: int, fim: int) -> bytes:
+        # Registros [inicio, fim) do excedente (o arquivo seguido do que ainda está pendente)
+        gravados = self._no_disco - len(self._pendente) // _REGISTRO.size
+        dados = b""
+        if inicio < gravados:
+            self._arquivo.seek(inicio * _REGISTRO.size)
+            dados = self._arquivo.read((min(fim, gravados) - inicio) * _REGISTRO.size)
+        if fim > gravados:
+            dados += self._pendente[max(0, inicio - gravados) * _REGISTRO.size:(fim - gravados) * _REGISTRO.size]
+        return dados
+
+    def _ler_disco(self, inicio: int, fim: int) -> list:
+        """Registros [inicio, fim) do excedente como (instante, título)."""
+        if inicio >= fim:
+            return []
+        titulo = self._tabela.titulo
+        return [(instante, titulo(numero))
+                for instante, numero in _REGISTRO.iter_unpack(self._ler_registros(inicio, fim))]
+
+    def _percorrer_disco(self, inicio: int, fim: int):
+        """Gera os registros [inicio, fim) do excedente como (instante, título), lendo em blocos."""
+        titulo = self._tabela.titulo
+        for bloco in range(inicio, fim, _REGISTROS_POR_BLOCO):
+            dados = self._ler_registros(bloco, min(fim, bloco + _REGISTROS_POR_BLOCO))
+            for instante, numero in _REGISTRO.iter_unpack(dados):
+                yield instante, titulo(numero)
+
+    def _instante_disco(self, i: int) -> float:
+        return _REGISTRO.unpack(self._ler_registros(i, i + 1))[0]
+
+    # Acesso pela posição lógica (0 = mais antigo, incluindo o disco)
+    def _posicao(self, i: int) -> int:
+        if len(self._numeros) < self.capacidade:
+            return i
+        return (self._inicio + i) % self.capacidade
+
+    def _instante(self, i: int) -> float:
+        if i < self._no_disco:
+            return self._instante_disco(i)
+        return self._instantes[self._posicao(i - self._no_disco)]
+
+    def _intervalo(self, inicio: int, fim: int) -> list:
+        """Entradas [inicio, fim) como (instante, título), do mais antigo ao mais novo."""
+        itens = self._ler_disco(inicio, min(fim, self._no_disco))
+        titulo = self._tabela.titulo
+        for i in range(max(inicio, self._no_disco) - self._no_disco, fim - self._no_disco):
+            p = self._posicao(i)
+            itens.append((self._instantes[p], titulo(self._numeros[p])))
+        return itens
+
+    # Métodos de consulta
+    def pagina(self, numero: int = 0, tamanho: int = 50) -> list:
+        """
+        Página 'numero' (0 = mais recentes) com até 'tamanho' entradas
+        (datetime, título), da mais recente para a mais antiga.
+        """
+        fim = len(self) - numero * tamanho
+        inicio = max(0, fim - tamanho)
+        if fim <= 0:
+            return []
+        return [(datetime.fromtimestamp(t), titulo) for t, titulo in reversed(self._intervalo(inicio, fim))]
+
+    def entre(self, inicio=None, fim=None) -> list:
+        """Entradas (datetime, título) com inicio <= instante < fim (datetime ou segundos), em ordem."""
+        de = self._limite(inicio, 0)
+        ate = self._limite(fim, len(self))
+        return [(datetime.fromtimestamp(t), titulo) for t, titulo in self._intervalo(de, ate)]
+
+    def _limite(self, momento, padrao: int) -> int:
+        # Primeira posição com instante >= momento (busca binária)
+        if momento is None:
+            return padrao
+        alvo = momento.timestamp() if isinstance(momento, datetime) else float(momento)
+        baixo, alto = 0, len(self)
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            if self._instante(meio) < alvo:
+                baixo = meio + 1
+            else:
+                alto = meio
+        return baixo
+
+    def contagem_por_titulo(self) -> dict:
+        """Título -> reproduções entre as guardadas no buffer (sem ler o disco)."""
+        contagem = {}
+        for numero in self._numeros:
+            contagem[numero] = contagem.get(numero, 0) + 1
+        return {self._tabela.titulo(n): q for n, q in contagem.items()}
+
+    # Métodos especiais (compatíveis com a lista de títulos)
+    def __len__(self):
+        """Reproduções consultáveis (buffer + excedente em disco)."""
+        return self._no_disco + len(self._numeros)
+
+    def __iter__(self):
+        # O excedente vem em blocos: a memória não cresce com o histórico em disco
+        for _, titulo in self._percorrer_disco(0, self._no_disco):
+            yield titulo
+        titulo = self._tabela.titulo
+        for i in range(len(self._numeros)):
+            yield titulo(self._numeros[self._posicao(i)])
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(len(self))
+            if passo == 1:
+                return [titulo for _, titulo in self._intervalo(inicio, max(inicio, fim))]
+            return [self[i] for i in range(inicio, fim, passo)]
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("índice fora do histórico")
+        return self._intervalo(indice, indice + 1)[0][1]
+
+    def __str__(self):
+        return f"Histórico: {self.total} reproduções ({len(self)} guardadas)"
+
+    def __repr__(self):
+        return (f"HistoricoCompacto(total={self.total}, guardadas={len(self)}, "
+                f"capacidade={self.capacidade}, no_disco={self._no_disco})")
@@ -0,0 +1,154 @@
+# Streaming/metricas.py
+
+from . import eventos
+
+
+class MetricasIncrementais:
+    """
+    Métricas do relatório mantidas ao vivo a partir dos eventos do barramento:
+        - total de reproduções dos históricos de usuários
+        - usuário mais ativo (maior histórico)
+        - playlist mais popular (mais reproduções)
+        - quantidade e soma de todas as avaliações (média geral)
+    O top de músicas vem do RankingReproducoes (atualizado pelo catálogo) e a
+    média de cada música é mantida pela própria Musica, então gerar o
+    relatório custa O(tamanho da saída), sem percorrer catálogo e históricos.
+
+    Empates seguem a ordem de chegada (a primeira adicionada vence), como
+    no cálculo direto das Analises. Alterações feitas por fora dos eventos
+    (ex.: atribuir 'historico' ou 'reproducoes' direto) pedem recalcular().
+    """
+
+    def __init__(self, barramento=None, ranking=None):
+        self.barramento = barramento if barramento is not None else eventos.BarramentoEventos.ativo
+        self.ranking = ranking
+        self.total_reproducoes = 0
+        self.total_avaliacoes = 0
+        self.soma_avaliacoes = 0
+        self._usuarios = {}        # id(usuario) -> (ordem de chegada, usuario)
+        self._playlists = {}       # id(playlist) -> (ordem de chegada, playlist)
+        self._usuario_ativo = None
+        self._playlist_popular = None
+        self._playlist_valida = True
+        for evento, funcao in self._inscricoes():
+            self.barramento.inscrever(evento, funcao)
+
+    def _inscricoes(self) -> tuple:
+        return ((eventos.USUARIO_ADICIONADO, self._usuario_adicionado),
+                (eventos.REPRODUCAO_REGISTRADA, self._reproducao_registrada),
+                (eventos.PLAYLIST_ADICIONADA, self._playlist_adicionada),
+                (eventos.PLAYLIST_SUBSTITUIDA, self._playlist_substituida),
+                (eventos.PLAYLIST_REPRODUZIDA, self._playlist_reproduzida),
+                (eventos.MUSICA_AVALIADA, self._musica_avaliada))
+
+    def desligar(self) -> None:
+        """Cancela as inscrições no barramento (as métricas param de ser atualizadas)."""
+        for evento, funcao in self._inscricoes():
+            self.barramento.cancelar(evento, funcao)
+
+    # Carga inicial / reconstrução: uma passada pelas coleções
+    def recalcular(self, usuarios=(), playlists=(), musicas=()) -> None:
+        """Recalcula tudo a partir das coleções (ex.: após carregar os arquivos .md)."""
+        self.total_reproducoes = 0
+        self.total_avaliacoes = 0
+        self.soma_avaliacoes = 0
+        self._usuarios.clear()
+        self._playlists.clear()
+        self._usuario_ativo = None
+        self._playlist_popular = None
+        self._playlist_valida = True
+        for u in usuarios:
+            self._usuario_adicionado(u)
+        for pl in playlists:
+            self._playlist_adicionada(pl)
+        for m in musicas:
+            self.total_avaliacoes += m.quantidade_avaliacoes
+            self.soma_avaliacoes += m.soma_avaliacoes
+
+    # Tratadores dos eventos
+    def _usuario_adicionado(self, usuario) -> None:
+        if id(usuario) in self._usuarios:
+            return
+        self._usuarios[id(usuario)] = (len(self._usuarios), usuario)
+        self.total_reproducoes += usuario.total_reproducoes
+        self._considerar_usuario(usuario)
+
+    def _reproducao_registrada(self, usuario, musica) -> None:
+        if id(usuario) not in self._usuarios:
+            return
+        self.total_reproducoes += 1
+        self._considerar_usuario(usuario)
+
+    # Chave de comparação: maior valor primeiro; no empate, quem chegou antes
+    @staticmethod
+    def _chave(registro: dict, item, valor: int) -> tuple:
+        return (valor, -registro[id(item)][0])
+
+    def _considerar_usuario(self, usuario) -> None:
+        atual = self._usuario_ativo
+        if atual is None or (self._chave(self._usuarios, usuario, usuario.total_reproducoes) >
+                             self._chave(self._usuarios, atual, atual.total_reproducoes)):
+            self._usuario_ativo = usuario
+
+    def _playlist_adicionada(self, playlist) -> None:
+        if id(playlist) in self._playlists:
+            return
+        self._playlists[id(playlist)] = (len(self._playlists), playlist)
+        self._considerar_playlist(playlist)
+
+    def _playlist_substituida(self, antiga, nova) -> None:
+        # A nova ocupa a posição da antiga (como na lista do app)
+        item = self._playlists.pop(id(antiga), None)
+        if item is None:
+            self._playlist_adicionada(nova)
+            return
+        self._playlists[id(nova)] = (item[0], nova)
+        self._playlist_valida = False
+
+    def _playlist_reproduzida(self, playlist) -> None:
+        if id(playlist) in self._playlists:
+            self._considerar_playlist(playlist)
+
+    def _considerar_playlist(self, playlist) -> None:
+        if not self._playlist_valida:
+            return
+        atual = self._playlist_popular
+        if atual is None or (self._chave(self._playlists, playlist, playlist.reproducoes) >
+                             self._chave(self._playlists, atual, atual.reproducoes)):
+            self._playlist_popular = playlist
+
+    def _musica_avaliada(self, musica, nota) -> None:
+        self.total_avaliacoes += 1
+        self.soma_avaliacoes += nota
+
+    # Consultas (O(1), exceto após substituição de playlist)
+    def usuario_mais_ativo(self):
+        """Usuário com o maior histórico ou None."""
+        return self._usuario_ativo
+
+    def playlist_mais_popular(self):
+        """Playlist com mais reproduções ou None."""
+        if not self._playlist_valida:
+            item = max(self._playlists.values(), key=lambda op: (op[1].reproducoes, -op[0]),
+                       default=None)
+            self._playlist_popular = item[1] if item else None
+            self._playlist_valida = True
+        return self._playlist_popular
+
+    def media_geral_avaliacoes(self) -> float:
+        """Média de todas as avaliações registradas (0.0 se não há)."""
+        return self.soma_avaliacoes / self.total_avaliacoes if self.total_avaliacoes else 0.0
+
+    def top_musicas(self, n: int = 10) -> list:
+        """As n músicas mais reproduzidas, pelo placar (requer ranking)."""
+        return self.ranking.top(n) if self.ranking is not None else []
+
+    # Métodos especiais
+    def __str__(self):
+        ativo = self._usuario_ativo.nome if self._usuario_ativo else "-"
+        return (f"Métricas | reproduções: {self.total_reproducoes} | "
+                f"usuário mais ativo: {ativo} | avaliações: {self.total_avaliacoes}")
+
+    def __repr__(self):
+        return (f"MetricasIncrementais(usuarios={len(self._usuarios)}, playlists={len(self._playlists)}, "
+                f"reproducoes={self.total_reproducoes})")
@@ -0,0 +1,134 @@
+# Streaming/observador.py
+
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+
+class ObservadorCatalogo:
+    """
+    Observa uma pasta de catálogos (.md) e recarrega os arquivos alterados
+    numa thread de trabalho, sem travar o loop interativo do app.
+    - Detecção por polling (tamanho e mtime de cada arquivo, a cada 'intervalo'
+      segundos). Um arquivo só é recarregado quando fica igual em duas
+      varreduras seguidas, para não ler um arquivo ainda sendo gravado.
+    - Cada recarga tem duas fases:
+        preparar(caminho) -> lido: leitura e validação, fora da trava
+        aplicar(caminho, lido) -> resumo: troca o estado do app, com a trava
+      (lido=None: o arquivo foi apagado). A trava é a mesma que o loop do app
+      segura enquanto executa um comando, então a troca é atômica para ele:
+      nenhuma reprodução ou listagem vê o catálogo pela metade.
+    - Cada recarga gera uma estatística (ver recargas()): tempo de leitura,
+      espera pela trava, tempo com a trava (a pausa máxima imposta ao app)
+      e latência desde a gravação do arquivo até a troca.
+    """
+
+    def __init__(self, pasta, preparar, aplicar, trava=None,
+                 intervalo: float = 0.5, padrao: str = "*.md"):
+        self.pasta = Path(pasta)
+        self.preparar = preparar
+        self.aplicar = aplicar
+        self.trava = trava if trava is not None else threading.RLock()
+        self.intervalo = intervalo
+        self.padrao = padrao
+        self._vistos = {}       # caminho -> (tamanho, mtime_ns) já recarregado
+        self._pendentes = {}    # caminho -> (tamanho, mtime_ns) visto na última varredura
+        self._recargas = deque(maxlen=100)
+        self._parar = threading.Event()
+        self._thread = None
+
+    # Métodos de ciclo de vida
+    def iniciar(self) -> "ObservadorCatalogo":
+        """Inicia a thread de observação (daemon). Chamar de novo não tem efeito."""
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._executar, name="observador-catalogo", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, espera: float = None) -> None:
+        """Pede o fim da thread e espera por ela (até 'espera' segundos)."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(espera)
+            self._thread = None
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            self.verificar()
+            self._parar.wait(self.intervalo)
+
+    # Métodos principais
+    def _assinaturas(self) -> dict:
+        assinaturas = {}
+        for caminho in sorted(self.pasta.glob(self.padrao)):
+            try:
+                st = caminho.stat()
+            except OSError:
+                continue   # apagado entre o glob e o stat
+            assinaturas[caminho] = (st.st_size, st.st_mtime_ns)
+        return assinaturas
+
+    def verificar(self) -> list:
+        """
+        Uma varredura da pasta: recarrega os arquivos novos/alterados (já estáveis)
+        e descarrega os apagados. Retorna as estatísticas das recargas feitas.
+        """
+        feitas = []
+        atuais = self._assinaturas()
+        for caminho, assinatura in atuais.items():
+            if self._vistos.get(caminho) == assinatura:
+                self._pendentes.pop(caminho, None)
+                continue
+            if self._pendentes.get(caminho) != assinatura:
+                self._pendentes[caminho] = assinatura   # mudou: espera a próxima varredura
+                continue
+            del self._pendentes[caminho]
+            self._vistos[caminho] = assinatura
+            feitas.append(self.recarregar(caminho, assinatura[1]))
+        for caminho in [c for c in self._vistos if c not in atuais]:
+            del self._vistos[caminho]
+            feitas.append(self.recarregar(caminho, None))
+        for caminho in [c for c in self._pendentes if c not in atuais]:
+            del self._pendentes[caminho]
+        return feitas
+
+    def recarregar(self, caminho: Path, mtime_ns: int = None) -> dict:
+        """Recarrega um arquivo (mtime_ns=None: arquivo apagado) e retorna a estatística."""
+        estatistica = {"arquivo": Path(caminho).name, "resumo": None, "erro": None}
+        t0 = time.perf_counter()
+        try:
+            lido = self.preparar(caminho) if mtime_ns is not None else None
+            t1 = time.perf_counter()
+            with self.trava:
+                t2 = time.perf_counter()
+                estatistica["resumo"] = self.aplicar(caminho, lido)
+                t3 = time.perf_counter()
+        except Exception as e:
+            # Arquivo inválido: mantém o estado atual e tenta de novo na próxima alteração
+            estatistica["erro"] = f"{type(e).__name__}: {e}"
+        else:
+            estatistica["leitura_ms"] = (t1 - t0) * 1000
+            estatistica["espera_ms"] = (t2 - t1) * 1000
+            estatistica["aplicacao_ms"] = (t3 - t2) * 1000
+            if mtime_ns is not None:
+                estatistica["latencia_ms"] = max(0.0, (time.time_ns() - mtime_ns) / 1e6)
+        self._recargas.append(estatistica)
+        return estatistica
+
+    # Métodos de consulta
+    def recargas(self) -> list:
+        """Retorna (e esquece) as estatísticas das recargas feitas desde a última chamada."""
+        feitas = []
+        while self._recargas:
+            feitas.append(self._recargas.popleft())
+        return feitas
+
+    # Métodos especiais
+    def __str__(self):
+        estado = "ativo" if self._thread is not None and self._thread.is_alive() else "parado"
+        return f"Observador de catálogo | {self.pasta} ({self.padrao}) | {len(self._vistos)} arquivos | {estado}"
+
+    def __repr__(self):
+        return f"ObservadorCatalogo(pasta={str(self.pasta)!r}, intervalo={self.intervalo}, arquivos={len(self._vistos)})"
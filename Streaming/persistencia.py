@@ -0,0 +1,599 @@
+# Streaming/persistencia.py
+
+import sqlite3
+import struct
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+
+from . import eventos
+from .arquivo_midia import ArquivoDeMidia, Musica, Podcast
+from .catalogo import CatalogoMidia, normalizar_titulo
+from .playlist import Playlist
+from .usuario import Usuario
+
+
+VERSAO_ESQUEMA = 2   # v2: histograma das notas no lugar de cada nota
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    criado_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS midias (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,              -- 'musica' ou 'podcast'
+    titulo TEXT NOT NULL,
+    chave TEXT NOT NULL,             -- título normalizado (busca do catálogo)
+    artista TEXT NOT NULL,
+    chave_artista TEXT NOT NULL,
+    duracao INTEGER NOT NULL,
+    genero TEXT,
+    episodio INTEGER,
+    temporada TEXT,
+    host TEXT,
+    reproducoes INTEGER NOT NULL DEFAULT 0,
+    histograma BLOB                  -- avaliações: quantidade de cada nota 0 a 5 (_HISTOGRAMA)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS midias_por_chave ON midias (chave, chave_artista);
+CREATE INDEX IF NOT EXISTS midias_por_tipo ON midias (tipo, id);
+CREATE TABLE IF NOT EXISTS playlists (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    usuario TEXT NOT NULL,
+    reproducoes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS playlists_por_nome ON playlists (nome, usuario);
+CREATE INDEX IF NOT EXISTS playlists_por_usuario ON playlists (usuario);
+CREATE TABLE IF NOT EXISTS playlist_itens (
+    playlist_id INTEGER NOT NULL REFERENCES playlists (id) ON DELETE CASCADE,
+    posicao INTEGER NOT NULL,
+    midia_id INTEGER NOT NULL REFERENCES midias (id),
+    PRIMARY KEY (playlist_id, posicao)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS historico (
+    id INTEGER PRIMARY KEY,
+    usuario_id INTEGER NOT NULL REFERENCES usuarios (id),
+    titulo TEXT NOT NULL,
+    em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS historico_por_usuario ON historico (usuario_id, id);
+"""
+
+# Comandos usados nas gravações (textos fixos: o sqlite3 reaproveita o comando
+# já compilado do cache da conexão, e cada lote vai num único executemany)
+_INSERIR_USUARIO = "INSERT INTO usuarios (id, nome, criado_em) VALUES (?, ?, ?)"
+_INSERIR_MIDIA = ("INSERT INTO midias (id, tipo, titulo, chave, artista, chave_artista, duracao, genero, "
+                  "episodio, temporada, host, reproducoes, histograma) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_ATUALIZAR_MIDIA = ("UPDATE midias SET tipo = ?, titulo = ?, chave = ?, artista = ?, chave_artista = ?, duracao = ?, "
+                    "genero = ?, episodio = ?, temporada = ?, host = ?, reproducoes = ?, histograma = ? WHERE id = ?")
+_ATUALIZAR_REPRODUCOES = "UPDATE midias SET reproducoes = ? WHERE id = ?"
+_ATUALIZAR_AVALIACOES = "UPDATE midias SET histograma = ? WHERE id = ?"
+_INSERIR_PLAYLIST = "INSERT INTO playlists (id, nome, usuario, reproducoes) VALUES (?, ?, ?, ?)"
+_ATUALIZAR_PLAYLIST = "UPDATE playlists SET nome = ?, usuario = ?, reproducoes = ? WHERE id = ?"
+_ATUALIZAR_REPRODUCOES_PLAYLIST = "UPDATE playlists SET reproducoes = ? WHERE id = ?"
+_APAGAR_ITENS = "DELETE FROM playlist_itens WHERE playlist_id = ?"
+_INSERIR_ITEM = "INSERT INTO playlist_itens (playlist_id, posicao, midia_id) VALUES (?, ?, ?)"
+# Alterações de um item (as posições só precisam ser crescentes, não contíguas)
+_ACRESCENTAR_ITEM = ("INSERT INTO playlist_itens (playlist_id, posicao, midia_id) "
+                     "SELECT ?, coalesce(max(posicao), -1) + 1, ? FROM playlist_itens WHERE playlist_id = ?")
+_REMOVER_ITEM = ("DELETE FROM playlist_itens WHERE playlist_id = ? AND posicao = "
+                 "(SELECT min(posicao) FROM playlist_itens WHERE playlist_id = ? AND midia_id = ?)")
+_INSERIR_HISTORICO = "INSERT INTO historico (usuario_id, titulo, em) VALUES (?, ?, ?)"
+
+_COLUNAS_MIDIA = ("id, tipo, titulo, artista, duracao, genero, episodio, temporada, host, "
+                  "reproducoes, histograma")
+_COLUNAS_ITEM = ("m.id, m.tipo, m.titulo, m.artista, m.duracao, m.genero, m.episodio, m.temporada, m.host, "
+                 "m.reproducoes, m.histograma")
+
+# Histograma das notas: 6 contadores de 64 bits (notas 0 a 5), tamanho fixo
+_HISTOGRAMA = struct.Struct("<6Q")
+
+
+class PersistenciaSQLite:
+    """
+    Persistência do app em SQLite (módulo sqlite3 da biblioteca padrão):
+    usuários, mídias (músicas e podcasts), playlists com seus itens e histórico.
+    - Modo WAL: leituras não esperam as gravações, e um commit não reescreve o banco.
+    - Gravações em lote: os eventos do barramento (reprodução, avaliação, playlist
+      criada/alterada...) só enfileiram comandos; a fila vai para o banco numa
+      transação quando chega a 'lote' comandos, numa leitura ou em gravar()/fechar().
+      Comandos iguais seguidos viram um executemany; contadores de reproduções e
+      avaliações são agrupados por mídia (só o último valor é gravado).
+    - Avaliações guardadas como histograma (quantidade de cada nota, 48 bytes):
+      gravar uma reprodução ou uma nota custa o mesmo com 10 ou 1 milhão de
+      notas, e reproduções não regravam as avaliações. Bancos v1 (uma nota por
+      byte) são convertidos na abertura.
+    - Playlists: itens acrescentados ou removidos (PLAYLIST_ALTERADA) viram um
+      INSERT/DELETE do item; só playlists novas ou substituídas regravam a lista.
+    - Índices para as buscas do app: mídia por título, playlist por nome e por
+      usuário, histórico por usuário.
+    - Carga sob demanda: nada é lido na abertura. As mídias entram no catálogo
+      quando buscadas (o catálogo chama buscar_midia quando não acha o título),
+      usuários e playlists quando pedidos pelo nome; as listagens percorrem o
+      banco em páginas, com objetos temporários. Os objetos carregados ficam num
+      mapa de identidade: cada linha do banco vira no máximo um objeto vivo.
+      O mapa guarda referências fracas: objetos que o app descartou (ex.: mídias
+      que saíram do catálogo) são coletados e a linha volta a ser lida do banco.
+    Objetos criados fora do banco (ex.: importados dos .md) são associados às
+    linhas pela chave natural: usuário pelo nome, mídia por (título, artista) e
+    playlist por (nome, usuário); na primeira associação, os contadores e o
+    histórico guardados no banco passam para o objeto.
+    Os ids são atribuídos pelo próprio processo: um banco, um app por vez.
+    """
+
+    def __init__(self, caminho="dados/streaming.db", barramento=None, catalogo: CatalogoMidia = None,
+                 lote: int = 500):
+        self.caminho = Path(caminho)
+        self.barramento = barramento if barramento is not None else eventos.BarramentoEventos.ativo
+        self.catalogo = catalogo if catalogo is not None else ArquivoDeMidia.catalogo
+        self.lote = lote
+        if str(caminho) != ":memory:":
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread=False: o observador de catálogo grava de outra thread (com a trava do app)
+        self.conexao = sqlite3.connect(str(caminho), check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode = WAL")
+        self.conexao.execute("PRAGMA synchronous = NORMAL")
+        self.conexao.execute("PRAGMA foreign_keys = ON")
+        self._criar_esquema()
+        self._proximo = {tabela: self._maior_id(tabela) + 1 for tabela in ("usuarios", "midias", "playlists")}
+
+        # Reproduções podem chegar de várias threads: a fila e a gravação usam esta trava
+        self._trava = threading.RLock()
+        self._fila = []                   # (comando, parâmetros) na ordem dos eventos
+        self._contadores_midias = {}      # id da linha -> mídia (reproduções a gravar)
+        self._avaliacoes_midias = {}      # id da linha -> música (histograma das notas a gravar)
+        self._contadores_playlists = {}   # id da linha -> playlist (reproduções a gravar)
+        # Mapa de identidade, com referências fracas (não prende os objetos do app)
+        # As linhas inseridas nesta execução estão sempre nos dicionários abaixo,
+        # e os objetos delas ficam vivos até o commit (_recentes), então as
+        # consultas de associação não precisam esvaziar a fila antes
+        self._midias = weakref.WeakValueDictionary()            # id da linha -> mídia
+        self._linha_midia = {}            # id(mídia) -> id da linha (vale se _midias[linha] é a mídia)
+        self._chaves_midias = {}          # (título, artista) normalizados -> id da linha
+        self._usuarios = {}               # nome -> id da linha
+        self._usuarios_vivos = weakref.WeakValueDictionary()    # id(usuário) -> usuário já associado
+        self._usuario_por_nome = weakref.WeakValueDictionary()  # nome -> primeiro usuário associado
+        self._playlists = weakref.WeakValueDictionary()         # id da linha -> playlist
+        self._recentes = []               # objetos com a linha inserida ainda na fila
+        self._rascunho = CatalogoMidia()  # catálogo dos objetos temporários das listagens
+
+        self.catalogo.carregador = self.buscar_midia
+        for evento, funcao in self._inscricoes():
+            self.barramento.inscrever(evento, funcao)
+
+    def _criar_esquema(self) -> None:
+        versao = self.conexao.execute("PRAGMA user_version").fetchone()[0]
+        if versao > VERSAO_ESQUEMA:
+            raise RuntimeError(f"Banco '{self.caminho}' tem esquema v{versao}, mais novo que o suportado "
+                               f"(v{VERSAO_ESQUEMA}).")
+        with self.conexao:
+            self.conexao.executescript(ESQUEMA)
+            if versao == 1:
+                self._migrar_notas()
+            self.conexao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    def _migrar_notas(self) -> None:
+        # v1 guardava cada nota (1 byte por nota): passa a guardar o histograma
+        self.conexao.execute("ALTER TABLE midias RENAME COLUMN notas TO histograma")
+        linhas = self.conexao.execute("SELECT id, histograma FROM midias WHERE histograma IS NOT NULL").fetchall()
+        self.conexao.executemany(_ATUALIZAR_AVALIACOES,
+                                 [(_HISTOGRAMA.pack(*(bytes(notas).count(n) for n in range(6))), linha)
+                                  for linha, notas in linhas])
+
+    def _maior_id(self, tabela: str) -> int:
+        return self.conexao.execute(f"SELECT coalesce(max(id), 0) FROM {tabela}").fetchone()[0]
+
+    def _novo_id(self, tabela: str) -> int:
+        novo = self._proximo[tabela]
+        self._proximo[tabela] = novo + 1
+        return novo
+
+    def _inscricoes(self) -> tuple:
+        return ((eventos.USUARIO_ADICIONADO, self.salvar_usuario),
+                (eventos.REPRODUCAO_REGISTRADA, self._reproducao_registrada),
+                (eventos.MIDIA_REPRODUZIDA, self._contadores_alterados),
+                (eventos.MUSICA_AVALIADA, self._musica_avaliada),
+                (eventos.PLAYLIST_ADICIONADA, self.salvar_playlist),
+                (eventos.PLAYLIST_ALTERADA, self._playlist_alterada),
+                (eventos.PLAYLIST_SUBSTITUIDA, self._playlist_substituida),
+                (eventos.PLAYLIST_REPRODUZIDA, self._playlist_reproduzida))
+
+    # Métodos de ciclo de vida
+    def gravar(self) -> int:
+        """Grava a fila de alterações numa transação. Retorna quantos comandos foram gravados."""
+        with self._trava:
+            return self._gravar()
+
+    def _gravar(self) -> int:
+        fila = self._fila
+        if not (fila or self._contadores_midias or self._avaliacoes_midias or self._contadores_playlists):
+            return 0
+        with self.conexao:
+            inicio = 0
+            while inicio < len(fila):
+                comando = fila[inicio][0]
+                fim = inicio + 1
+                while fim < len(fila) and fila[fim][0] is comando:
+                    fim += 1
+                self.conexao.executemany(comando, [parametros for _, parametros in fila[inicio:fim]])
+                inicio = fim
+            self.conexao.executemany(_ATUALIZAR_REPRODUCOES,
+                                     [(m.reproducoes, linha) for linha, m in self._contadores_midias.items()])
+            self.conexao.executemany(_ATUALIZAR_AVALIACOES,
+                                     [(self._histograma(m), linha) for linha, m in self._avaliacoes_midias.items()])
+            self.conexao.executemany(_ATUALIZAR_REPRODUCOES_PLAYLIST,
+                                     [(pl.reproducoes, linha) for linha, pl in self._contadores_playlists.items()])
+        gravados = (len(fila) + len(self._contadores_midias) + len(self._avaliacoes_midias)
+                    + len(self._contadores_playlists))
+        self._fila = []
+        self._recentes.clear()
+        self._contadores_midias.clear()
+        self._avaliacoes_midias.clear()
+        self._contadores_playlists.clear()
+        return gravados
+
+    def fechar(self) -> None:
+        """Grava o que falta, cancela as inscrições e fecha o banco."""
+        self.gravar()
+        for evento, funcao in self._inscricoes():
+            self.barramento.cancelar(evento, funcao)
+        if self.catalogo.carregador == self.buscar_midia:
+            self.catalogo.carregador = None
+        self.conexao.close()
+
+    def _enfileirar(self, comando: str, parametros: tuple) -> None:
+        self._fila.append((comando, parametros))
+
+    def _talvez_gravar(self) -> None:
+        if (len(self._fila) + len(self._contadores_midias) + len(self._avaliacoes_midias)
+                + len(self._contadores_playlists)) >= self.lote:
+            self.gravar()
+
+    # Métodos de gravação
+    def salvar_usuario(self, usuario: Usuario) -> int:
+        """Grava o usuário (se ainda não está no banco) e retorna o id da linha."""
+        linha = self._linha_usuario(usuario)
+        self._talvez_gravar()
+        return linha
+
+    def salvar_midia(self, midia) -> int:
+        """Grava (insere ou atualiza) a mídia e retorna o id da linha."""
+        linha = self._linha_de_midia(midia)
+        if linha is None:
+            linha = self._novo_id("midias")
+            self._enfileirar(_INSERIR_MIDIA, (linha,) + self._campos_midia(midia))
+            self._recentes.append(midia)
+            self._associar_midia(linha, midia)
+        else:
+            self._enfileirar(_ATUALIZAR_MIDIA, self._campos_midia(midia) + (linha,))
+            self._contadores_midias.pop(linha, None)
+            self._avaliacoes_midias.pop(linha, None)
+        self._talvez_gravar()
+        return linha
+
+    def salvar_playlist(self, playlist: Playlist) -> int:
+        """Grava (insere ou atualiza) a playlist com os itens e retorna o id da linha."""
+        linha = self._linha_playlist(playlist)
+        dados = (playlist.nome, self._nome_dono(playlist), int(playlist.reproducoes))
+        if linha is None:
+            linha = self._novo_id("playlists")
+            self._enfileirar(_INSERIR_PLAYLIST, (linha,) + dados)
+            self._recentes.append(playlist)
+            self._associar_playlist(linha, playlist)
+        else:
+            self._enfileirar(_ATUALIZAR_PLAYLIST, dados + (linha,))
+            self._enfileirar(_APAGAR_ITENS, (linha,))
+            self._contadores_playlists.pop(linha, None)
+        for posicao, midia in enumerate(m for m in playlist.itens if m is not None):
+            self._enfileirar(_INSERIR_ITEM, (linha, posicao, self._linha_midia_ou_salvar(midia)))
+        self._talvez_gravar()
+        return linha
+
+    def salvar_colecoes(self, usuarios=(), midias=(), playlists=()) -> None:
+        """Grava coleções inteiras (ex.: o catálogo importado dos .md) em lotes."""
+        for u in usuarios:
+            self.salvar_usuario(u)
+        for m in midias:
+            self.salvar_midia(m)
+        for pl in playlists:
+            self.salvar_playlist(pl)
+
+    # Tratadores dos eventos
+    def _reproducao_registrada(self, usuario, musica) -> None:
+        titulo = getattr(musica, "titulo", musica)
+        with self._trava:
+            self._enfileirar(_INSERIR_HISTORICO, (self._linha_usuario(usuario), str(titulo),
+                                                  datetime.now().isoformat(timespec="seconds")))
+            self._talvez_gravar()
+
+    def _contadores_alterados(self, midia, usuario=None, playlist=None) -> None:
+        with self._trava:
+            self._contadores_midias[self._linha_midia_ou_salvar(midia)] = midia
+            self._talvez_gravar()
+
+    def _musica_avaliada(self, musica, nota) -> None:
+        with self._trava:
+            self._avaliacoes_midias[self._linha_midia_ou_salvar(musica)] = musica
+            self._talvez_gravar()
+
+    def _playlist_alterada(self, playlist, midia=None, adicionada: bool = None) -> None:
+        with self._trava:
+            linha = getattr(playlist, "_id_banco", None)
+            if linha is None or not isinstance(midia, ArquivoDeMidia):
+                # Playlist ainda sem linha nesta execução (ou alteração sem o item): grava inteira
+                self.salvar_playlist(playlist)
+                return
+            linha_midia = self._linha_midia_ou_salvar(midia)
+            if adicionada:
+                self._enfileirar(_ACRESCENTAR_ITEM, (linha, linha_midia, linha))
+            else:
+                self._enfileirar(_REMOVER_ITEM, (linha, linha, linha_midia))
+            self._talvez_gravar()
+
+    def _playlist_substituida(self, antiga, nova) -> None:
+        # A nova ocupa a linha da antiga (como ocupa a posição dela na lista do app)
+        linha = getattr(antiga, "_id_banco", None)
+        if linha is not None and getattr(nova, "_id_banco", None) is None:
+            self._associar_playlist(linha, nova)
+        self.salvar_playlist(nova)
+
+    def _playlist_reproduzida(self, playlist) -> None:
+        with self._trava:
+            linha = self._linha_playlist(playlist)
+            if linha is None:
+                self.salvar_playlist(playlist)
+            else:
+                self._contadores_playlists[linha] = playlist
+            self._talvez_gravar()
+
+    # Associação objeto <-> linha
+    def _linha_usuario(self, usuario) -> int:
+        nome = usuario.nome
+        linha = self._usuarios.get(nome)
+        if linha is None:
+            achada = self.conexao.execute("SELECT id FROM usuarios WHERE nome = ?", (nome,)).fetchone()
+            if achada is None:
+                linha = self._novo_id("usuarios")
+                criado = getattr(usuario, "data_criacao", None) or datetime.now()
+                self._enfileirar(_INSERIR_USUARIO, (linha, nome, criado.isoformat(timespec="seconds")))
+            else:
+                linha = achada[0]
+            self._usuarios[nome] = linha
+        if id(usuario) not in self._usuarios_vivos:
+            self._usuarios_vivos[id(usuario)] = usuario
+            self._usuario_por_nome.setdefault(nome, usuario)
+            if not usuario.historico:
+                usuario.historico = self._historico(linha)
+        return linha
+
+    def _linha_associada(self, midia):
+        # O id só vale enquanto a mídia associada à linha é esta (ids são reutilizados)
+        linha = self._linha_midia.get(id(midia))
+        if linha is not None and self._midias.get(linha) is midia:
+            return linha
+        return None
+
+    def _linha_de_midia(self, midia):
+        linha = self._linha_associada(midia)
+        if linha is not None:
+            return linha
+        chave = (normalizar_titulo(midia.titulo), normalizar_titulo(midia.artista))
+        linha = self._chaves_midias.get(chave)
+        anterior = self._midias.get(linha) if linha is not None else None
+        if anterior is not None:
+            # A linha já tem um objeto vivo nesta execução: os contadores vêm dele
+            self._adotar_contadores(midia, anterior.reproducoes, self._histograma(anterior))
+        else:
+            if linha is not None:
+                # O objeto anterior foi coletado: alterações dele ainda na fila vão antes
+                self.gravar()
+            achada = self.conexao.execute(
+                "SELECT id, reproducoes, histograma FROM midias WHERE chave = ? AND chave_artista = ?", chave).fetchone()
+            if achada is None:
+                return None
+            linha, reproducoes, histograma = achada
+            self._adotar_contadores(midia, reproducoes, histograma)
+        self._associar_midia(linha, midia)
+        return linha
+
+    @staticmethod
+    def _adotar_contadores(midia, reproducoes: int, histograma) -> None:
+        # Primeira associação: os contadores guardados passam para o objeto
+        if reproducoes > midia.reproducoes:
+            midia.reproducoes = reproducoes
+        if histograma and isinstance(midia, Musica) and not midia.quantidade_avaliacoes:
+            midia.definir_distribuicao(_HISTOGRAMA.unpack(histograma))
+
+    def _linha_midia_ou_salvar(self, midia) -> int:
+        linha = self._linha_associada(midia)
+        return linha if linha is not None else self.salvar_midia(midia)
+
+    def _associar_midia(self, linha: int, midia) -> None:
+        anterior = self._midias.get(linha)
+        if anterior is not None and anterior is not midia:
+            self._linha_midia.pop(id(anterior), None)
+        self._midias[linha] = midia
+        # Mídias coletadas deixam o id para trás: refaz quando sobram muitos
+        if len(self._linha_midia) > 2 * len(self._midias) + 64:
+            self._linha_midia = {id(m): l for l, m in self._midias.items()}
+        self._linha_midia[id(midia)] = linha
+        self._chaves_midias[(normalizar_titulo(midia.titulo), normalizar_titulo(midia.artista))] = linha
+
+    def _linha_playlist(self, playlist):
+        linha = getattr(playlist, "_id_banco", None)
+        if linha is not None:
+            return linha
+        # Mesma playlist (nome, usuário) ainda sem objeto nesta execução
+        for (achada, reproducoes) in self.conexao.execute(
+                "SELECT id, reproducoes FROM playlists WHERE nome = ? AND usuario = ? ORDER BY id",
+                (playlist.nome, self._nome_dono(playlist))):
+            if achada not in self._playlists:
+                if reproducoes > playlist.reproducoes:
+                    playlist.reproducoes = reproducoes
+                self._associar_playlist(achada, playlist)
+                return achada
+        return None
+
+    def _associar_playlist(self, linha: int, playlist) -> None:
+        anterior = self._playlists.get(linha)
+        if anterior is not None and anterior is not playlist:
+            anterior._id_banco = None
+        playlist._id_banco = linha
+        self._playlists[linha] = playlist
+
+    @staticmethod
+    def _nome_dono(playlist) -> str:
+        return str(getattr(playlist.usuario, "nome", playlist.usuario))
+
+    @staticmethod
+    def _histograma(midia):
+        # O(1): a Musica mantém o histograma (ou no máximo LIMITE_NOTAS notas)
+        if isinstance(midia, Musica) and midia.quantidade_avaliacoes:
+            return _HISTOGRAMA.pack(*midia.distribuicao_avaliacoes())
+        return None
+
+    def _campos_midia(self, midia) -> tuple:
+        podcast = isinstance(midia, Podcast)
+        return ("podcast" if podcast else "musica", midia.titulo, normalizar_titulo(midia.titulo),
+                midia.artista, normalizar_titulo(midia.artista), int(midia.duracao),
+                getattr(midia, "genero", None),
+                midia.episodio if podcast else None,
+                midia.temporada if podcast else None,
+                midia.host if podcast else None,
+                int(midia.reproducoes), self._histograma(midia))
+
+    # Métodos de leitura (carga sob demanda)
+    def buscar_midia(self, titulo: str):
+        """Mídia com o título (ignora espaços e case), carregada no catálogo do app; ou None."""
+        self.gravar()
+        linha = self.conexao.execute(f"SELECT {_COLUNAS_MIDIA} FROM midias WHERE chave = ? ORDER BY id LIMIT 1",
+                                     (normalizar_titulo(titulo),)).fetchone()
+        return self._carregar_midia(linha) if linha is not None else None
+
+    def buscar_usuario(self, nome: str):
+        """Usuário com o nome (mesma formatação de Usuario), com histórico e playlists; ou None."""
+        self.gravar()
+        nome = (nome or "").strip().title()
+        linha = self.conexao.execute("SELECT id, nome, criado_em FROM usuarios WHERE nome = ?", (nome,)).fetchone()
+        if linha is None:
+            return None
+        vivo = self._usuario_por_nome.get(nome)
+        if vivo is not None:
+            return vivo
+        u = Usuario(nome)
+        u.data_criacao = datetime.fromisoformat(linha[2])
+        u.historico = self._historico(linha[0])
+        u.playlists = [self._carregar_playlist(pl) for pl in self.conexao.execute(
+            "SELECT id, nome, usuario, reproducoes FROM playlists WHERE usuario = ? ORDER BY id", (nome,)).fetchall()]
+        self._usuarios[nome] = linha[0]
+        self._usuarios_vivos[id(u)] = u
+        self._usuario_por_nome[nome] = u
+        return u
+
+    def buscar_playlist(self, nome: str):
+        """Primeira playlist com o nome, com os itens carregados; ou None."""
+        self.gravar()
+        linha = self.conexao.execute("SELECT id, nome, usuario, reproducoes FROM playlists "
+                                     "WHERE nome = ? ORDER BY id LIMIT 1", (nome,)).fetchone()
+        return self._carregar_playlist(linha) if linha is not None else None
+
+    def nomes_usuarios(self):
+        """Gera os nomes dos usuários, em ordem de cadastro."""
+        self.gravar()
+        for (nome,) in self.conexao.execute("SELECT nome FROM usuarios ORDER BY id"):
+            yield nome
+
+    def iterar_usuarios(self):
+        """Gera os usuários (objetos temporários, com o histórico) em ordem de cadastro."""
+        self.gravar()
+        for linha, nome, criado in self._paginas("SELECT id, nome, criado_em FROM usuarios ORDER BY id"):
+            u = self._usuario_por_nome.get(nome)
+            if u is None:
+                u = Usuario(nome)
+                u.data_criacao = datetime.fromisoformat(criado)
+                u.historico = self._historico(linha)
+            yield u
+
+    def iterar_midias(self, tipo: str = None):
+        """Gera as mídias ('musica', 'podcast' ou todas), em páginas, como objetos temporários."""
+        self.gravar()
+        if tipo is None:
+            linhas = self._paginas(f"SELECT {_COLUNAS_MIDIA} FROM midias ORDER BY id")
+        else:
+            linhas = self._paginas(f"SELECT {_COLUNAS_MIDIA} FROM midias WHERE tipo = ? ORDER BY id", (tipo,))
+        for linha in linhas:
+            vivo = self._midias.get(linha[0])
+            yield vivo if vivo is not None else self._montar_midia(linha, self._rascunho)
+
+    def iterar_playlists(self):
+        """Gera as playlists com os itens (objetos temporários), em ordem de cadastro."""
+        self.gravar()
+        for linha in self._paginas("SELECT id, nome, usuario, reproducoes FROM playlists ORDER BY id"):
+            vivo = self._playlists.get(linha[0])
+            if vivo is not None:
+                yield vivo
+                continue
+            itens = [self._midias.get(m[0]) or self._montar_midia(m, self._rascunho)
+                     for m in self._itens(linha[0])]
+            yield Playlist(linha[1], linha[2], itens, linha[3])
+
+    def contar(self, tabela: str) -> int:
+        """Quantidade de linhas de 'usuarios', 'midias', 'playlists' ou 'historico'."""
+        if tabela not in ("usuarios", "midias", "playlists", "historico"):
+            raise ValueError(f"Tabela desconhecida: {tabela!r}")
+        self.gravar()
+        return self.conexao.execute(f"SELECT count(*) FROM {tabela}").fetchone()[0]
+
+    def _paginas(self, consulta: str, parametros: tuple = ()):
+        cursor = self.conexao.execute(consulta, parametros)
+        while True:
+            pagina = cursor.fetchmany(self.lote)
+            if not pagina:
+                return
+            yield from pagina
+
+    def _itens(self, linha_playlist: int) -> list:
+        return self.conexao.execute(
+            f"SELECT {_COLUNAS_ITEM} FROM playlist_itens i JOIN midias m ON m.id = i.midia_id "
+            "WHERE i.playlist_id = ? ORDER BY i.posicao", (linha_playlist,)).fetchall()
+
+    def _historico(self, linha_usuario: int) -> list:
+        return [(t, datetime.fromisoformat(em).timestamp()) for t, em in self.conexao.execute(
+            "SELECT titulo, em FROM historico WHERE usuario_id = ? ORDER BY id", (linha_usuario,))]
+
+    @staticmethod
+    def _montar_midia(linha, catalogo):
+        _, tipo, titulo, artista, duracao, genero, episodio, temporada, host, reproducoes, histograma = linha
+        if tipo == "podcast":
+            return Podcast(titulo, duracao, artista, episodio, temporada, host, reproducoes, catalogo=catalogo)
+        musica = Musica(titulo, duracao, artista, genero, reproducoes, catalogo=catalogo)
+        if histograma:
+            musica.definir_distribuicao(_HISTOGRAMA.unpack(histograma))
+        return musica
+
+    def _carregar_midia(self, linha):
+        vivo = self._midias.get(linha[0])
+        if vivo is not None:
+            return vivo
+        midia = self._montar_midia(linha, self.catalogo)
+        self._associar_midia(linha[0], midia)
+        return midia
+
+    def _carregar_playlist(self, linha):
+        vivo = self._playlists.get(linha[0])
+        if vivo is not None:
+            return vivo
+        pl = Playlist(linha[1], linha[2], [self._carregar_midia(m) for m in self._itens(linha[0])], linha[3])
+        self._associar_playlist(linha[0], pl)
+        return pl
+
+    # Métodos especiais
+    def __str__(self):
+        return (f"Banco SQLite {self.caminho} | {len(self._midias)} mídias e "
+                f"{len(self._playlists)} playlists carregadas | {len(self._fila)} comandos na fila")
+
+    def __repr__(self):
+        return f"PersistenciaSQLite(caminho={str(self.caminho)!r}, lote={self.lote})"
@@ -1,17 +1,254 @@
-from pathlib import Path
-from datetime import datetime
+from bisect import bisect_right, insort
+from itertools import islice
 from Streaming.arquivo_midia import ArquivoDeMidia
+from Streaming.contadores import ContadorFragmentado
+from Streaming.eventos import BarramentoEventos, PLAYLIST_REPRODUZIDA, PLAYLIST_ALTERADA
+from Streaming.saida import (Saida, MIDIA_ADICIONADA, MIDIA_NAO_CADASTRADA, MIDIA_REMOVIDA,
+                             MIDIA_FORA_DA_PLAYLIST)
+from Streaming.registro_erros import registrar as _log_erro
 
 
-# LOG_ERROS = Path("erros.log")
+# Marca de posição removida em ItensPlaylist (None é um item válido: mídia não encontrada)
+_REMOVIDA = object()
 
-# def _log_erro(msg: str) -> None:
-#     try:
-#         ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-#         antigo = LOG_ERROS.read_text(encoding="utf-8") if LOG_ERROS.exists() else ""
-#         LOG_ERROS.write_text(antigo + f"[{ts}] {msg}\n", encoding="utf-8")
-#     except Exception:
-#         pass
+
+def _titulo_item(item):
+    # Título usado no índice: o da mídia, ou o próprio texto (o LerMarkdown cria
+    # a playlist com os títulos e só depois troca pelas mídias); None não entra
+    if item is None:
+        return None
+    return (item if isinstance(item, str) else item.titulo).strip()
+
+
+class _Trecho:
+    """
+    Pedaço imutável da corda de itens pendentes de um ItensPlaylist: uma folha
+    (os 'fim' primeiros itens de uma lista compartilhada, sem posições
+    removidas) ou a junção de dois pedaços. Juntar é O(1).
+    """
+
+    __slots__ = ("lista", "fim", "esquerda", "direita", "tamanho")
+
+    def __init__(self, lista=None, fim: int = 0, esquerda=None, direita=None):
+        self.lista = lista
+        self.fim = fim
+        self.esquerda = esquerda
+        self.direita = direita
+        self.tamanho = fim if lista is not None else esquerda.tamanho + direita.tamanho
+
+    @staticmethod
+    def juntar(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return _Trecho(esquerda=a, direita=b)
+
+    def itens(self):
+        # Percorre as folhas da esquerda para a direita (sem recursão: a corda pode ser funda)
+        pilha = [self]
+        while pilha:
+            trecho = pilha.pop()
+            if trecho.lista is not None:
+                yield from islice(trecho.lista, trecho.fim)
+            else:
+                pilha.append(trecho.direita)
+                pilha.append(trecho.esquerda)
+
+
+class ItensPlaylist:
+    """
+    Itens de uma playlist: lista ordenada de mídias com um índice
+    título -> posições ao lado, para que pertinência, remoção por título e
+    detecção de repetidos não percorram a lista.
+    - Remover por título só marca a posição como removida; o acesso por
+      índice pula as marcas, e a lista é compactada depois de algumas
+      remoções (limite_removidas) ou quando metade dela está marcada.
+    - Mantém a contagem de títulos (sem espaços nas pontas e sem case): é a
+      assinatura (multiconjunto) que Playlist.__eq__ compara sem ordenar.
+    - Concatenar outro ItensPlaylist (extend, Playlist.__add__) ou copiar
+      (ItensPlaylist(outro)) é O(1): os itens dele ficam numa corda de
+      pedaços pendentes que compartilham a lista de origem (que é copiada
+      antes de uma remoção, se estiver compartilhada). A corda só é
+      materializada (índice e contagem) quando os itens são percorridos,
+      acessados por índice/fatia ou consultados; len() não materializa.
+    - O índice usa o título de cada mídia no momento em que ela entrou;
+      se um título mudar depois, reindexar() refaz o índice.
+    Continua se comportando como a lista de antes: len(), iteração,
+    índices/fatias, append, extend e 'in'.
+    """
+
+    __slots__ = ("_lista", "_vivos", "_removidas", "_posicoes", "_contagem",
+                 "_compartilhada", "_pendente", "_qtd_pendente")
+
+    limite_removidas = 64   # posições marcadas antes de compactar
+
+    def __init__(self, itens=()):
+        self._lista = []        # mídias na ordem (_REMOVIDA nas posições removidas)
+        self._vivos = 0
+        self._removidas = []    # posições marcadas em _lista, crescentes
+        self._posicoes = {}     # título (strip) -> posições em _lista, crescentes
+        self._contagem = {}     # título (strip, lower) -> ocorrências (a assinatura)
+        self._compartilhada = 0 # _lista[:_compartilhada] é usado por pedaços de outras cordas
+        self._pendente = None   # _Trecho com os itens que vêm depois de _lista (ainda não indexados)
+        self._qtd_pendente = 0
+        self.extend(itens)
+
+    # Métodos de alteração
+    def append(self, midia) -> None:
+        if self._pendente is not None:
+            self._materializar()
+        posicao = len(self._lista)
+        self._lista.append(midia)
+        self._vivos += 1
+        titulo = _titulo_item(midia)
+        if titulo is not None:
+            self._posicoes.setdefault(titulo, []).append(posicao)
+            chave = titulo.lower()
+            self._contagem[chave] = self._contagem.get(chave, 0) + 1
+
+    def extend(self, itens) -> None:
+        if isinstance(itens, ItensPlaylist):
+            # Sem copiar: o conteúdo atual de 'itens' entra na corda pendente
+            trecho = itens._instantaneo()
+            if trecho is not None:
+                self._pendente = _Trecho.juntar(self._pendente, trecho)
+                self._qtd_pendente += trecho.tamanho
+            return
+        for midia in itens:
+            self.append(midia)
+
+    def remover_titulo(self, titulo: str):
+        """Remove a 1ª ocorrência do título (comparado sem espaços nas pontas); retorna a mídia ou None."""
+        self._materializar()
+        titulo = (titulo or "").strip()
+        posicoes = self._posicoes.get(titulo)
+        if not posicoes:
+            return None
+        posicao = posicoes.pop(0)
+        if not posicoes:
+            del self._posicoes[titulo]
+        if posicao < self._compartilhada:
+            # Outra corda lê esta lista: a marca vai numa cópia
+            self._lista = list(self._lista)
+            self._compartilhada = 0
+        midia = self._lista[posicao]
+        self._lista[posicao] = _REMOVIDA
+        self._vivos -= 1
+        insort(self._removidas, posicao)
+        chave = titulo.lower()
+        if self._contagem[chave] == 1:
+            del self._contagem[chave]
+        else:
+            self._contagem[chave] -= 1
+        if len(self._removidas) > self.limite_removidas or len(self._removidas) * 2 > len(self._lista):
+            self._compactar()
+        return midia
+
+    def reindexar(self) -> None:
+        """Refaz o índice e a contagem com os títulos atuais das mídias."""
+        self._materializar()
+        vivos = [m for m in self._lista if m is not _REMOVIDA]
+        self.__init__(vivos)
+
+    def _compactar(self) -> None:
+        # Tira as posições marcadas e desloca as do índice (a contagem não muda)
+        removidas = self._removidas
+        if not removidas:
+            return
+        self._lista = [m for m in self._lista if m is not _REMOVIDA]
+        for posicoes in self._posicoes.values():
+            for i, p in enumerate(posicoes):
+                posicoes[i] = p - bisect_right(removidas, p)
+        self._removidas = []
+        self._compartilhada = 0
+
+    def _instantaneo(self):
+        # Corda com o conteúdo atual, sem copiar itens: a lista passa a ser
+        # compartilhada até o tamanho atual (append depois não a afeta)
+        self._compactar()
+        folha = None
+        if self._lista:
+            folha = _Trecho(self._lista, len(self._lista))
+            self._compartilhada = len(self._lista)
+        return _Trecho.juntar(folha, self._pendente)
+
+    def _materializar(self) -> None:
+        # Passa os itens da corda pendente para a lista, o índice e a contagem
+        pendente = self._pendente
+        if pendente is None:
+            return
+        self._pendente, self._qtd_pendente = None, 0
+        for midia in pendente.itens():
+            self.append(midia)
+
+    def _posicao_fisica(self, indice: int) -> int:
+        # Índice da lista sem as marcas -> posição em _lista
+        self._materializar()
+        if indice < 0:
+            indice += self._vivos
+        if not 0 <= indice < self._vivos:
+            raise IndexError("índice fora da playlist")
+        for removida in self._removidas:
+            if removida > indice:
+                break
+            indice += 1
+        return indice
+
+    # Métodos de consulta (O(1) pelo índice)
+    def contem_titulo(self, titulo: str) -> bool:
+        self._materializar()
+        return (titulo or "").strip() in self._posicoes
+
+    def ocorrencias(self, titulo: str) -> int:
+        """Quantas vezes o título aparece (sem espaços nas pontas e sem case)."""
+        self._materializar()
+        return self._contagem.get((titulo or "").strip().lower(), 0)
+
+    def mesmos_titulos(self, outros: "ItensPlaylist") -> bool:
+        """Mesmos títulos (sem espaços e sem case) nas mesmas quantidades, em qualquer ordem."""
+        if len(self) != len(outros):
+            return False
+        self._materializar()
+        outros._materializar()
+        return self._vivos == outros._vivos and self._contagem == outros._contagem
+
+    # Métodos especiais (compatíveis com a lista de antes)
+    def __len__(self):
+        return self._vivos + self._qtd_pendente
+
+    def __iter__(self):
+        self._materializar()
+        for midia in self._lista:
+            if midia is not _REMOVIDA:
+                yield midia
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            self._materializar()
+            self._compactar()
+            return self._lista[indice]
+        return self._lista[self._posicao_fisica(indice)]
+
+    def __contains__(self, item):
+        self._materializar()
+        if item is None:
+            return None in self._lista
+        if isinstance(item, str):
+            return self.contem_titulo(item)
+        lista = self._lista
+        return any(lista[p] is item or lista[p] == item
+                   for p in self._posicoes.get(_titulo_item(item), ()))
+
+    def __eq__(self, outra):
+        if isinstance(outra, (ItensPlaylist, list, tuple)):
+            return len(self) == len(outra) and all(a is b or a == b for a, b in zip(self, outra))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ItensPlaylist({list(self)!r})"
 
 
 class Playlist:
@@ -20,16 +257,34 @@ class Playlist:
     Com os seguintes atributos:
         nome (str): com o nome da playlist
         usuario (str): com o nome do criador da playlist
-        itens (list): lista de objetos de ArquivoDeMidia
+        itens (ItensPlaylist): objetos de ArquivoDeMidia em ordem, indexados por título
         reproducoes (int): um contador de execuções da playlist
+                           (ContadorFragmentado: várias threads podem tocar a mesma playlist)
     """
     
     # Método construtor
     def __init__(self, nome: str, usuario: str, itens=None, reproducoes: int = 0):
         self.nome = (nome or "Sem nome").strip()
         self.usuario = (usuario or "Usuário não informado").strip()
-        self.itens = list(itens) if itens else []
-        self.reproducoes = reproducoes
+        self.itens = itens
+        self._reproducoes = ContadorFragmentado(reproducoes)
+
+    # Atribuir uma lista (ou qualquer iterável) de mídias cria o ItensPlaylist
+    @property
+    def itens(self) -> ItensPlaylist:
+        return self._itens
+
+    @itens.setter
+    def itens(self, itens) -> None:
+        self._itens = ItensPlaylist(itens or ())
+
+    @property
+    def reproducoes(self) -> int:
+        return self._reproducoes.valor
+
+    @reproducoes.setter
+    def reproducoes(self, valor: int) -> None:
+        self._reproducoes.definir(valor)
 
     # Métodos principais
     # Adiciona uma mídia à playlist a partir do nome (título)
@@ -39,49 +294,51 @@ class Playlist:
         através do método ArquivoDeMidia.buscar_por_titulo(titulo)
         - Se achar, adiciona a mídia (nomes) à playlist.
         - Se não achar, registra o erro no log e retorna False.
+        As mensagens vão para a saída ativa (Saida.ativa).
         """
         titulo = (nome_midia or "").strip()
 
         midia = ArquivoDeMidia.buscar_por_titulo(titulo)
 
         if midia is None:
-            print ("Midia não adicionada!")
-            print(f"'{titulo}' não foi encontrada no cadastro! (playlist '{self.nome}').")
+            Saida.ativa.emitir(MIDIA_NAO_CADASTRADA, titulo=titulo, playlist=self.nome)
+            _log_erro(f"Playlist.adicionar_midia: '{titulo}' não encontrada no cadastro (playlist '{self.nome}').")
             return False
         else:
-            print(f"Mídia '{titulo}' adicionada à playlist '{self.nome}'.")
+            Saida.ativa.emitir(MIDIA_ADICIONADA, titulo=titulo, playlist=self.nome)
             self.itens.append(midia)
+            BarramentoEventos.ativo.publicar(PLAYLIST_ALTERADA, self, midia, True)
             return True
 
     # Remove uma mídia da playlist a partir do nome (título)
     def remover_midia(self, nome_midia: str) -> bool:
         """
         Remove a 1ª ocorrência de uma mídia com o título informado.
-        - Compara o título (nome) da mídia com o atributo 'titulo' do objeto.   
+        - Compara o título (nome) da mídia com o atributo 'titulo' do objeto,
+          pelo índice de títulos dos itens (sem percorrer a lista).
         Retorna: True se removeu, False se não encontrou.
         """
-        titulo = (nome_midia or "").strip()        
-
-        for i, m in enumerate(self.itens):
-            # Compara o título passado com o título das mídias armazenadas
-            if m.titulo.strip() == titulo:
-                print (f"A mídia '{titulo}' foi removida da playlist '{self.nome}'.")
-                del self.itens[i]                
-                return True
-            else:
-                print(f"A mídia '{titulo}' não foi encontrada na playlist '{self.nome}'.")
-                return False
+        titulo = (nome_midia or "").strip()
+
+        removida = self.itens.remover_titulo(titulo)
+        if removida is None:
+            Saida.ativa.emitir(MIDIA_FORA_DA_PLAYLIST, titulo=titulo, playlist=self.nome)
+            return False
+        Saida.ativa.emitir(MIDIA_REMOVIDA, titulo=titulo, playlist=self.nome)
+        BarramentoEventos.ativo.publicar(PLAYLIST_ALTERADA, self, removida, False)
+        return True
 
     # Reproduz a playlist
-    def reproduzir(self) -> None:
+    def reproduzir(self, usuario=None) -> None:
         """
         Simula tocar todas as mídias da lista.
         - Incrementa 1 na contagem de reproduções da Playlist.
         - Incrementa 1 em cada midia tocada.
         - Exibe as informações de cada mídia tocada.
+        - usuario (opcional): quem está ouvindo, repassado às mídias.
         """
         # Incrementa o contador de reproduções da playlist
-        self.reproducoes += 1
+        self.contar_reproducao()
         
         for midia in self.itens:
             # verifica se a mídia não é None (pode ser None se o catálogo estiver incompleto)
@@ -90,14 +347,21 @@ class Playlist:
                 # Tanto musica quanto podcast possuem o método
                 # O próprio método reproduzir() já exibe as informações
                 # O próprio método já incrementa o contador de reproduções
-                midia.reproduzir()
+                midia.reproduzir(usuario, self)
             
+    # Conta uma reprodução da playlist (também usado pelo ReprodutorAssincrono)
+    def contar_reproducao(self) -> None:
+        self._reproducoes.incrementar()
+        BarramentoEventos.ativo.publicar(PLAYLIST_REPRODUZIDA, self)
+
     # Métodos de sobrecarga de operadores
     # Método para somar duas playlists
     def __add__(self, outra):
         """
         Concatena duas playlists usando 'playlist1 + playlist2' e coloca em 'playlist1'.
         Soma as reproduções de ambas as listas
+        Concatenar e copiar os itens é O(1) (corda de ItensPlaylist): as mídias
+        só são percorridas quando a playlist for tocada, listada ou consultada.
         """        
         # Adiciona os objetos da playlist2 com os itens (ojetos: midia)
         # da playlist1 e coloca em playlist1          
@@ -108,7 +372,7 @@ class Playlist:
         
         # Cria a terceira playlist - cópia do estado atual de self
         terceira = Playlist(nome=self.nome, usuario=self.usuario,
-                            itens=list(self.itens), reproducoes=self.reproducoes)
+                            itens=self.itens, reproducoes=self.reproducoes)
         return terceira
 
     # Método para informar o tamanho da playlist
@@ -124,6 +388,11 @@ class Playlist:
         """
         return self.itens[indice]
 
+    # Método para testar se uma mídia (ou um título) está na playlist: 'titulo' in playlist
+    def __contains__(self, item):
+        """Aceita o objeto de mídia ou o título (str); usa o índice de títulos dos itens."""
+        return item in self.itens
+
     # Método para comparar duas playlists
     def __eq__(self, outra):
         """
@@ -152,18 +421,9 @@ class Playlist:
         if len(self.itens) != len(outra.itens):
             return False
 
-        # Método que cria uma lista de nomes ordenados para comparação posterior
-        def nomesOrdenados(playlistOrdem):
-            nomes_ordem = []
-            for m in playlistOrdem.itens:
-                t = m.titulo.strip().lower()
-                nomes_ordem.append(t)
-                
-            # Faz a ordenação dos nomes para comparação posterior
-            nomes_ordem.sort()
-            return nomes_ordem
-
-        return nomesOrdenados(self) == nomesOrdenados(outra)
+        # Mesmos nomes das mídias: compara as assinaturas (multiconjunto de
+        # títulos) mantidas pelos itens, sem montar e ordenar listas de nomes
+        return self.itens.mesmos_titulos(outra.itens)
 
     # Métodos obrigatorios
     # Método __str__
@@ -0,0 +1,115 @@
+# Streaming/ranking.py
+
+import heapq
+
+
+class RankingReproducoes:
+    """
+    Placar das mídias mais reproduzidas, mantido a cada reprodução.
+    Guarda apenas as 'capacidade' primeiras mídias (id -> [_Ref, reproduções]),
+    então "top k agora" é respondido sem percorrer o catálogo.
+    É mantido pelo CatalogoMidia (ver CatalogoMidia.ativar_ranking).
+
+    Como as reproduções normalmente só crescem:
+    - mídia que já está no placar continua nele (O(1));
+    - mídia de fora só entra se passar a última do placar (O(capacidade), raro).
+    Se uma mídia do placar perde reproduções ou sai do catálogo, o placar
+    é reconstruído na próxima consulta (heapq.nlargest sobre o catálogo).
+    Empates ficam na ordem de cadastro, como numa ordenação estável.
+    """
+
+    def __init__(self, catalogo, tipo=None, capacidade: int = 50):
+        self.catalogo = catalogo
+        self.tipo = tipo
+        self.capacidade = max(1, int(capacidade))
+        self._placar = {}        # id(midia) -> [_Ref, reproduções vistas]
+        self._corte = None       # chave da última do placar (pode estar desatualizada para baixo)
+        self._valido = False
+        self._reconstruir()
+
+    @staticmethod
+    def _chave(ref, reproducoes: int) -> tuple:
+        # Mais reproduções primeiro; no empate, o cadastro mais antigo
+        return (reproducoes, -ref.posicao)
+
+    def _aceita(self, midia) -> bool:
+        return self.tipo is None or isinstance(midia, self.tipo)
+
+    def _reconstruir(self) -> None:
+        midias = (m for m in self.catalogo if self._aceita(m))
+        maiores = heapq.nlargest(self.capacidade, midias,
+                                 key=lambda m: self._chave(m._registro, m.reproducoes))
+        self._placar = {id(m): [m._registro, m.reproducoes] for m in maiores}
+        self._atualizar_corte()
+        self._valido = True
+
+    def _atualizar_corte(self) -> None:
+        if len(self._placar) < self.capacidade:
+            self._corte = None  # placar com vaga: qualquer mídia entra
+        else:
+            self._corte = min(self._chave(r, v) for r, v in self._placar.values())
+
+    # Métodos de manutenção (chamados pelo CatalogoMidia)
+    def adicionar(self, midia) -> None:
+        """Considera uma mídia recém-cadastrada."""
+        if self._valido and self._aceita(midia):
+            self._avaliar(midia)
+
+    def remover_chave(self, chave) -> None:
+        """Retira a mídia pelo id; se ela estava no placar, ele será reconstruído."""
+        if self._placar.pop(chave, None) is not None:
+            self._valido = False
+
+    def alterada(self, midia) -> None:
+        """Chamado a cada alteração em 'reproducoes' da mídia."""
+        if not self._valido or not self._aceita(midia):
+            return
+        item = self._placar.get(id(midia))
+        if item is None:
+            self._avaliar(midia)
+        elif midia.reproducoes < item[1]:
+            # Perdeu reproduções: outra mídia de fora pode ter passado à frente
+            self._valido = False
+        else:
+            item[1] = midia.reproducoes
+
+    def _avaliar(self, midia) -> None:
+        ref = midia._registro
+        chave = self._chave(ref, midia.reproducoes)
+        if self._corte is not None and chave <= self._corte:
+            return
+        if len(self._placar) >= self.capacidade:
+            # O corte guardado só fica abaixo do real; confere a última de verdade
+            ultima, valor = min(self._placar.items(), key=lambda kv: self._chave(kv[1][0], kv[1][1]))
+            if chave <= self._chave(valor[0], valor[1]):
+                self._corte = self._chave(valor[0], valor[1])
+                return
+            del self._placar[ultima]
+        self._placar[id(midia)] = [ref, midia.reproducoes]
+        self._atualizar_corte()
+
+    # Métodos de consulta
+    def top(self, k: int = 10) -> list:
+        """Retorna as k mídias mais reproduzidas, em ordem decrescente."""
+        k = max(0, int(k))
+        if k > self.capacidade:
+            # Pedido maior que o placar: seleção parcial sobre o catálogo
+            midias = (m for m in self.catalogo if self._aceita(m))
+            return heapq.nlargest(k, midias, key=lambda m: self._chave(m._registro, m.reproducoes))
+        if not self._valido:
+            self._reconstruir()
+        itens = sorted(self._placar.values(), key=lambda rv: self._chave(rv[0], rv[1]), reverse=True)
+        return [r() for r, _ in itens[:k]]
+
+    # Métodos especiais
+    def __len__(self):
+        """Retorna a quantidade de mídias no placar."""
+        if not self._valido:
+            self._reconstruir()
+        return len(self._placar)
+
+    def __str__(self):
+        return f"Ranking de reproduções | top {self.capacidade} | {len(self)} mídias no placar"
+
+    def __repr__(self):
+        return f"RankingReproducoes(capacidade={self.capacidade}, midias={len(self)})"
@@ -0,0 +1,259 @@
+# Streaming/registro_erros.py
+
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+_PARAR = object()   # item da fila que encerra a thread de gravação
+_CABECALHO = "# Log de erros/avisos\n\n"
+
+
+class RegistroErros:
+    """
+    Log de erros e avisos do pacote (modelo, catálogo e importação dos .md),
+    por padrão em logs/erros.log na raiz do projeto.
+    - registrar()/registrar_varias() só põem as mensagens numa fila limitada e
+      voltam; uma thread de fundo junta o que houver na fila e grava em lote
+      (um write por lote, arquivo aberto uma vez). Com a fila cheia as
+      mensagens são descartadas e contadas, sem travar quem chamou; o total
+      descartado aparece no log.
+    - Rotação por tamanho: passando de 'tamanho_max' bytes, erros.log vira
+      erros.log.1 (o .1 vira .2...), guardando até 'copias' arquivos antigos.
+    - Limite por mensagem: a mesma mensagem (nível + texto) é gravada no máximo
+      'limite_repeticoes' vezes a cada 'janela' segundos; as outras são
+      contadas e resumidas numa linha quando a janela acaba (ou em fechar()).
+    As classes registram no log ativo (RegistroErros.ativo), trocado com usar().
+    """
+
+    ativo = None   # log onde as classes registram (definido abaixo)
+
+    def __init__(self, caminho=None, tamanho_max: int = 1 << 20, copias: int = 3,
+                 limite_repeticoes: int = 5, janela: float = 60.0, capacidade: int = 10_000,
+                 intervalo: float = 0.2):
+        self.caminho = Path(caminho) if caminho else Path(__file__).resolve().parent.parent / "logs" / "erros.log"
+        self.tamanho_max = tamanho_max
+        self.copias = copias
+        self.limite_repeticoes = limite_repeticoes
+        self.janela = janela
+        self.capacidade = capacidade     # itens na fila (cada chamada de registrar* é um item)
+        self.intervalo = intervalo       # segundos ociosos entre verificações de janelas vencidas
+        self.gravadas = 0
+        self.lotes = 0
+        self.descartadas = 0             # fila cheia
+        self.suprimidas = 0              # limite por mensagem
+        self._informadas = 0             # descartadas já avisadas no log
+        self._repeticoes = {}            # (nível, texto) -> [início da janela, vezes, suprimidas, fonte]
+        self._trava = threading.Lock()
+        self._fila = None
+        self._thread = None
+        self._pid = None                 # processo dono da thread (ProcessPoolExecutor usa fork)
+        self._arquivo = None
+
+    @staticmethod
+    def usar(registro: "RegistroErros") -> "RegistroErros":
+        """Define o log ativo e retorna o anterior."""
+        anterior = RegistroErros.ativo
+        RegistroErros.ativo = registro
+        return anterior
+
+    # Métodos de registro (chamados de qualquer thread)
+    def registrar(self, mensagem: str, nivel: str = "ERRO", fonte: str = None) -> None:
+        self.registrar_varias((mensagem,), nivel, fonte)
+
+    def registrar_varias(self, mensagens, nivel: str = "AVISO", fonte: str = None) -> None:
+        """Várias mensagens do mesmo nível/fonte num único item da fila (ex.: avisos de uma importação)."""
+        agora = time.time()
+        linhas, resumos = self._filtrar(nivel, fonte, [str(m) for m in mensagens], agora)
+        for item in resumos:
+            self._enfileirar(item)
+        if linhas:
+            self._enfileirar((agora, nivel, fonte, linhas))
+
+    def _filtrar(self, nivel: str, fonte, textos: list, agora: float) -> tuple:
+        # Aplica o limite por mensagem; devolve (linhas a gravar, itens da fila com resumos de janelas vencidas)
+        linhas, resumos = [], []
+        with self._trava:
+            repeticoes = self._repeticoes
+            for texto in textos:
+                estado = repeticoes.get((nivel, texto))
+                if estado is None or agora - estado[0] >= self.janela:
+                    if estado is not None and estado[2]:
+                        resumos.append((agora, nivel, estado[3], [self._resumo(texto, estado[2])]))
+                    repeticoes[(nivel, texto)] = [agora, 1, 0, fonte]
+                    linhas.append(texto)
+                elif estado[1] < self.limite_repeticoes:
+                    estado[1] += 1
+                    linhas.append(texto)
+                else:
+                    estado[2] += 1
+                    self.suprimidas += 1
+            if len(repeticoes) > 4 * self.capacidade:
+                resumos.extend(self._vencidas(agora))
+        return linhas, resumos
+
+    @staticmethod
+    def _resumo(texto: str, vezes: int) -> str:
+        return f"(+{vezes} repetições suprimidas) {texto}"
+
+    def _vencidas(self, agora: float, todas: bool = False) -> list:
+        # Tira as janelas vencidas (ou todas) do controle; com a trava. Retorna os resumos a gravar.
+        itens = []
+        for chave, (inicio, _, suprimidas, fonte) in list(self._repeticoes.items()):
+            if todas or agora - inicio >= self.janela:
+                del self._repeticoes[chave]
+                if suprimidas:
+                    itens.append((agora, chave[0], fonte, [self._resumo(chave[1], suprimidas)]))
+        return itens
+
+    def _enfileirar(self, item) -> None:
+        if self._pid != os.getpid() or self._thread is None:
+            self._iniciar()
+        try:
+            self._fila.put_nowait(item)
+        except queue.Full:
+            with self._trava:
+                self.descartadas += len(item[3])
+
+    # Métodos de ciclo de vida
+    def _iniciar(self) -> None:
+        with self._trava:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            # Processo novo (ou depois de fechar): fila, thread e arquivo próprios
+            self._fila = queue.Queue(self.capacidade)
+            self._arquivo = None
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._gravar_em_segundo_plano, args=(self._fila,),
+                                            name="registro-erros", daemon=True)
+            self._thread.start()
+
+    def descarregar(self) -> None:
+        """Espera a fila atual ser gravada."""
+        if self._thread is not None and self._pid == os.getpid():
+            self._fila.join()
+
+    def fechar(self) -> None:
+        """Grava os resumos pendentes e o que estiver na fila, para a thread e fecha o arquivo."""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        with self._trava:
+            resumos = self._vencidas(time.time(), todas=True)
+        for item in resumos:
+            self._fila.put(item)
+        self._fila.put(_PARAR)
+        self._thread.join()
+        self._thread = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    # Thread de gravação
+    def _gravar_em_segundo_plano(self, fila) -> None:
+        while True:
+            try:
+                lote = [fila.get(timeout=self.intervalo)]
+            except queue.Empty:
+                # Ocioso: grava os resumos das janelas que venceram sem novas mensagens
+                with self._trava:
+                    resumos = self._vencidas(time.time())
+                if resumos:
+                    self._escrever(resumos)
+                continue
+            while lote[-1] is not _PARAR:
+                try:
+                    lote.append(fila.get_nowait())
+                except queue.Empty:
+                    break
+            parar = lote[-1] is _PARAR
+            self._escrever([item for item in lote if item is not _PARAR])
+            for _ in lote:
+                fila.task_done()
+            if parar:
+                return
+
+    def _escrever(self, itens: list) -> None:
+        linhas = []
+        segundo, carimbo = None, ""
+        for instante, nivel, fonte, textos in itens:
+            if int(instante) != segundo:   # formata a data uma vez por segundo, não por mensagem
+                segundo = int(instante)
+                carimbo = datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+            prefixo = f"[{carimbo}] {nivel}" + (f" ({fonte}): " if fonte else ": ")
+            linhas.extend(prefixo + texto for texto in textos)
+        with self._trava:
+            novas, self._informadas = self.descartadas - self._informadas, self.descartadas
+        if novas:
+            linhas.append(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] AVISO: "
+                          f"{novas} mensagens descartadas (fila do log cheia)")
+        if not linhas:
+            return
+        try:
+            self._gravar_linhas(linhas)
+            self.gravadas += len(linhas)
+            self.lotes += 1
+        except OSError:
+            # Sem onde gravar (disco cheio, sem permissão): o programa segue sem o log
+            with self._trava:
+                self.descartadas += len(linhas)
+                self._informadas += len(linhas)
+
+    def _gravar_linhas(self, linhas: list) -> None:
+        # Um write por lote; se o lote passar de tamanho_max, rotaciona no meio dele
+        arquivo = self._abrir()
+        tamanho = arquivo.tell()
+        bloco = []
+        for linha in linhas:
+            n = len(linha.encode("utf-8")) + 1
+            if tamanho + n > self.tamanho_max and tamanho > len(_CABECALHO):
+                arquivo.write("".join(bloco))
+                bloco = []
+                self._rotacionar()
+                arquivo = self._abrir()
+                tamanho = arquivo.tell()
+            bloco.append(linha + "\n")
+            tamanho += n
+        arquivo.write("".join(bloco))
+        arquivo.flush()
+
+    def _abrir(self):
+        if self._arquivo is None:
+            self.caminho.parent.mkdir(parents=True, exist_ok=True)
+            self._arquivo = self.caminho.open("a", encoding="utf-8")
+            if self._arquivo.tell() == 0:
+                self._arquivo.write(_CABECALHO)
+        return self._arquivo
+
+    def _rotacionar(self) -> None:
+        self._arquivo.close()
+        self._arquivo = None
+        if self.copias < 1:
+            self.caminho.unlink()
+            return
+        for n in range(self.copias - 1, 0, -1):
+            if self._antigo(n).exists():
+                os.replace(self._antigo(n), self._antigo(n + 1))
+        os.replace(self.caminho, self._antigo(1))
+
+    def _antigo(self, numero: int) -> Path:
+        return self.caminho.with_name(f"{self.caminho.name}.{numero}")
+
+    # Métodos especiais
+    def __str__(self):
+        return (f"Log de erros {self.caminho} | {self.gravadas} linhas em {self.lotes} lotes | "
+                f"{self.suprimidas} suprimidas | {self.descartadas} descartadas")
+
+    def __repr__(self):
+        return f"RegistroErros(caminho={str(self.caminho)!r}, tamanho_max={self.tamanho_max}, copias={self.copias})"
+
+
+def registrar(mensagem: str, nivel: str = "ERRO", fonte: str = None) -> None:
+    """Registra no log ativo (atalho para as classes do modelo)."""
+    RegistroErros.ativo.registrar(mensagem, nivel, fonte)
+
+
+RegistroErros.ativo = RegistroErros()
+atexit.register(lambda: RegistroErros.ativo.fechar())
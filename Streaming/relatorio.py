@@ -0,0 +1,248 @@
+# Streaming/relatorio.py
+
+import heapq
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+
+class Coletor:
+    """
+    Base dos coletores de métricas do relatório.
+    Cada coletor declara as coleções que quer receber (colecoes) e é alimentado
+    item a item pelo MotorRelatorio durante a única passada por cada coleção;
+    ao final escreve a sua seção, linha a linha, pela função recebida.
+    Para uma nova estatística basta criar um coletor: nenhuma passada extra.
+    Coletores ligados a MetricasIncrementais não pedem coleção nenhuma:
+    leem os valores já mantidos pelos eventos.
+    """
+
+    colecoes = ()   # subconjunto de ("usuarios", "musicas", "playlists")
+
+    def iniciar(self, colecoes: dict) -> None:
+        """Recebe as coleções (nome -> coleção) antes da passada."""
+
+    def adicionar(self, colecao: str, item) -> None:
+        """Recebe um item da coleção durante a passada."""
+
+    def escrever(self, escrever) -> None:
+        """Escreve a seção chamando escrever(linha) para cada linha."""
+
+
+class ColetorResumo(Coletor):
+    """
+    Totais de usuários, músicas, playlists e reproduções dos históricos.
+    Com metricas, os totais vêm de len() das coleções e das métricas (O(1)).
+    """
+
+    colecoes = ("usuarios", "musicas", "playlists")
+
+    def __init__(self, metricas=None):
+        self.totais = dict.fromkeys(self.colecoes, 0)
+        self.reproducoes = 0
+        self.metricas = metricas
+        if metricas is not None:
+            self.colecoes = ()
+
+    def iniciar(self, colecoes):
+        if self.metricas is not None:
+            self.totais = {nome: len(colecao) for nome, colecao in colecoes.items()}
+            self.reproducoes = self.metricas.total_reproducoes
+
+    def adicionar(self, colecao, item):
+        self.totais[colecao] += 1
+        if colecao == "usuarios":
+            self.reproducoes += item.total_reproducoes
+
+    def escrever(self, escrever):
+        escrever("— Resumo —")
+        escrever(f"Total de usuários: {self.totais['usuarios']}")
+        escrever(f"Total de músicas: {self.totais['musicas']}")
+        escrever(f"Total de playlists: {self.totais['playlists']}")
+        escrever(f"Total de reproduções (históricos de usuários): {self.reproducoes}")
+        escrever("")
+
+
+class ColetorTopMusicas(Coletor):
+    """
+    As top_n músicas mais reproduzidas, com heap de tamanho top_n durante a passada
+    (empates na ordem da coleção). Com um RankingReproducoes, usa o placar e não coleta nada.
+    """
+
+    colecoes = ("musicas",)
+
+    def __init__(self, top_n: int = 10, ranking=None, metricas=None):
+        self.top_n = top_n
+        if ranking is None and metricas is not None:
+            ranking = metricas.ranking
+        self.ranking = ranking
+        if ranking is not None:
+            self.colecoes = ()
+        self._heap = []
+        self._posicao = 0
+
+    def adicionar(self, colecao, item):
+        n = max(0, int(self.top_n))
+        if n == 0:
+            return
+        # (reproduções, -posição): na menor chave fica a que sai primeiro do top
+        entrada = (item.reproducoes, -self._posicao, item)
+        self._posicao += 1
+        if len(self._heap) < n:
+            heapq.heappush(self._heap, entrada)
+        elif entrada[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entrada)
+
+    def top(self) -> list:
+        if self.ranking is not None:
+            return self.ranking.top(self.top_n)
+        return [m for _, _, m in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+    def escrever(self, escrever):
+        top = self.top()
+        escrever(f"— Top {self.top_n} músicas por reproduções —")
+        if top:
+            for i, m in enumerate(top, start=1):
+                escrever(f"{i:02d}. '{m.titulo}' — {m.artista} | reproduções: {m.reproducoes}")
+        else:
+            escrever("Nenhuma música cadastrada.")
+        escrever("")
+
+
+class ColetorPlaylistPopular(Coletor):
+    """Playlist com mais reproduções (a primeira, em caso de empate)."""
+
+    colecoes = ("playlists",)
+
+    def __init__(self, metricas=None):
+        self.playlist = None
+        self.metricas = metricas
+        if metricas is not None:
+            self.colecoes = ()
+
+    def iniciar(self, colecoes):
+        if self.metricas is not None:
+            self.playlist = self.metricas.playlist_mais_popular()
+
+    def adicionar(self, colecao, item):
+        if self.playlist is None or item.reproducoes > self.playlist.reproducoes:
+            self.playlist = item
+
+    def escrever(self, escrever):
+        pl_pop = self.playlist
+        escrever("— Playlist mais popular —")
+        if pl_pop:
+            escrever(f"'{pl_pop.nome}' — criador: {pl_pop.usuario} | itens: {len(pl_pop)} | reproduções: {pl_pop.reproducoes}")
+        else:
+            escrever("Nenhuma playlist cadastrada.")
+        escrever("")
+
+
+class ColetorUsuarioAtivo(Coletor):
+    """Usuário com o maior histórico (o primeiro, em caso de empate)."""
+
+    colecoes = ("usuarios",)
+
+    def __init__(self, metricas=None):
+        self.usuario = None
+        self._tamanho = -1
+        self.metricas = metricas
+        if metricas is not None:
+            self.colecoes = ()
+
+    def iniciar(self, colecoes):
+        if self.metricas is not None:
+            self.usuario = self.metricas.usuario_mais_ativo()
+
+    def adicionar(self, colecao, item):
+        tamanho = item.total_reproducoes
+        if tamanho > self._tamanho:
+            self.usuario, self._tamanho = item, tamanho
+
+    def escrever(self, escrever):
+        user_ativo = self.usuario
+        escrever("— Usuário mais ativo —")
+        if user_ativo:
+            escrever(f"{user_ativo.nome} — músicas no histórico: {user_ativo.total_reproducoes}")
+        else:
+            escrever("Nenhum usuário cadastrado.")
+        escrever("")
+
+
+class ColetorMediasAvaliacoes(Coletor):
+    """
+    Média das avaliações de cada música (O(1) por música, ver Musica.media_avaliacoes).
+    As linhas vão para um arquivo temporário durante a passada (em memória
+    só enquanto pequeno), então a seção não fica inteira na memória.
+    Títulos repetidos aparecem uma vez, com a média da primeira ocorrência.
+    """
+
+    colecoes = ("musicas",)
+
+    def __init__(self):
+        self._linhas = tempfile.SpooledTemporaryFile(max_size=1 << 20, mode="w+", encoding="utf-8")
+        self._titulos = set()
+
+    def adicionar(self, colecao, item):
+        titulo = item.titulo.strip()
+        if titulo in self._titulos:
+            return
+        self._titulos.add(titulo)
+        self._linhas.write(f"'{titulo}': {item.media_avaliacoes():.2f}\n")
+
+    def escrever(self, escrever):
+        escrever("— Médias de avaliações por música —")
+        if self._titulos:
+            self._linhas.seek(0)
+            for linha in self._linhas:
+                escrever(linha[:-1])
+        else:
+            escrever("Nenhuma música com avaliações.")
+        escrever("")
+        self._linhas.close()
+        self._titulos = set()
+
+
+class MotorRelatorio:
+    """
+    Gera o relatório em uma única passada por coleção (usuários, músicas, playlists):
+    cada item é entregue a todos os coletores interessados naquela coleção.
+    Depois grava o cabeçalho e as seções dos coletores, na ordem da lista,
+    direto no arquivo (linha a linha, sem montar o texto inteiro na memória).
+    """
+
+    def __init__(self, coletores):
+        self.coletores = list(coletores)
+
+    def gerar(self, destino: Path, usuarios=(), musicas=(), playlists=()) -> Path:
+        """Percorre as coleções, grava o relatório em destino e o retorna."""
+        colecoes = {"usuarios": usuarios, "musicas": musicas, "playlists": playlists}
+        for coletor in self.coletores:
+            coletor.iniciar(colecoes)
+        for nome, colecao in colecoes.items():
+            interessados = [c.adicionar for c in self.coletores if nome in c.colecoes]
+            if not interessados:
+                continue
+            for item in colecao:
+                for adicionar in interessados:
+                    adicionar(nome, item)
+
+        destino = Path(destino)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        with open(destino, "w", encoding="utf-8") as arq:
+            primeira = True
+
+            # Linhas separadas por "\n", sem quebra após a última (mesmo formato de "\n".join)
+            def escrever(linha: str) -> None:
+                nonlocal primeira
+                if not primeira:
+                    arq.write("\n")
+                primeira = False
+                arq.write(linha)
+
+            escrever("=== Relatório de Análises ===")
+            escrever(f"Gerado em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            escrever("")
+            for coletor in self.coletores:
+                coletor.escrever(escrever)
+        return destino
@@ -0,0 +1,354 @@
+# Streaming/reprodutor.py
+
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from .registro_erros import registrar as _log_erro
+from .saida import Saida
+
+
+class Sessao:
+    """Estado de reprodução de um ouvinte: fila de playlists e mídia atual."""
+
+    __slots__ = ("usuario", "fila", "playlist", "indice", "midia", "posicao", "inicio", "timer", "pausado")
+
+    def __init__(self, usuario):
+        self.usuario = usuario
+        self.fila = deque()      # playlists esperando a vez
+        self.playlist = None     # playlist tocando
+        self.indice = -1         # posição da mídia atual na playlist
+        self.midia = None        # mídia atual (None: ouvinte parado)
+        self.posicao = 0.0       # segundos da mídia já tocados até 'inicio'
+        self.inicio = None       # loop.time() do último play/continuar (None: pausada)
+        self.timer = None        # fim agendado da mídia atual (asyncio.TimerHandle)
+        self.pausado = False
+
+
+class ReprodutorAssincrono:
+    """
+    Reprodução de playlists em segundo plano, num loop asyncio.
+    - Cada ouvinte (usuário) tem uma Sessao com a fila das playlists pedidas;
+      elas tocam uma depois da outra, item a item.
+    - A duração de cada mídia ('duracao', em segundos) vira um timer do loop
+      (loop.call_later): nada fica bloqueado enquanto a música "toca", então
+      milhares de ouvintes simulados cabem num processo só.
+    - Comandos por ouvinte: enfileirar, pular, pausar, continuar, posicionar
+      (seek) e interromper. Podem ser chamados de qualquer thread (o menu do
+      app) ou de dentro do próprio loop (ex.: um servidor asyncio).
+    - 'velocidade': segundos de mídia por segundo real (1.0 = tempo real;
+      benchmarks e simulações usam valores altos).
+    - Cada início de mídia conta como reprodução (ArquivoDeMidia.reproduzir,
+      com usuário e playlist no evento) e cada início de playlist também
+      (Playlist.contar_reproducao). Com 'trava' (a do StreamingApp), esses
+      registros só são aplicados quando a trava está livre: enquanto o menu
+      executa um comando, ficam numa fila e o loop não para de tocar.
+    """
+
+    velocidade = 1.0
+    intervalo_pendentes = 0.05   # segundos entre tentativas de pegar a trava
+    espera_comando = 1.0         # segundos que um comando de outra thread espera o loop
+
+    def __init__(self, trava=None, exibir: bool = True, velocidade: float = None):
+        self.trava = trava
+        self.exibir = exibir
+        if velocidade is not None:
+            self.velocidade = velocidade
+        self.sessoes = {}             # nome do usuário -> Sessao
+        self.tocando = 0              # ouvintes com mídia atual
+        self.concluidas = 0           # mídias tocadas até o fim
+        self.atraso_max = 0.0         # maior atraso de um timer (s), mede a folga do loop
+        self._atraso_total = 0.0
+        self._pendentes = deque()     # registros esperando a trava
+        self._agendado = None
+        self._loop = None
+        self._thread = None
+        self._ocioso = None           # asyncio.Event: nenhum ouvinte tocando (ver aguardar)
+
+    # Métodos de ciclo de vida
+    def iniciar(self) -> "ReprodutorAssincrono":
+        """Cria o loop numa thread própria (daemon). Chamar de novo não tem efeito."""
+        if self._thread is None or not self._thread.is_alive():
+            pronto = threading.Event()
+
+            def executar():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self.usar_loop(loop)
+                pronto.set()
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            self._thread = threading.Thread(target=executar, name="reprodutor", daemon=True)
+            self._thread.start()
+            pronto.wait()
+        return self
+
+    def usar_loop(self, loop=None) -> "ReprodutorAssincrono":
+        """Usa um loop já existente (padrão: o que está rodando), sem thread própria."""
+        self._loop = loop or asyncio.get_running_loop()
+        self._ocioso = asyncio.Event()
+        self._ocioso.set()
+        return self
+
+    def parar(self, espera: float = None) -> None:
+        """Interrompe todos os ouvintes, aplica os registros pendentes e encerra a thread do loop."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        if self._thread is not None:
+            fim = asyncio.run_coroutine_threadsafe(self._encerrar(), self._loop)
+            try:
+                fim.result(espera)
+            except Exception:
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(espera)
+            self._thread = None
+        else:
+            self._parar_todos()
+
+    async def _encerrar(self) -> None:
+        self._parar_todos()
+        if self.trava is not None and self._pendentes:
+            # Último esvaziamento: espera a trava sem bloquear o loop
+            while not self.trava.acquire(blocking=False):
+                await asyncio.sleep(self.intervalo_pendentes)
+            try:
+                self._aplicar_pendentes()
+            finally:
+                self.trava.release()
+
+    def _parar_todos(self) -> None:
+        for s in self.sessoes.values():
+            self._interromper(s)
+        self._descarregar()
+
+    async def aguardar(self) -> None:
+        """Espera (de dentro do loop) até nenhum ouvinte estar tocando."""
+        await self._ocioso.wait()
+
+    # Comandos (podem ser chamados de qualquer thread)
+    def enfileirar(self, usuario, playlist) -> None:
+        """Põe a playlist na fila do usuário; começa a tocar se ele estava parado."""
+        self._chamar(self._enfileirar, usuario, playlist)
+
+    def pular(self, usuario) -> None:
+        """Passa para a próxima mídia (ou próxima playlist da fila)."""
+        self._chamar(self._comando, usuario, self._pular)
+
+    def pausar(self, usuario) -> None:
+        self._chamar(self._comando, usuario, self._pausar)
+
+    def continuar(self, usuario) -> None:
+        self._chamar(self._comando, usuario, self._continuar)
+
+    def posicionar(self, usuario, segundos: float) -> None:
+        """Vai para 'segundos' da mídia atual (seek); além do fim, passa para a próxima."""
+        self._chamar(self._comando, usuario, self._posicionar, float(segundos))
+
+    def interromper(self, usuario) -> None:
+        """Para a mídia atual e esvazia a fila do usuário."""
+        self._chamar(self._comando, usuario, self._interromper)
+
+    def _chamar(self, funcao, *args) -> None:
+        if self._loop is None:
+            self.iniciar()
+        try:
+            dentro = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            dentro = False
+        if dentro:
+            funcao(*args)
+            return
+        # De outra thread: espera o loop executar, para um estado() logo depois já ver o comando.
+        # Erros do comando voltam para quem chamou; loop travado vira TimeoutError (e vai para o log).
+        feito = Future()
+
+        def executar():
+            if not feito.set_running_or_notify_cancel():
+                return   # desistiram de esperar: não executa atrasado
+            try:
+                feito.set_result(funcao(*args))
+            except BaseException as e:
+                feito.set_exception(e)
+        self._loop.call_soon_threadsafe(executar)
+        try:
+            feito.result(self.espera_comando)
+        except TimeoutError:
+            if not feito.cancel():
+                feito.result()   # começou a executar no limite: espera terminar
+                return
+            nome = (args[1] if funcao == self._comando else funcao).__name__.lstrip("_")
+            _log_erro(f"ReprodutorAssincrono: comando '{nome}' não executado em "
+                      f"{self.espera_comando} s (loop ocupado).")
+            raise TimeoutError(f"Reprodutor ocupado: comando '{nome}' não executado.") from None
+
+    # Consultas
+    def estado(self, usuario) -> dict:
+        """Situação do ouvinte: mídia, posição (s), duração, pausado e playlists na fila."""
+        s = self.sessoes.get(usuario.nome)
+        if s is None or s.midia is None:
+            return {"midia": None, "playlist": None, "posicao": 0.0, "duracao": 0,
+                    "pausado": False, "fila": len(s.fila) if s else 0}
+        return {"midia": s.midia, "playlist": s.playlist, "posicao": round(self._posicao(s), 1),
+                "duracao": s.midia.duracao, "pausado": s.pausado, "fila": len(s.fila)}
+
+    def _posicao(self, s: Sessao) -> float:
+        if s.inicio is None:
+            return s.posicao
+        return s.posicao + (self._loop.time() - s.inicio) * self.velocidade
+
+    # Métodos internos (rodam sempre no loop)
+    def _sessao(self, usuario) -> Sessao:
+        s = self.sessoes.get(usuario.nome)
+        if s is None:
+            s = self.sessoes[usuario.nome] = Sessao(usuario)
+        return s
+
+    def _comando(self, usuario, funcao, *args) -> None:
+        s = self.sessoes.get(usuario.nome)
+        if s is not None:
+            funcao(s, *args)
+
+    def _enfileirar(self, usuario, playlist) -> None:
+        s = self._sessao(usuario)
+        s.fila.append(playlist)
+        if s.midia is None:
+            self._proxima(s)
+
+    def _proxima(self, s: Sessao) -> None:
+        """Toca a próxima mídia da playlist atual ou da fila; sem nenhuma, o ouvinte para."""
+        self._cancelar(s)
+        while True:
+            if s.playlist is not None and s.indice + 1 < len(s.playlist.itens):
+                s.indice += 1
+                midia = s.playlist.itens[s.indice]
+                if midia is not None:
+                    self._tocar(s, midia)
+                    return
+            elif s.fila:
+                s.playlist = s.fila.popleft()
+                s.indice = -1
+                self._registrar(s.playlist.contar_reproducao)
+            else:
+                s.playlist = None
+                self._definir_midia(s, None)
+                return
+
+    def _definir_midia(self, s: Sessao, midia) -> None:
+        if (s.midia is None) != (midia is None):
+            self.tocando += 1 if midia is not None else -1
+            if self.tocando:
+                self._ocioso.clear()
+            else:
+                self._ocioso.set()
+        s.midia = midia
+
+    def _tocar(self, s: Sessao, midia) -> None:
+        self._definir_midia(s, midia)
+        s.posicao = 0.0
+        self._registrar(midia.reproduzir, s.usuario, s.playlist, self.exibir)
+        if not s.pausado:
+            self._agendar(s)
+
+    def _agendar(self, s: Sessao) -> None:
+        # Timer para o fim da mídia atual, a partir da posição atual
+        restante = max(0.0, float(s.midia.duracao or 0) - s.posicao)
+        s.inicio = self._loop.time()
+        previsto = s.inicio + restante / self.velocidade
+        s.timer = self._loop.call_at(previsto, self._terminou, s, previsto)
+
+    def _cancelar(self, s: Sessao) -> None:
+        if s.timer is not None:
+            s.timer.cancel()
+            s.timer = None
+        if s.inicio is not None and s.midia is not None:
+            s.posicao = self._posicao(s)
+        s.inicio = None
+
+    def _terminou(self, s: Sessao, previsto: float) -> None:
+        atraso = self._loop.time() - previsto
+        self._atraso_total += atraso
+        if atraso > self.atraso_max:
+            self.atraso_max = atraso
+        s.timer = None
+        s.inicio = None
+        self.concluidas += 1
+        self._proxima(s)
+
+    def _pular(self, s: Sessao) -> None:
+        if s.midia is not None:
+            self._proxima(s)
+
+    def _pausar(self, s: Sessao) -> None:
+        if s.midia is not None and not s.pausado:
+            self._cancelar(s)
+            s.pausado = True
+
+    def _continuar(self, s: Sessao) -> None:
+        if s.pausado:
+            s.pausado = False
+            if s.midia is not None:
+                self._agendar(s)
+
+    def _posicionar(self, s: Sessao, segundos: float) -> None:
+        if s.midia is None:
+            return
+        self._cancelar(s)
+        s.posicao = min(max(0.0, segundos), float(s.midia.duracao or 0))
+        if not s.pausado:
+            self._agendar(s)
+
+    def _interromper(self, s: Sessao) -> None:
+        self._cancelar(s)
+        s.fila.clear()
+        s.playlist = None
+        s.pausado = False
+        self._definir_midia(s, None)
+
+    # Registros (contadores e eventos), aplicados com a trava do app
+    def _registrar(self, funcao, *args) -> None:
+        self._pendentes.append((funcao, args))
+        if self._agendado is None:
+            self._descarregar()
+
+    def _descarregar(self) -> None:
+        self._agendado = None
+        if not self._pendentes:
+            return
+        if self.trava is None:
+            self._aplicar_pendentes()
+        elif self.trava.acquire(blocking=False):
+            try:
+                self._aplicar_pendentes()
+            finally:
+                self.trava.release()
+        else:
+            # O menu está no meio de um comando: tenta de novo daqui a pouco
+            self._agendado = self._loop.call_later(self.intervalo_pendentes, self._descarregar)
+
+    def _aplicar_pendentes(self) -> None:
+        pendentes = self._pendentes
+        while pendentes:
+            funcao, args = pendentes.popleft()
+            funcao(*args)
+        if self.exibir:
+            # As linhas "Reproduzindo" deste lote aparecem agora, não no próximo comando do menu
+            Saida.ativa.descarregar()
+
+    # Métodos especiais
+    def __len__(self):
+        """Quantidade de ouvintes tocando agora."""
+        return self.tocando
+
+    def __str__(self):
+        media = self._atraso_total / self.concluidas if self.concluidas else 0.0
+        return (f"Reprodutor | {self.tocando} ouvintes tocando de {len(self.sessoes)} | "
+                f"{self.concluidas} mídias concluídas | atraso médio {media * 1000:.2f} ms, "
+                f"máx. {self.atraso_max * 1000:.2f} ms")
+
+    def __repr__(self):
+        return f"ReprodutorAssincrono(velocidade={self.velocidade}, sessoes={len(self.sessoes)}, tocando={self.tocando})"
@@ -0,0 +1,123 @@
+# Streaming/saida.py
+
+import atexit
+import json
+import sys
+import threading
+import time
+
+# Mensagens das classes do pacote (evento -> texto do console; os campos vão no .format)
+REPRODUZINDO = "reproduzindo"                      # titulo, artista, duracao, reproducoes
+MIDIA_ADICIONADA = "midia_adicionada"              # titulo, playlist
+MIDIA_NAO_CADASTRADA = "midia_nao_cadastrada"      # titulo, playlist
+MIDIA_REMOVIDA = "midia_removida"                  # titulo, playlist
+MIDIA_FORA_DA_PLAYLIST = "midia_fora_da_playlist"  # titulo, playlist
+
+MENSAGENS = {
+    REPRODUZINDO: "-> Reproduzindo: '{titulo}' — {artista} de {duracao} segundos. (Total de reproduções: {reproducoes})",
+    MIDIA_ADICIONADA: "Mídia '{titulo}' adicionada à playlist '{playlist}'.",
+    MIDIA_NAO_CADASTRADA: "Midia não adicionada!\n'{titulo}' não foi encontrada no cadastro! (playlist '{playlist}').",
+    MIDIA_REMOVIDA: "A mídia '{titulo}' foi removida da playlist '{playlist}'.",
+    MIDIA_FORA_DA_PLAYLIST: "A mídia '{titulo}' não foi encontrada na playlist '{playlist}'.",
+}
+
+
+class Saida:
+    """
+    Destino das mensagens das classes do pacote (reproduzindo, mídia
+    adicionada/removida...), no lugar de um print() por mensagem.
+    As classes emitem na saída ativa (Saida.ativa); cada StreamingApp
+    escolhe a sua e a ativa com Saida.usar(), como faz com o barramento de
+    eventos. Esta classe base descarta tudo (ver SaidaSilenciosa).
+    """
+
+    ativa = None   # saída onde as mensagens são emitidas (definida abaixo)
+
+    @staticmethod
+    def usar(saida: "Saida") -> "Saida":
+        """Define a saída ativa e retorna a anterior (com o que ela tinha guardado já escrito)."""
+        anterior = Saida.ativa
+        Saida.ativa = saida
+        if anterior is not None:
+            anterior.descarregar()
+        return anterior
+
+    def emitir(self, evento: str, **dados) -> None:
+        """Entrega a mensagem 'evento' (ver MENSAGENS) com os seus campos."""
+
+    def descarregar(self) -> None:
+        """Escreve o que estiver guardado (sem efeito nas saídas sem buffer)."""
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class SaidaSilenciosa(Saida):
+    """
+    Não mostra nada: para cargas em lote, benchmarks e o modo servidor
+    (as reproduções continuam contadas e publicadas no barramento).
+    """
+
+    def __init__(self):
+        self.descartadas = 0
+
+    def emitir(self, evento: str, **dados) -> None:
+        self.descartadas += 1
+
+
+class SaidaConsole(Saida):
+    """
+    Mensagens em texto no console, em lotes: as linhas ficam num buffer e
+    vão num único write quando chegam a 'linhas_lote', em descarregar()
+    (o app chama ao fim de cada comando) ou ao sair do programa.
+    Tocar uma playlist de 10 mil itens faz dezenas de escritas, não 10 mil.
+    fluxo=None: sys.stdout do momento da escrita.
+    """
+
+    linhas_lote = 256
+
+    def __init__(self, fluxo=None, linhas_lote: int = None):
+        self.fluxo = fluxo
+        if linhas_lote is not None:
+            self.linhas_lote = linhas_lote
+        self.escritas = 0
+        self._buffer = []
+        self._trava = threading.Lock()   # o reprodutor emite de outra thread
+
+    def emitir(self, evento: str, **dados) -> None:
+        linha = self._formatar(evento, dados)
+        with self._trava:
+            self._buffer.append(linha)
+            cheio = len(self._buffer) >= self.linhas_lote
+        if cheio:
+            self.descarregar()
+
+    def _formatar(self, evento: str, dados: dict) -> str:
+        return MENSAGENS[evento].format(**dados)
+
+    def descarregar(self) -> None:
+        with self._trava:
+            if not self._buffer:
+                return
+            linhas, self._buffer = self._buffer, []
+            fluxo = self.fluxo or sys.stdout
+            fluxo.write("\n".join(linhas) + "\n")
+            fluxo.flush()
+            self.escritas += 1
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(linhas_lote={self.linhas_lote}, guardadas={len(self._buffer)})"
+
+
+class SaidaEstruturada(SaidaConsole):
+    """
+    Uma linha JSON por mensagem ({"evento": ..., "instante": ..., campos}),
+    com os mesmos lotes da SaidaConsole: para outro programa ler a saída.
+    """
+
+    def _formatar(self, evento: str, dados: dict) -> str:
+        return json.dumps({"evento": evento, "instante": time.time(), **dados}, ensure_ascii=False, default=str)
+
+
+Saida.ativa = SaidaConsole()
+atexit.register(lambda: Saida.ativa.descarregar())
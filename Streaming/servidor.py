@@ -0,0 +1,298 @@
+# Streaming/servidor.py
+
+import asyncio
+import json
+import time
+from itertools import islice
+
+from .playlist import Playlist
+from .registro_erros import registrar as _log_erro
+
+# Atalhos: as mesmas opções de Menu.opcoes_usuario ("op": "5" equivale a "reproduzir_playlist")
+ATALHOS = {
+    "1": "reproduzir_musica",
+    "2": "listar_musicas",
+    "3": "listar_podcasts",
+    "4": "listar_playlists",
+    "5": "reproduzir_playlist",
+    "6": "criar_playlist",
+    "7": "concatenar_playlists",
+    "8": "gerar_relatorio",
+    "9": "sair",
+    "10": "controlar_reproducao",
+}
+
+# Operações que não precisam de login (as do menu inicial)
+SEM_LOGIN = {"entrar", "criar_usuario", "listar_usuarios", "ping"}
+
+
+def _midia(m) -> dict:
+    return {"tipo": m.__class__.__name__.lower(), "titulo": m.titulo, "artista": m.artista,
+            "duracao": m.duracao, "reproducoes": m.reproducoes}
+
+
+def _playlist(pl) -> dict:
+    return {"nome": pl.nome, "usuario": getattr(pl.usuario, "nome", pl.usuario), "reproducoes": pl.reproducoes,
+            "itens": [m.titulo for m in pl.itens if m is not None]}
+
+
+class ErroPedido(Exception):
+    """Pedido inválido: vira {"ok": false, "erro": ...} na resposta, a conexão continua."""
+
+
+class ServidorSessoes:
+    """
+    Modo servidor do StreamingApp: várias sessões de usuário ao mesmo tempo
+    sobre o mesmo catálogo na memória, num servidor TCP asyncio.
+    - Protocolo: uma linha JSON por pedido e uma por resposta.
+        pedido:   {"id": 1, "op": "reproduzir_musica", "titulo": "Shape of You"}
+        resposta: {"id": 1, "ok": true, "dados": ...} ou {"id": 1, "ok": false, "erro": "..."}
+      As operações são as do menu (entrar, criar_usuario, listar_usuarios e as
+      de Menu.opcoes_usuario, também pelo número da opção: ver ATALHOS).
+      Cada conexão tem o seu usuário logado. Pedidos inválidos, maiores que
+      'limite_pedido' ou que falham na operação recebem ok=false (as falhas
+      inesperadas também vão para o log de erros) e a conexão continua.
+    - Concorrência: todos os pedidos rodam no loop do servidor (uma thread),
+      um de cada vez entre dois 'await', e com a trava do app (a mesma do
+      observador de catálogo). Por isso 'reproducoes' e os demais contadores
+      são alterados sem disputa, por mais conexões que existam. O reprodutor
+      do app passa a usar o mesmo loop.
+    - O relatório (escrita em arquivo) roda numa thread auxiliar, para não
+      parar as outras sessões.
+    """
+
+    intervalo_trava = 0.001   # segundos entre tentativas de pegar a trava do app
+    limite_pedido = 1 << 16   # bytes por linha de pedido
+
+    def __init__(self, app, host: str = "127.0.0.1", porta: int = 8765):
+        self.app = app
+        self.host = host
+        self.porta = porta
+        self.conexoes = 0        # abertas agora
+        self.pedidos = 0
+        self.erros = 0
+        self._servidor = None
+
+    # Métodos de ciclo de vida
+    async def iniciar(self) -> "ServidorSessoes":
+        """Abre a porta (porta=0: escolhida pelo sistema, ver 'porta' depois)."""
+        self.app.reprodutor.usar_loop()
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta,
+                                                    limit=self.limite_pedido)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def servir(self) -> None:
+        """Atende até ser cancelado (Ctrl+C em main.py)."""
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def parar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self.app.reprodutor.parar()
+
+    # Conexões
+    async def _atender(self, leitor, escritor) -> None:
+        self.conexoes += 1
+        sessao = {"usuario": None}
+        try:
+            while True:
+                try:
+                    linha = await leitor.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:   # fim da conexão (última linha sem \n)
+                    linha = e.partial
+                    if not linha:
+                        break
+                except asyncio.LimitOverrunError:
+                    await self._descartar_linha(leitor)
+                    self.pedidos += 1
+                    self.erros += 1
+                    await self._enviar(escritor, self._erro({}, f"pedido maior que {self.limite_pedido} bytes"))
+                    continue
+                if not linha.strip():
+                    continue
+                await self._enviar(escritor, await self._responder(sessao, linha))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.conexoes -= 1
+            escritor.close()
+
+    @staticmethod
+    async def _descartar_linha(leitor) -> None:
+        # Consome o resto de uma linha acima do limite, em pedaços, até o \n
+        while True:
+            try:
+                await leitor.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as e:
+                await leitor.readexactly(e.consumed)
+
+    @staticmethod
+    async def _enviar(escritor, resposta: dict) -> None:
+        escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+        await escritor.drain()
+
+    @staticmethod
+    def _erro(pedido, mensagem: str) -> dict:
+        return {"id": pedido.get("id") if isinstance(pedido, dict) else None, "ok": False, "erro": mensagem}
+
+    async def _responder(self, sessao: dict, linha: bytes) -> dict:
+        self.pedidos += 1
+        pedido = {}
+        try:
+            pedido = json.loads(linha)
+            if not isinstance(pedido, dict):
+                raise ErroPedido("o pedido deve ser um objeto JSON")
+            op = ATALHOS.get(str(pedido.get("op")), pedido.get("op"))
+            funcao = getattr(self, f"_op_{op}", None) if isinstance(op, str) else None
+            if funcao is None:
+                raise ErroPedido(f"operação desconhecida: {pedido.get('op')!r}")
+            if op not in SEM_LOGIN and sessao["usuario"] is None:
+                raise ErroPedido("faça login primeiro (op 'entrar')")
+            if op == "gerar_relatorio":
+                dados = await asyncio.to_thread(self._com_trava_bloqueando, funcao, sessao, pedido)
+            else:
+                await self._pegar_trava()
+                try:
+                    dados = funcao(sessao, pedido)
+                finally:
+                    self.app.trava.release()
+            return {"id": pedido.get("id"), "ok": True, "dados": dados}
+        except (ErroPedido, ValueError, TypeError, KeyError) as e:
+            self.erros += 1
+            return self._erro(pedido, str(e))
+        except Exception as e:
+            # Falha inesperada da operação: responde e registra, sem derrubar a conexão
+            self.erros += 1
+            op = pedido.get("op") if isinstance(pedido, dict) else None
+            _log_erro(f"ServidorSessoes: operação {op!r} falhou: {type(e).__name__}: {e}")
+            return self._erro(pedido, f"erro interno ({type(e).__name__})")
+
+    async def _pegar_trava(self) -> None:
+        # A trava é de threading: tenta sem bloquear o loop (o observador a segura por poucos ms)
+        while not self.app.trava.acquire(blocking=False):
+            await asyncio.sleep(self.intervalo_trava)
+
+    def _com_trava_bloqueando(self, funcao, *args):
+        with self.app.trava:
+            return funcao(*args)
+
+    @staticmethod
+    def _texto(pedido: dict, campo: str) -> str:
+        valor = str(pedido.get(campo) or "").strip()
+        if not valor:
+            raise ErroPedido(f"campo '{campo}' obrigatório")
+        return valor
+
+    def _pagina(self, colecao: str, pedido: dict, converter) -> list:
+        tamanho = max(1, min(int(pedido.get("tamanho", 100)), 1000))
+        inicio = max(0, int(pedido.get("pagina", 0))) * tamanho
+        return [converter(x) for x in islice(self.app.iterar(colecao), inicio, inicio + tamanho)]
+
+    # Operações do menu inicial
+    def _op_ping(self, sessao, pedido):
+        return {"instante": time.time()}
+
+    def _op_listar_usuarios(self, sessao, pedido):
+        return self.app.nomes_usuarios()
+
+    def _op_criar_usuario(self, sessao, pedido):
+        nome = self._texto(pedido, "nome")
+        u = self.app.obter_usuario(nome.title())
+        if u is None:
+            u = self.app.criar_novo_usuario(nome)
+        return u.nome
+
+    def _op_entrar(self, sessao, pedido):
+        u = self.app.obter_usuario(self._texto(pedido, "nome").title())
+        if u is None:
+            raise ErroPedido("usuário não encontrado")
+        sessao["usuario"] = u
+        return u.nome
+
+    # Operações de Menu.opcoes_usuario
+    def _op_reproduzir_musica(self, sessao, pedido):
+        titulo = self._texto(pedido, "titulo")
+        midia = self.app.catalogo.buscar(titulo)
+        if midia is None:
+            return {"encontrada": False,
+                    "sugestoes": [m.titulo for m in self.app.busca.buscar(titulo, k=5)]}
+        midia.reproduzir(sessao["usuario"], exibir=False)
+        return {"encontrada": True, "midia": _midia(midia)}
+
+    def _op_listar_musicas(self, sessao, pedido):
+        return self._pagina("musicas", pedido, _midia)
+
+    def _op_listar_podcasts(self, sessao, pedido):
+        return self._pagina("podcasts", pedido, _midia)
+
+    def _op_listar_playlists(self, sessao, pedido):
+        return self._pagina("playlists", pedido, _playlist)
+
+    def _op_reproduzir_playlist(self, sessao, pedido):
+        pl = self.app.buscar_playlist(self._texto(pedido, "nome"))
+        if pl is None:
+            raise ErroPedido("playlist não encontrada")
+        self.app.reprodutor.enfileirar(sessao["usuario"], pl)
+        return self._estado(sessao)
+
+    def _op_criar_playlist(self, sessao, pedido):
+        pl = Playlist(self._texto(pedido, "nome"), sessao["usuario"].nome)
+        self.app.adicionar_playlist(pl)
+        ausentes = [t for t in pedido.get("midias", ()) if not pl.adicionar_midia(str(t))]
+        return {"playlist": _playlist(pl), "nao_encontradas": ausentes}
+
+    def _op_concatenar_playlists(self, sessao, pedido):
+        destino = self.app.buscar_playlist(self._texto(pedido, "destino"))
+        juntar = self.app.buscar_playlist(self._texto(pedido, "juntar"))
+        if destino is None or juntar is None:
+            raise ErroPedido("playlist de destino ou origem não encontrada")
+        nova = destino + juntar
+        self.app.substituir_playlist(destino, nova)
+        return _playlist(nova)
+
+    def _op_gerar_relatorio(self, sessao, pedido):
+        return str(self.app.gerar_relatorio())
+
+    def _op_sair(self, sessao, pedido):
+        nome = sessao["usuario"].nome
+        sessao["usuario"] = None
+        return nome
+
+    def _op_controlar_reproducao(self, sessao, pedido):
+        """acao: estado (padrão), pausar, continuar, pular, posicionar (com 'segundos') ou parar."""
+        reprodutor, usuario = self.app.reprodutor, sessao["usuario"]
+        acao = str(pedido.get("acao") or "estado")
+        if acao == "pausar":
+            reprodutor.pausar(usuario)
+        elif acao == "continuar":
+            reprodutor.continuar(usuario)
+        elif acao == "pular":
+            reprodutor.pular(usuario)
+        elif acao == "posicionar":
+            reprodutor.posicionar(usuario, float(pedido.get("segundos", 0)))
+        elif acao == "parar":
+            reprodutor.interromper(usuario)
+        elif acao != "estado":
+            raise ErroPedido(f"ação desconhecida: {acao!r}")
+        return self._estado(sessao)
+
+    def _estado(self, sessao) -> dict:
+        estado = self.app.reprodutor.estado(sessao["usuario"])
+        if estado["midia"] is not None:
+            estado["midia"] = estado["midia"].titulo
+            estado["playlist"] = estado["playlist"].nome
+        return estado
+
+    # Métodos especiais
+    def __str__(self):
+        return (f"Servidor de sessões {self.host}:{self.porta} | {self.conexoes} conexões | "
+                f"{self.pedidos} pedidos ({self.erros} com erro)")
+
+    def __repr__(self):
+        return f"ServidorSessoes(host={self.host!r}, porta={self.porta})"
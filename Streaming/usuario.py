@@ -1,5 +1,8 @@
 from datetime import datetime
 
+from .eventos import BarramentoEventos, REPRODUCAO_REGISTRADA
+from .historico import HistoricoCompacto
+
 class Usuario:
     
     # Atributo de classe para contar instâncias
@@ -9,16 +12,34 @@ class Usuario:
     def __init__(self, nome='Usuario não informado'):
         self.nome = nome.strip().title()  # Formata o nome
         self.playlists = []
-        self.historico = []
+        self.historico = []               # vira um HistoricoCompacto (ver a propriedade abaixo)
         Usuario.qtde_instancias += 1
         #self.id = id(self)  # ID único baseado no endereço de memória do objeto
         self.data_criacao = datetime.now()
     
+    # Histórico compacto (buffer circular de números de título e instantes);
+    # aceita atribuição de uma lista de títulos ou de pares (titulo, instante)
+    @property
+    def historico(self) -> HistoricoCompacto:
+        return self._historico
+
+    @historico.setter
+    def historico(self, itens) -> None:
+        if isinstance(itens, HistoricoCompacto):
+            self._historico = itens
+        else:
+            self._historico = HistoricoCompacto(itens or (), nome=self.nome)
+
+    # Contador O(1) de reproduções (inclui as que já saíram do histórico)
+    @property
+    def total_reproducoes(self) -> int:
+        return self._historico.total
+
     # Métodos obrigatorios __str__ e __repr__
     def __str__(self):
         return (f"Usuário: {self.nome} | "
                 f"Listas de reprodução: {len(self.playlists)} | "
-                f"Musicas no histórico: {len(self.historico)} | "
+                f"Musicas no histórico: {self.total_reproducoes} | "
                # f"ID: {self.id}, | "
                 f"Criado em: {self.data_criacao.strftime('%Y-%m-%d %H:%M:%S')}")
     
@@ -55,6 +76,7 @@ class Usuario:
     def registrar_reproducao(self, musica: str):
         """Adiciona uma música escutada ao histórico de reproduções."""
         self.historico.append(musica)
+        BarramentoEventos.ativo.publicar(REPRODUCAO_REGISTRADA, self, musica)
     
 
 
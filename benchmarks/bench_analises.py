@@ -0,0 +1,60 @@
+# benchmarks/bench_analises.py
+# Compara os agregados de Analises sobre a lista de músicas, o CatalogoColunar
+# e o placar incremental (RankingReproducoes).
+# Uso: python benchmarks/bench_analises.py [quantidade_de_musicas]   (padrão: 1.000.000)
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.analises import Analises
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.colunar import np
+from log_temporario import log_temporario
+
+
+def cronometrar(nome: str, funcao, *args) -> None:
+    t0 = time.perf_counter()
+    funcao(*args)
+    print(f"  {nome:<28} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(3)
+    catalogo = CatalogoMidia()
+    colunas = catalogo.ativar_colunas(Musica)
+    ranking = catalogo.ativar_ranking(Musica)
+    musicas = [Musica(f"Faixa {i}", rnd.randint(60, 600), f"Artista {i % 5000}", "Pop",
+                      reproducoes=rnd.randint(0, 1_000_000), catalogo=catalogo)
+               for i in range(n)]
+    for m in rnd.sample(musicas, n // 10):
+        m.avaliar(rnd.randint(0, 5))
+    print(f"{n} músicas | {colunas}")
+
+    for nome, fonte in (("lista de objetos", musicas), ("colunar", colunas)):
+        print(f"{nome}:")
+        cronometrar("top_musicas_reproduzidas", Analises.top_musicas_reproduzidas, fonte, 10)
+        cronometrar("media_avaliacoes", Analises.media_avaliacoes, fonte)
+    print("placar incremental:")
+    cronometrar("top_musicas_reproduzidas", Analises.top_musicas_reproduzidas, ranking, 10)
+    tocadas = [rnd.choice(musicas) for _ in range(100_000)]
+    t0 = time.perf_counter()
+    for m in tocadas:
+        m.reproducoes += 1
+    print(f"  {'custo por reprodução':<28} {(time.perf_counter() - t0) / len(tocadas) * 1e6:9.2f} µs"
+          " (catálogo + colunas + placar)")
+    print("colunar (agregados puros):")
+    cronometrar("total de reproduções", colunas.total_reproducoes)
+    cronometrar("médias (sem montar o dict)", colunas.medias_avaliacoes)
+    if np is None:
+        print("(NumPy não instalado: colunas agregadas com funções nativas sobre array)")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_busca.py
+# Mede a latência da busca por prefixo/substring (IndiceBusca) em um catálogo sintético.
+# Uso: python benchmarks/bench_busca.py [quantidade_de_midias]   (padrão: 1.000.000)
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import ArquivoDeMidia, Musica
+from Streaming.busca import IndiceBusca
+from log_temporario import log_temporario
+
+SILABAS = [c + v for c in "bcdfghjlmnprstvxz" for v in "aeiou"] + ["lha", "nha", "cha", "que", "gui", "tra", "bri"]
+GENEROS = ["Rock", "Pop", "Rap", "Jazz", "Samba", "Forro", "Mpb", "Blues", "Funk", "Metal"]
+
+
+def palavra(rnd: random.Random) -> str:
+    return "".join(rnd.choice(SILABAS) for _ in range(rnd.randint(2, 4)))
+
+
+def gerar_catalogo(n: int, rnd: random.Random) -> list:
+    artistas = [f"{palavra(rnd).title()} {palavra(rnd).title()}" for _ in range(max(1, n // 20))]
+    musicas = []
+    for i in range(n):
+        titulo = " ".join(palavra(rnd).title() for _ in range(rnd.randint(1, 3)))
+        musicas.append(Musica(titulo, 180, rnd.choice(artistas), rnd.choice(GENEROS),
+                              reproducoes=rnd.randint(0, 100_000)))
+    return musicas
+
+
+def medir(indice: IndiceBusca, consultas: list, prefixo: bool) -> list:
+    tempos = []
+    for q in consultas:
+        t0 = time.perf_counter()
+        indice.buscar(q, k=10, prefixo=prefixo)
+        tempos.append((time.perf_counter() - t0) * 1000)
+    tempos.sort()
+    return tempos
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(42)
+
+    t0 = time.perf_counter()
+    musicas = gerar_catalogo(n, rnd)
+    print(f"Catálogo sintético: {n} músicas em {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    indice = ArquivoDeMidia.catalogo.ativar_busca()
+    print(f"Indexação: {time.perf_counter() - t0:.1f}s ({indice})")
+
+    # Consultas: trechos de títulos/artistas existentes, como digitados pelo usuário
+    consultas_prefixo, consultas_substring = [], []
+    for m in rnd.sample(musicas, 1000):
+        texto = rnd.choice([m.titulo, m.artista]).lower()
+        consultas_prefixo.append(texto[:rnd.randint(4, 8)])
+        inicio = rnd.randint(0, max(0, len(texto) - 6))
+        consultas_substring.append(texto[inicio:inicio + rnd.randint(5, 8)])
+
+    for nome, consultas, prefixo in (("prefixo", consultas_prefixo, True),
+                                     ("substring", consultas_substring, False)):
+        tempos = medir(indice, consultas, prefixo)
+        p50 = tempos[len(tempos) // 2]
+        p99 = tempos[int(len(tempos) * 0.99) - 1]
+        print(f"{nome:>9}: p50 {p50:.3f} ms | p99 {p99:.3f} ms | média {sum(tempos) / len(tempos):.3f} ms")
+
+    # Atualização incremental: novas mídias e reproduções entram na camada delta
+    t0 = time.perf_counter()
+    novas = gerar_catalogo(1000, rnd)
+    print(f"Cadastro com indexação incremental: {(time.perf_counter() - t0) / len(novas) * 1e6:.1f} µs por mídia")
+    for m in rnd.sample(musicas, 5000):
+        m.reproducoes += 1
+    tempos = medir(indice, consultas_substring, False)
+    print(f"substring após 5000 reproduções: p50 {tempos[len(tempos) // 2]:.3f} ms | "
+          f"p99 {tempos[int(len(tempos) * 0.99) - 1]:.3f} ms ({indice})")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_concatenacao.py
+# Concatenação repetida de playlists (como a opção 7 do menu feita várias
+# vezes): 'lista = lista + outra' em sequência, e depois uma reprodução
+# (percorrer a playlist final) e acessos por índice.
+# Compara o __add__ de antes (estende a lista de playlist1 e copia tudo para
+# a terceira playlist: O(n) por concatenação, quadrático na sequência) com a
+# corda de ItensPlaylist (O(1) por concatenação; os itens são materializados
+# uma vez, na primeira vez que a playlist é percorrida).
+# Uso: python benchmarks/bench_concatenacao.py [concatenacoes] [itens_por_playlist]   (padrão: 2.000 e 100)
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from log_temporario import log_temporario
+
+
+def somar_lista(itens: list, outros: list) -> list:
+    # O que Playlist.__add__ fazia com os itens: extend em playlist1 + cópia para a terceira
+    itens.extend(outros)
+    return list(itens)
+
+
+def main():
+    concatenacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    por_playlist = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    catalogo = CatalogoMidia()
+    musicas = [Musica(f"Faixa {i}", 200, "Artista", "Pop", catalogo=catalogo) for i in range(por_playlist * 2)]
+    total = por_playlist * (concatenacoes + 1)
+
+    t0 = time.perf_counter()
+    lista, outra = musicas[:por_playlist], musicas[por_playlist:]
+    for _ in range(concatenacoes):
+        lista = somar_lista(lista, outra)
+    t_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in lista:
+        pass
+    t_lista_percorrer = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pl, outra_pl = Playlist("Lista", "bench", musicas[:por_playlist]), Playlist("Outra", "bench", musicas[por_playlist:])
+    for _ in range(concatenacoes):
+        pl = pl + outra_pl
+    t_corda = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in pl.itens:
+        pass
+    t_corda_percorrer = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for i in range(0, total, max(1, total // 1000)):
+        pl[i]
+    t_indice = (time.perf_counter() - t0) / len(range(0, total, max(1, total // 1000)))
+
+    assert len(pl) == len(lista) == total and list(pl.itens) == lista
+    print(f"{concatenacoes} concatenações de {por_playlist} mídias (playlist final: {total} mídias)")
+    print(f"  {'':<22} {'concatenar (s)':>15} {'1ª passada (s)':>15} {'total (s)':>10}")
+    print(f"  {'lista (antes)':<22} {t_lista:15.4f} {t_lista_percorrer:15.4f} {t_lista + t_lista_percorrer:10.4f}")
+    print(f"  {'corda (ItensPlaylist)':<22} {t_corda:15.4f} {t_corda_percorrer:15.4f} {t_corda + t_corda_percorrer:10.4f}")
+    print(f"  por concatenação: {t_lista / concatenacoes * 1e6:,.1f} µs -> {t_corda / concatenacoes * 1e6:,.1f} µs | "
+          f"playlist[i] depois de materializada: {t_indice * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_contadores.py
+# Reproduções simultâneas vindas de um pool de threads: compara o contador sem
+# sincronização ('reproducoes += 1', como era) com o das mídias (travas
+# particionadas: ArquivoDeMidia.reproduzir, com evento e índices do catálogo)
+# e o das playlists (contador fragmentado por thread, Playlist.contar_reproducao).
+# Para cada quantidade de threads mostra a vazão e os incrementos perdidos.
+# O intervalo de troca de threads é reduzido para as disputas aparecerem.
+# Obs.: com o GIL (CPython comum) a vazão não cresce com as threads; num
+# Python sem GIL (3.13t) as travas por faixa e os fragmentos deixam crescer.
+# Uso: python benchmarks/bench_contadores.py [reproducoes_por_thread]   (padrão: 100.000)
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from log_temporario import log_temporario
+
+
+def tocar_sem_trava(midia) -> None:
+    # O que ArquivoDeMidia.reproduzir fazia (sem o evento e o print)
+    midia.reproducoes += 1
+
+
+def medir(threads: int, por_thread: int, criar, tocar, ler) -> tuple:
+    alvos = criar()
+    esperado = threads * por_thread
+
+    def trabalho(indice: int) -> None:
+        for i in range(por_thread):
+            tocar(alvos[(indice + i) % len(alvos)])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(trabalho, range(threads)))
+    total = time.perf_counter() - t0
+    return esperado / total, esperado - sum(ler(a) for a in alvos)
+
+
+def musicas(catalogo) -> list:
+    return [Musica(f"Faixa {i}", 200, "Artista", "Pop", catalogo=catalogo) for i in range(4)]
+
+
+def main():
+    por_thread = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sys.setswitchinterval(1e-5)
+    catalogo = CatalogoMidia()
+    catalogo.ativar_busca()
+    catalogo.ativar_ranking()
+    # Poucos alvos: todas as threads disputam os mesmos contadores
+    casos = (
+        ("mídias, sem trava (+= 1)", lambda: musicas(CatalogoMidia()), tocar_sem_trava, lambda m: m.reproducoes),
+        ("mídias (travas particionadas)", lambda: musicas(catalogo),
+         lambda m: m.reproduzir(exibir=False), lambda m: m.reproducoes),
+        ("playlists (contador fragmentado)", lambda: [Playlist(f"Lista {i}", "bench") for i in range(4)],
+         Playlist.contar_reproducao, lambda p: p.reproducoes),
+    )
+    print(f"{por_thread} reproduções por thread, 4 alvos disputados")
+    print(f"  {'contador':<34} {'threads':>7} {'reproduções/s':>14} {'perdidas':>9}")
+    for nome, criar, tocar, ler in casos:
+        for threads in (1, 2, 4, 8):
+            vazao, perdidas = medir(threads, por_thread, criar, tocar, ler)
+            print(f"  {nome:<34} {threads:>7} {vazao:>14,.0f} {perdidas:>9}")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
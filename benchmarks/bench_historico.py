@@ -0,0 +1,76 @@
+# benchmarks/bench_historico.py
+# Compara o histórico como lista de strings (antes) com o HistoricoCompacto:
+# memória, custo do registro e consultas por página e por intervalo de tempo.
+# Uso: python benchmarks/bench_historico.py [reproducoes]   (padrão: 1.000.000)
+
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.historico import HistoricoCompacto
+from log_temporario import log_temporario
+
+
+def medir(nome: str, criar) -> object:
+    # Tempo e memória em execuções separadas (o tracemalloc deixa o registro bem mais lento)
+    t0 = time.perf_counter()
+    criar()
+    total = time.perf_counter() - t0
+    tracemalloc.start()
+    obj = criar()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {nome:<40} {memoria / 2**20:8.1f} MiB {total:7.2f} s")
+    return obj
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rnd = random.Random(11)
+    titulos = [f"Faixa {i}".title() for i in range(20_000)]
+    sorteio = [rnd.choice(titulos) for _ in range(n)]
+    inicio = time.time() - n
+
+    print(f"{n} reproduções (memória do histórico, tempo de registro):")
+
+    def lista():
+        h = []
+        for t in sorteio:
+            h.append(t.strip().title())   # o que Usuario.ouvir_musica guardava: uma cópia por reprodução
+        return h
+    medir("lista de strings", lista)
+
+    def compacto(capacidade):
+        def criar():
+            h = HistoricoCompacto(capacidade=capacidade)
+            for i, t in enumerate(sorteio):
+                h.append(t, inicio + i)
+            return h
+        return criar
+    medir("HistoricoCompacto (sem limite)", compacto(n))
+    medir("HistoricoCompacto (capacidade 10.000)", compacto(10_000))
+    with tempfile.TemporaryDirectory() as pasta:
+        HistoricoCompacto.pasta_excedente = pasta
+        h = medir("HistoricoCompacto (10.000 + disco)", compacto(10_000))
+        HistoricoCompacto.pasta_excedente = None
+
+        print("consultas (histórico com excedente em disco):")
+        for nome, consulta in (("página mais recente (50)", lambda: h.pagina(0, 50)),
+                               ("página antiga (50, no disco)", lambda: h.pagina(len(h) // 100, 50)),
+                               ("intervalo de 1 h (busca binária)", lambda: h.entre(inicio + n / 2, inicio + n / 2 + 3600)),
+                               ("total de reproduções", lambda: h.total)):
+            t0 = time.perf_counter()
+            for _ in range(200):
+                consulta()
+            print(f"  {nome:<40} {(time.perf_counter() - t0) / 200 * 1e6:9.1f} µs")
+        del h
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_importacao.py
+# Mede a importação de um .md sintético pelo LerMarkdown (sem snapshot) e o custo,
+# por chamada, das operações de criação/vínculo de objetos usadas na resolução.
+# Uso: python benchmarks/bench_importacao.py [quantidade_de_musicas]   (padrão: 200.000)
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config.lermarkdown as lermarkdown
+from config.lermarkdown import LerMarkdown
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from Streaming.usuario import Usuario
+from log_temporario import log_temporario
+
+
+# Classes com outro formato (construtor só com nomes): o leitor precisa
+# escolher outra assinatura/estratégia para elas
+class PlaylistNomeada(Playlist):
+    def __init__(self, *, nome, usuario, itens=None):
+        super().__init__(nome, usuario, itens)
+
+
+class UsuarioNomeado(Usuario):
+    def __init__(self, *, nome):
+        super().__init__(nome)
+
+
+def gerar_md(destino: Path, n: int, rnd: random.Random) -> None:
+    usuarios = [f"Usuario {i}" for i in range(max(1, n // 1000))]
+    with destino.open("w", encoding="utf-8") as f:
+        f.write("# Usuários\n")
+        for nome in usuarios:
+            f.write(f"- nome: {nome}\n\n")
+        f.write("# Músicas\n")
+        for i in range(n):
+            f.write(f"- titulo: Faixa {i}\n    artista: Artista {i % 5000}\n"
+                    f"    genero: Pop\n    duracao: {rnd.randint(60, 600)}\n\n")
+        f.write("# Podcasts\n")
+        for i in range(max(1, n // 100)):
+            f.write(f"- titulo: Episodio {i}\n    temporada: T{i % 10}\n    episodio: {i + 1}\n"
+                    f"    host: Host {i % 50}\n    duracao: 1800\n\n")
+        f.write("# Playlists\n")
+        for i in range(max(1, n // 20)):
+            itens = ", ".join(f"Faixa {rnd.randrange(n)}" for _ in range(20))
+            f.write(f"- nome: Lista {i}\n    usuario: {rnd.choice(usuarios)}\n    itens: [{itens}]\n\n")
+
+
+def cronometrar(nome: str, funcao, repeticoes: int) -> None:
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    print(f"  {nome:<34} {(time.perf_counter() - t0) / repeticoes * 1e6:9.2f} µs")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rnd = random.Random(5)
+    with tempfile.TemporaryDirectory() as pasta:
+        md = Path(pasta) / "catalogo.md"
+        gerar_md(md, n, rnd)
+        leitor = LerMarkdown(catalogo=CatalogoMidia())
+        t0 = time.perf_counter()
+        result = leitor.from_file(str(md), cache=False)
+        total = time.perf_counter() - t0
+    print(f"{md.name}: {len(result['usuarios'])} usuários, {len(result['musicas'])} músicas, "
+          f"{len(result['podcasts'])} podcasts, {len(result['playlists'])} playlists")
+    print(f"  {'importação completa (from_file)':<34} {total * 1000:9.1f} ms")
+
+    print("por chamada:")
+    usuario = result["usuarios"][0]
+    playlist = result["playlists"][0]
+    solo = leitor._make_usuario("Solo")
+    leitor._attach_playlist_to_user(solo, playlist)
+    itens = list(playlist.itens)
+    titulos = [m.titulo for m in itens]
+    cronometrar("_make_usuario", lambda: leitor._make_usuario("Fulano"), 20_000)
+    cronometrar("_make_playlist", lambda: leitor._make_playlist("Lista", "Fulano", titulos), 20_000)
+    cronometrar("_get_playlist_owner_name", lambda: leitor._get_playlist_owner_name(playlist), 100_000)
+    cronometrar("_get_playlist_titles", lambda: leitor._get_playlist_titles(playlist), 100_000)
+    cronometrar("_set_playlist_items", lambda: leitor._set_playlist_items(playlist, itens), 100_000)
+    cronometrar("_attach_playlist_to_user (1 lista)", lambda: leitor._attach_playlist_to_user(solo, playlist), 100_000)
+    cronometrar(f"_attach_playlist_to_user ({len(usuario.playlists)} listas)",
+                lambda: leitor._attach_playlist_to_user(usuario, playlist), 100_000)
+
+    print("classes com construtor só por nome:")
+    lermarkdown.Playlist, lermarkdown.Usuario = PlaylistNomeada, UsuarioNomeado
+    try:
+        leitor = LerMarkdown(catalogo=CatalogoMidia())
+        cronometrar("_make_usuario", lambda: leitor._make_usuario("Fulano"), 20_000)
+        cronometrar("_make_playlist", lambda: leitor._make_playlist("Lista", "Fulano", titulos), 20_000)
+    finally:
+        lermarkdown.Playlist, lermarkdown.Usuario = Playlist, Usuario
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_log.py
+# Registrar muitas mensagens de erro/aviso (como uma importação grande cheia
+# de avisos, ou Musica.avaliar recebendo notas inválidas em sequência).
+# Compara o _log_erro que ficou comentado em playlist.py (relê e reescreve o
+# arquivo inteiro a cada mensagem), abrir e anexar a cada mensagem, e o
+# RegistroErros (fila + thread de gravação em lote): tempo de quem registra e
+# tempo até tudo estar no arquivo. O último caso repete a mesma mensagem
+# (limite por mensagem).
+# Uso: python benchmarks/bench_log.py [mensagens]   (padrão: 20.000)
+
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.registro_erros import RegistroErros
+from log_temporario import log_temporario
+
+
+def reescrever(caminho: Path, msg: str) -> None:
+    # O _log_erro comentado em playlist.py
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    antigo = caminho.read_text(encoding="utf-8") if caminho.exists() else ""
+    caminho.write_text(antigo + f"[{ts}] {msg}\n", encoding="utf-8")
+
+
+def anexar(caminho: Path, msg: str) -> None:
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with caminho.open("a", encoding="utf-8") as f:
+        f.write(f"[{ts}] {msg}\n")
+
+
+def medir(registrar, mensagens: list, terminar=lambda: None) -> tuple:
+    t0 = time.perf_counter()
+    for msg in mensagens:
+        registrar(msg)
+    chamador = time.perf_counter() - t0
+    terminar()
+    return chamador, time.perf_counter() - t0
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    mensagens = [f"Playlist 'Lista {i % 500}' contém item inexistente 'Faixa {i}'; removido." for i in range(n)]
+    # Reescrever o arquivo todo é quadrático: mede poucas mensagens e informa por mensagem
+    n_reescrita = min(n, 2000)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        print(f"{n} mensagens ({n_reescrita} no caso 'reescrever')")
+        print(f"  {'forma':<34} {'chamador (s)':>13} {'gravado (s)':>12} {'µs/mensagem':>12}")
+
+        def linha(nome, quantidade, chamador, total):
+            print(f"  {nome:<34} {chamador:13.4f} {total:12.4f} {chamador / quantidade * 1e6:12.2f}")
+
+        linha("reescrever o arquivo (antes)", n_reescrita,
+              *medir(lambda m: reescrever(pasta / "reescrito.log", m), mensagens[:n_reescrita]))
+        linha("abrir e anexar por mensagem", n, *medir(lambda m: anexar(pasta / "anexado.log", m), mensagens))
+
+        registro = RegistroErros(pasta / "erros.log", tamanho_max=1 << 30)
+        linha("RegistroErros.registrar", n, *medir(registro.registrar, mensagens, registro.descarregar))
+        registro.fechar()
+        print(f"    {registro}")
+
+        registro = RegistroErros(pasta / "erros.log", tamanho_max=1 << 30)
+        # Uma chamada com todas (como LerMarkdown faz com os avisos de um arquivo)
+        linha("RegistroErros.registrar_varias", n, *medir(registro.registrar_varias, [mensagens], registro.descarregar))
+        registro.fechar()
+
+        registro = RegistroErros(pasta / "repetidas.log")
+        repetida = "Musica.avaliar: nota fora do intervalo 0 a 5 (9) para 'Faixa 1'."
+        linha("RegistroErros, mensagem repetida", n, *medir(registro.registrar, [repetida] * n, registro.descarregar))
+        registro.fechar()
+        print(f"    {registro}")
+
+        registro = RegistroErros(pasta / "rotacao.log", tamanho_max=256 << 10, copias=3)
+        medir(registro.registrar, mensagens, registro.fechar)
+        tamanhos = ", ".join(f"{p.name} {p.stat().st_size // 1024} KB" for p in sorted(pasta.glob("rotacao.log*")))
+        print(f"  rotação (256 KB, 3 cópias): {tamanhos}")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_memoria.py
+# Mede a memória por item ao carregar um catálogo sintético de músicas.
+# Uso: python benchmarks/bench_memoria.py [quantidade_de_musicas]   (padrão: 1.000.000)
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from log_temporario import log_temporario
+
+GENEROS = ["Rock", "Pop", "Rap", "Jazz", "Samba", "Forro", "Mpb", "Blues", "Funk", "Metal"]
+
+
+# Modelo equivalente sem __slots__ nem strings internadas, só para comparação
+class MusicaDict:
+    def __init__(self, titulo, duracao, artista, genero, avaliacoes):
+        self.titulo = titulo
+        self.duracao = duracao
+        self.artista = artista
+        self.reproducoes = 0
+        self.genero = genero.strip().title()
+        self.avaliacoes = list(avaliacoes)
+
+
+def gerar_dados(n: int, rnd: random.Random):
+    """Gera tuplas (titulo, duracao, artista, genero, notas); artistas são textos novos a cada faixa,
+    como sairiam do parser de um arquivo."""
+    for i in range(n):
+        artista = "Artista %d" % rnd.randrange(max(1, n // 20))
+        notas = [rnd.randint(0, 5) for _ in range(rnd.randint(0, 3))]
+        yield (f"Faixa {i}", rnd.randint(60, 600), artista, rnd.choice(GENEROS), notas)
+
+
+def medir(n: int, construir, catalogo=None) -> tuple:
+    """Retorna (objetos, bytes usados, bytes do catálogo, segundos)."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    objetos = [construir(*dados) for dados in gerar_dados(n, random.Random(7))]
+    segundos = time.perf_counter() - t0
+    usado, _ = tracemalloc.get_traced_memory()
+    do_catalogo = 0
+    if catalogo is not None:
+        # Parte do catálogo: memória liberada ao esvaziá-lo (as músicas continuam vivas)
+        catalogo.limpar()
+        gc.collect()
+        do_catalogo = usado - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objetos, usado, do_catalogo, segundos
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    catalogo = CatalogoMidia()
+
+    musicas, usado, do_catalogo, segundos = medir(
+        n, lambda t, d, a, g, notas: Musica(t, d, a, g, avaliacoes=notas, catalogo=catalogo), catalogo)
+    print(f"Musica (__slots__, strings internadas): {(usado - do_catalogo) / n:.0f} bytes/item "
+          f"+ {do_catalogo / n:.0f} bytes/item do catálogo | {segundos:.1f}s para {n} itens")
+    print(f"  objeto Musica: {sys.getsizeof(musicas[0])} bytes (sem os textos e notas referenciados)")
+    del musicas
+
+    dicts, usado, _, _ = medir(n, MusicaDict)
+    print(f"Modelo com __dict__ e listas:           {usado / n:.0f} bytes/item")
+    print(f"  objeto + __dict__: {sys.getsizeof(dicts[0]) + sys.getsizeof(dicts[0].__dict__)} bytes")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
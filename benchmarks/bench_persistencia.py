@@ -0,0 +1,89 @@
+# benchmarks/bench_persistencia.py
+# Mede a PersistenciaSQLite: gravação inicial do catálogo, reproduções em lote
+# (uma transação por lote) contra uma transação por reprodução, abertura do banco
+# e buscas sob demanda pelos índices.
+# Uso: python benchmarks/bench_persistencia.py [quantidade_de_musicas]   (padrão: 100.000)
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.eventos import BarramentoEventos
+from Streaming.persistencia import PersistenciaSQLite
+from Streaming.playlist import Playlist
+from Streaming.usuario import Usuario
+from log_temporario import log_temporario
+
+
+def abrir(caminho: Path, lote: int = 500):
+    barramento, catalogo = BarramentoEventos(), CatalogoMidia()
+    BarramentoEventos.usar(barramento)
+    return PersistenciaSQLite(caminho, barramento, catalogo, lote=lote), catalogo
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rnd = random.Random(3)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "streaming.db"
+        banco, catalogo = abrir(caminho)
+        musicas = [Musica(f"Faixa {i}", rnd.randint(60, 600), f"Artista {i % 5000}", "Pop", catalogo=catalogo)
+                   for i in range(n)]
+        usuarios = [Usuario(f"Usuario {i}") for i in range(max(1, n // 1000))]
+        playlists = [Playlist(f"Lista {i}", rnd.choice(usuarios).nome, rnd.sample(musicas, 20))
+                     for i in range(max(1, n // 100))]
+        t0 = time.perf_counter()
+        banco.salvar_colecoes(usuarios, musicas, playlists)
+        banco.gravar()
+        print(f"{n} músicas, {len(usuarios)} usuários, {len(playlists)} playlists")
+        print(f"  {'gravação inicial':<34} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+        reproducoes = 20_000
+        tocadas = [rnd.choice(musicas) for _ in range(reproducoes)]
+        t0 = time.perf_counter()
+        # O que ArquivoDeMidia.reproduzir faz, sem o print (o evento chega em _contadores_alterados)
+        for m in tocadas:
+            m.reproducoes += 1
+            banco._contadores_alterados(m)
+        banco.gravar()
+        em_lote = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for m in tocadas[:2000]:
+            m.reproducoes += 1
+            banco._contadores_alterados(m)
+            banco.gravar()
+        uma_a_uma = (time.perf_counter() - t0) / 2000 * reproducoes
+        print(f"  {f'{reproducoes} reproduções em lotes':<34} {em_lote * 1000:9.1f} ms")
+        print(f"  {f'{reproducoes} reproduções, 1 commit cada':<34} {uma_a_uma * 1000:9.1f} ms (estimado)")
+        banco.fechar()
+        del musicas, playlists, tocadas
+
+        t0 = time.perf_counter()
+        banco, catalogo = abrir(caminho)
+        print(f"  {'abertura (carga sob demanda)':<34} {(time.perf_counter() - t0) * 1000:9.1f} ms"
+              f" | mídias na memória: {len(catalogo)}")
+        titulos = [f"faixa {rnd.randrange(n)}" for _ in range(2000)]
+        t0 = time.perf_counter()
+        for t in titulos:
+            catalogo.buscar(t)
+        print(f"  {'busca por título (1ª vez, banco)':<34} {(time.perf_counter() - t0) / len(titulos) * 1e6:9.1f} µs")
+        t0 = time.perf_counter()
+        for t in titulos:
+            catalogo.buscar(t)
+        print(f"  {'busca por título (já carregada)':<34} {(time.perf_counter() - t0) / len(titulos) * 1e6:9.1f} µs")
+        t0 = time.perf_counter()
+        for i in range(500):
+            banco.buscar_playlist(f"Lista {rnd.randrange(max(1, n // 100))}")
+        print(f"  {'playlist por nome (com itens)':<34} {(time.perf_counter() - t0) / 500 * 1e6:9.1f} µs")
+        banco.fechar()
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
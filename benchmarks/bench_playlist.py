@@ -0,0 +1,81 @@
+# benchmarks/bench_playlist.py
+# Operações em playlists grandes: pertinência por título, remoção por título
+# (no meio da lista), acesso por índice e comparação de playlists (mesmas mídias em outra ordem).
+# Compara a lista simples de antes (percorrer a lista / ordenar os títulos a
+# cada comparação) com o ItensPlaylist (índice título -> posições e assinatura
+# mantida a cada alteração).
+# Uso: python benchmarks/bench_playlist.py [itens]   (padrão: 20.000)
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import ItensPlaylist
+from log_temporario import log_temporario
+
+
+# O que Playlist fazia com a lista simples
+def contem_lista(itens: list, titulo: str) -> bool:
+    return any(m.titulo.strip() == titulo for m in itens)
+
+
+def remover_lista(itens: list, titulo: str) -> bool:
+    for i, m in enumerate(itens):
+        if m.titulo.strip() == titulo:
+            del itens[i]
+            return True
+    return False
+
+
+def iguais_lista(a: list, b: list) -> bool:
+    return len(a) == len(b) and sorted(m.titulo.strip().lower() for m in a) == \
+        sorted(m.titulo.strip().lower() for m in b)
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(repeticoes):
+        funcao(i)
+    return (time.perf_counter() - t0) / repeticoes
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rnd = random.Random(3)
+    catalogo = CatalogoMidia()
+    musicas = [Musica(f"Faixa {i}", 200, f"Artista {i % 300}", "Pop", catalogo=catalogo) for i in range(n)]
+    embaralhadas = musicas[:]
+    rnd.shuffle(embaralhadas)
+    consultas = [f"Faixa {rnd.randrange(n)}" for _ in range(200)]
+    remocoes = [f"Faixa {i}" for i in rnd.sample(range(n), 200)]
+
+    lista, outra_lista = list(musicas), list(embaralhadas)
+    itens, outros_itens = ItensPlaylist(musicas), ItensPlaylist(embaralhadas)
+    casos = (
+        ("'titulo' in playlist",
+         lambda i: contem_lista(lista, consultas[i]), lambda i: itens.contem_titulo(consultas[i]), 200),
+        ("playlist1 == playlist2",
+         lambda i: iguais_lista(lista, outra_lista), lambda i: itens.mesmos_titulos(outros_itens), 20),
+        ("remover_midia(titulo)",
+         lambda i: remover_lista(lista, remocoes[i]), lambda i: itens.remover_titulo(remocoes[i]), 200),
+        # Depois das remoções: o acesso por índice pula as posições ainda marcadas
+        ("playlist[i]",
+         lambda i: lista[i], lambda i: itens[i], 200),
+    )
+    print(f"Playlist com {n} mídias")
+    print(f"  {'operação':<28} {'lista (µs)':>12} {'índice (µs)':>12} {'ganho':>8}")
+    for nome, antes, depois, repeticoes in casos:
+        t_lista = cronometrar(antes, repeticoes)
+        t_indice = cronometrar(depois, repeticoes)
+        print(f"  {nome:<28} {t_lista * 1e6:12.1f} {t_indice * 1e6:12.1f} {t_lista / t_indice:7.1f}x")
+    assert list(itens) == lista, "ItensPlaylist diverge da lista"
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_reprodutor.py
+# Simula milhares de ouvintes no ReprodutorAssincrono (um processo, um loop):
+# cada um toca duas playlists, com pulos, pausas e buscas aleatórias no
+# primeiro segundo.
+# Mede a precisão dos timers (atraso sobre o fim previsto de cada mídia) e a
+# latência de um comando vindo de outra thread (o menu) com o loop carregado.
+# Uso: python benchmarks/bench_reprodutor.py [ouvintes] [velocidade]   (padrão: 5.000 e 2.000x)
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from Streaming.reprodutor import ReprodutorAssincrono
+from Streaming.usuario import Usuario
+from log_temporario import log_temporario
+
+
+async def simular(n: int, velocidade: float) -> None:
+    rnd = random.Random(5)
+    catalogo = CatalogoMidia()
+    musicas = [Musica(f"Faixa {i}", rnd.randint(120, 300), f"Artista {i % 200}", "Pop", catalogo=catalogo)
+               for i in range(2000)]
+    playlists = [Playlist(f"Lista {i}", "bench", rnd.sample(musicas, 10)) for i in range(200)]
+    usuarios = [Usuario(f"Ouvinte {i}") for i in range(n)]
+
+    reprodutor = ReprodutorAssincrono(exibir=False, velocidade=velocidade).usar_loop()
+    t0 = time.perf_counter()
+    for u in usuarios:
+        reprodutor.enfileirar(u, rnd.choice(playlists))
+        reprodutor.enfileirar(u, rnd.choice(playlists))
+
+    # Controles aleatórios enquanto tocam (como ouvintes mexendo no player)
+    comandos = 0
+
+    async def mexer():
+        nonlocal comandos
+        limite = time.perf_counter() + 1.0   # primeiro segundo
+        while reprodutor.tocando and time.perf_counter() < limite:
+            for u in rnd.sample(usuarios, min(20, n)):
+                acao = rnd.random()
+                if acao < 0.3:
+                    reprodutor.pular(u)
+                elif acao < 0.5:
+                    reprodutor.pausar(u)
+                elif acao < 0.8:
+                    reprodutor.continuar(u)
+                else:
+                    reprodutor.posicionar(u, rnd.uniform(0, 200))
+                comandos += 1
+            await asyncio.sleep(0.01)
+        for u in usuarios:   # quem ficou pausado no fim volta a tocar
+            reprodutor.continuar(u)
+
+    # "Menu" em outra thread: tempo até um comando ser executado pelo loop
+    latencias = []
+    fim = threading.Event()
+    loop = asyncio.get_running_loop()
+
+    def menu():
+        while not fim.is_set():
+            feito = threading.Event()
+            t = time.perf_counter()
+            loop.call_soon_threadsafe(feito.set)
+            feito.wait()
+            latencias.append(time.perf_counter() - t)
+            fim.wait(0.01)
+
+    thread = threading.Thread(target=menu)
+    thread.start()
+    controle = asyncio.create_task(mexer())
+    await controle
+    await reprodutor.aguardar()
+    total = time.perf_counter() - t0
+    fim.set()
+    thread.join()
+
+    simulados = sum(m.reproducoes * m.duracao for m in musicas)
+    latencias.sort()
+    print(f"{n} ouvintes, velocidade {velocidade:g}x: {total:.2f} s reais")
+    print(f"  reproduções: {sum(m.reproducoes for m in musicas)} | mídias até o fim: {reprodutor.concluidas} | "
+          f"comandos: {comandos}")
+    print(f"  até {simulados / 3600:,.0f} h de áudio simuladas ({simulados / 3600 / total:,.0f} h por segundo real)")
+    print(f"  {reprodutor}")
+    if latencias:
+        print(f"  comando vindo de outra thread: mediana {latencias[len(latencias) // 2] * 1000:.2f} ms, "
+              f"p99 {latencias[int(len(latencias) * 0.99)] * 1000:.2f} ms ({len(latencias)} amostras)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    velocidade = float(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    asyncio.run(simular(n, velocidade))
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
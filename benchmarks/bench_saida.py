@@ -0,0 +1,78 @@
+# benchmarks/bench_saida.py
+# Tocar uma playlist grande (Playlist.reproduzir) com cada tipo de saída de
+# mensagens. A referência é um print() por mídia, como era antes.
+# As saídas escrevem num arquivo com buffer de linha (como um terminal: cada
+# linha vira uma escrita) apontado para os.devnull, então o tempo é o do
+# formato e das escritas, não o do terminal.
+# Uso: python benchmarks/bench_saida.py [itens]   (padrão: 10.000)
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from Streaming.saida import MENSAGENS, Saida, SaidaConsole, SaidaEstruturada, SaidaSilenciosa
+from log_temporario import log_temporario
+
+
+class SaidaPrint(Saida):
+    """Um print() por mensagem (o que ArquivoDeMidia.reproduzir fazia)."""
+
+    def __init__(self, fluxo):
+        self.fluxo = fluxo
+
+    def emitir(self, evento: str, **dados) -> None:
+        print(MENSAGENS[evento].format(**dados), file=self.fluxo)
+
+
+class Contador:
+    """Fluxo que repassa ao arquivo e conta as escritas (com buffer de linha, cada write com '\\n' descarrega)."""
+
+    def __init__(self, fluxo):
+        self.fluxo = fluxo
+        self.escritas = 0
+
+    def write(self, texto: str) -> int:
+        self.escritas += "\n" in texto
+        return self.fluxo.write(texto)
+
+    def flush(self) -> None:
+        self.fluxo.flush()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    catalogo = CatalogoMidia()
+    musicas = [Musica(f"Faixa {i}", 200, f"Artista {i % 300}", "Pop", catalogo=catalogo) for i in range(n)]
+    playlist = Playlist("Grande", "bench", musicas)
+
+    with open(os.devnull, "w", buffering=1, encoding="utf-8") as terminal:
+        casos = (
+            ("print() por mídia (antes)", lambda f: SaidaPrint(f)),
+            ("SaidaConsole (lotes)", lambda f: SaidaConsole(f)),
+            ("SaidaEstruturada (JSON)", lambda f: SaidaEstruturada(f)),
+            ("SaidaSilenciosa", lambda f: SaidaSilenciosa()),
+        )
+        print(f"Playlist com {n} mídias")
+        print(f"  {'saída':<28} {'tempo (s)':>10} {'escritas':>9}")
+        base = None
+        for nome, criar in casos:
+            fluxo = Contador(terminal)
+            anterior = Saida.usar(criar(fluxo))
+            t0 = time.perf_counter()
+            playlist.reproduzir()
+            Saida.ativa.descarregar()
+            total = time.perf_counter() - t0
+            Saida.usar(anterior)
+            base = base or total
+            print(f"  {nome:<28} {total:10.4f} {fluxo.escritas:>9} ({base / total:.1f}x)")
+
+
+if __name__ == "__main__":
+    with log_temporario():
+        main()
@@ -0,0 +1,174 @@
+# benchmarks/bench_servidor.py
+# Teste de carga do modo servidor (main.py --servidor): várias conexões
+# simultâneas, cada uma com seu usuário, mandando pedidos do menu (reproduzir
+# música, listar, tocar playlist, controlar a reprodução...).
+# Mostra vazão (pedidos/s), latência p50/p99/máx. por operação e confere que
+# nenhuma reprodução pedida se perdeu no 'reproducoes' das músicas.
+# Sem --endereco, gera um catálogo .md temporário e sobe o servidor num processo.
+# Uso: python benchmarks/bench_servidor.py [conexoes] [pedidos_por_conexao] [--endereco host:porta]
+#      (padrão: 200 conexões, 200 pedidos cada)
+
+import argparse
+import asyncio
+import json
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Mistura de operações (peso, op)
+MISTURA = [(70, "reproduzir_musica"), (10, "listar_playlists"), (5, "reproduzir_playlist"),
+           (10, "controlar_reproducao"), (5, "listar_musicas")]
+
+
+def gerar_catalogo(pasta: Path, musicas: int = 2000, playlists: int = 100) -> tuple:
+    rnd = random.Random(9)
+    titulos = [f"Faixa {i}" for i in range(musicas)]
+    nomes_pl = [f"Lista {i}" for i in range(playlists)]
+    linhas = ["---", "", "# Usuários", ""]
+    for i in range(10):
+        linhas += [f"- nome: Dono {i}  ", f"    playlists: [{', '.join(nomes_pl[i::10])}]", "    "]
+    linhas += ["", "---", "", "# Músicas", ""]
+    for i, t in enumerate(titulos):
+        linhas += [f"- titulo: {t}  ", f"    artista: Artista {i % 300}  ", "    genero: Pop  ",
+                   f"    duracao: {rnd.randint(120, 300)}", "    "]
+    linhas += ["", "---", "", "# Playlists", ""]
+    for i, nome in enumerate(nomes_pl):
+        linhas += [f"- nome: {nome}  ", f"    usuario: Dono {i % 10}  ",
+                   f"    itens: [{', '.join(rnd.sample(titulos, 10))}]", "    "]
+    (pasta / "catalogo.md").write_text("\n".join(linhas) + "\n", encoding="utf-8")
+    return titulos, nomes_pl
+
+
+def subir_servidor(pasta: Path) -> tuple:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        porta = s.getsockname()[1]
+    processo = subprocess.Popen([sys.executable, str(RAIZ / "main.py"), str(pasta), "--servidor", f"127.0.0.1:{porta}",
+                                 "--log", str(pasta / "erros.log")],
+                                cwd=pasta, stdout=subprocess.PIPE, text=True)
+    for linha in processo.stdout:
+        if linha.startswith("Servidor de sessões"):
+            return processo, "127.0.0.1", porta
+    raise RuntimeError("o servidor não subiu")
+
+
+class Cliente:
+    def __init__(self, leitor, escritor):
+        self.leitor, self.escritor = leitor, escritor
+        self.proximo = 0
+
+    @classmethod
+    async def conectar(cls, host: str, porta: int) -> "Cliente":
+        return cls(*await asyncio.open_connection(host, porta, limit=1 << 24))   # páginas grandes numa linha só
+
+    async def pedir(self, op: str, **campos):
+        self.proximo += 1
+        self.escritor.write(json.dumps({"id": self.proximo, "op": op, **campos}).encode() + b"\n")
+        resposta = json.loads(await self.leitor.readline())
+        if not resposta["ok"]:
+            raise RuntimeError(f"{op}: {resposta['erro']}")
+        return resposta["dados"]
+
+    async def fechar(self):
+        self.escritor.close()
+        await self.escritor.wait_closed()
+
+
+async def total_reproducoes(cliente: Cliente) -> int:
+    total, pagina = 0, 0
+    while True:
+        musicas = await cliente.pedir("listar_musicas", pagina=pagina, tamanho=1000)
+        if not musicas:
+            return total
+        total += sum(m["reproducoes"] for m in musicas)
+        pagina += 1
+
+
+async def carga(host: str, porta: int, conexoes: int, pedidos: int) -> None:
+    admin = await Cliente.conectar(host, porta)
+    await admin.pedir("criar_usuario", nome="Admin Bench")
+    await admin.pedir("entrar", nome="Admin Bench")
+    titulos = [m["titulo"] for m in await admin.pedir("listar_musicas", tamanho=1000)]
+    nomes_pl = [p["nome"] for p in await admin.pedir("listar_playlists", tamanho=1000)]
+    antes = await total_reproducoes(admin)
+
+    latencias = {op: [] for _, op in MISTURA}
+    tocadas = 0
+    ops = [op for peso, op in MISTURA for _ in range(peso)]
+
+    async def sessao(i: int) -> None:
+        nonlocal tocadas
+        rnd = random.Random(i)
+        c = await Cliente.conectar(host, porta)
+        await c.pedir("criar_usuario", nome=f"Cliente {i}")
+        await c.pedir("entrar", nome=f"Cliente {i}")
+        for _ in range(pedidos):
+            op = rnd.choice(ops)
+            campos = {}
+            if op == "reproduzir_musica":
+                campos = {"titulo": rnd.choice(titulos)}
+            elif op == "reproduzir_playlist":
+                campos = {"nome": rnd.choice(nomes_pl)}
+            elif op == "controlar_reproducao":
+                campos = {"acao": rnd.choice(["estado", "pausar", "continuar", "pular"])}
+            else:
+                campos = {"pagina": rnd.randrange(2), "tamanho": 20}
+            t0 = time.perf_counter()
+            dados = await c.pedir(op, **campos)
+            latencias[op].append(time.perf_counter() - t0)
+            if op == "reproduzir_musica" and dados["encontrada"]:
+                tocadas += 1
+        await c.pedir("controlar_reproducao", acao="parar")
+        await c.fechar()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(sessao(i) for i in range(conexoes)))
+    total = time.perf_counter() - t0
+    depois = await total_reproducoes(admin)
+    await admin.fechar()
+
+    n = conexoes * pedidos
+    todas = sorted(x for lista in latencias.values() for x in lista)
+    print(f"{conexoes} conexões x {pedidos} pedidos = {n} pedidos em {total:.2f} s: {n / total:,.0f} pedidos/s")
+    print(f"  {'operação':<24} {'qtd':>7} {'p50 ms':>8} {'p99 ms':>8} {'máx. ms':>8}")
+    for op, lista in list(latencias.items()) + [("(todas)", todas)]:
+        if lista:
+            lista.sort()
+            print(f"  {op:<24} {len(lista):>7} {lista[len(lista) // 2] * 1000:8.2f} "
+                  f"{lista[int(len(lista) * 0.99)] * 1000:8.2f} {lista[-1] * 1000:8.2f}")
+    # As playlists tocando também somam reproduções; por isso '>=' e a parte só das músicas pedidas
+    print(f"  reproduções: +{depois - antes} no catálogo, {tocadas} pedidas diretamente "
+          f"({'ok' if depois - antes >= tocadas else 'PERDIDAS'})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("conexoes", nargs="?", type=int, default=200)
+    parser.add_argument("pedidos", nargs="?", type=int, default=200)
+    parser.add_argument("--endereco", help="servidor já rodando (host:porta)")
+    args = parser.parse_args()
+
+    if args.endereco:
+        host, _, porta = args.endereco.rpartition(":")
+        asyncio.run(carga(host or "127.0.0.1", int(porta), args.conexoes, args.pedidos))
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        gerar_catalogo(Path(pasta))
+        processo, host, porta = subir_servidor(Path(pasta))
+        try:
+            asyncio.run(carga(host, porta, args.conexoes, args.pedidos))
+        finally:
+            processo.send_signal(signal.SIGINT)
+            saida = processo.communicate(timeout=30)[0]
+            print("  " + saida.strip().splitlines()[-1] if saida.strip() else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# benchmarks/log_temporario.py
+# Log de erros descartável para os benchmarks: os avisos gerados pelas medições
+# (mídias inválidas, importações, etc.) não vão parar no logs/erros.log do projeto.
+
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.registro_erros import RegistroErros
+
+
+@contextmanager
+def log_temporario():
+    """Troca o log ativo por um numa pasta temporária e devolve o anterior ao sair."""
+    with tempfile.TemporaryDirectory() as pasta:
+        registro = RegistroErros(Path(pasta) / "erros.log")
+        anterior = RegistroErros.usar(registro)
+        try:
+            yield registro
+        finally:
+            RegistroErros.usar(anterior)
+            registro.fechar()
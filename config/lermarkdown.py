@@ -1,7 +1,12 @@
 # config/lermarkdown.py
 # Importa as bibliotecas possíveis e/ou necessárias
 from pathlib import Path
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import inspect
+import marshal
+import mmap
+import re
 import sys
 import os
 import math
@@ -18,86 +23,81 @@ root = str(Path(__file__).resolve().parent.parent)
 if root not in sys.path:
     sys.path.insert(0, root)
 
-from Streaming.usuarios import Usuario
+from Streaming.usuario import Usuario
 from Streaming.arquivo_midia import Musica, Podcast, ArquivoDeMidia
 from Streaming.playlist import Playlist
+from Streaming.registro_erros import RegistroErros
+
+# Snapshot compilado (cache binário do catálogo já resolvido)
+# Formato: SNAPSHOT_MAGIC + 1 byte de versão + marshal((chave da fonte, dados))
+SNAPSHOT_MAGIC = b"STRMSNAP"
+SNAPSHOT_VERSION = 1
+
+# Início de registro ("- ") ou de seção ("# ") sem indentação (ver _iter_chunks)
+_RECORD_START = re.compile(rb"\n(?=[-#] )")
 
 class LerMarkdown:
     """
     Faz a leitura e instancia de objetos a partir de arquivos .md 
     no formato passado no arquivo markdown de exemplo.    
     - Resolve referências (playlists -> mídias e usuário)
-    - Loga avisos/erros em logs/erros.log
+    - Loga avisos/erros no log ativo (RegistroErros: logs/erros.log, gravado em segundo plano)
+    - As mídias criadas são cadastradas no catálogo informado (ou no ativo)
+    - Com from_file(..., cache=True), guarda um snapshot binário de cada arquivo
+      importado em cache/; se o .md não mudou (mesmo mtime/tamanho ou mesmo sha256),
+      o próximo from_file carrega o snapshot sem parsing nem resolução de vínculos
     """
 
-    def __init__(self, strict: bool = False):
+    def __init__(self, strict: bool = False, catalogo=None):
         self.strict = strict
+        self.catalogo = catalogo       # CatalogoMidia; None usa ArquivoDeMidia.catalogo
+        # operação -> {classe: função} (ver _bind)
+        self._bindings = {op: {} for op in ("new_usuario", "new_playlist", "set_items", "attach", "user_list")}
         self._reset_state()
 
         # caminhos (relativos ao projeto)
         self._here = Path(__file__).resolve()              # .../config/lermarkdown.py
         self._project_root = self._here.parents[1]         # (seu-projeto)/
-        self._logs_dir = self._project_root / "logs"
-        self._logs_dir.mkdir(parents=True, exist_ok=True)
-        self._log_file = self._logs_dir / "erros.log"
+        self._cache_dir = self._project_root / "cache"
 
     # ------------------- API pública -------------------
-    def from_file(self, md_filename: str):
-        """Lê um arquivo .md dentro de config/ e retorna dicionário com objetos e logs."""
-        path_md = (self._here.parent / md_filename).resolve()
-        if not path_md.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {path_md}")
-        text = path_md.read_text(encoding="utf-8")
-        return self.parse(text, source=str(path_md))
+    def from_file(self, md_filename: str, cache: bool = False):
+        """
+        Lê um arquivo .md dentro de config/ e retorna dicionário com objetos e logs.
+        A leitura é em streaming (linha a linha): arquivos de vários GB não são
+        carregados inteiros na memória.
+        cache=True: usa o snapshot do arquivo (em cache/) se ele não mudou; senão faz
+        o parsing e grava um novo snapshot. Sem cache, nada é gravado além do log.
+        result["snapshot"] indica se veio do snapshot.
+        """
+        path_md = self._resolve_path(md_filename)
+        if cache:
+            data, sha256 = self._load_snapshot(path_md)
+            if data is not None:
+                result = self._restore_snapshot(data)
+                result["snapshot"] = True
+                return result
+            key = self._source_key(path_md, sha256)
+        with path_md.open(encoding="utf-8") as f:
+            result = self.parse_lines(f, source=str(path_md))
+        if cache:
+            self._write_snapshot(path_md, key)
+        result["snapshot"] = False
+        return result
 
     def parse(self, text: str, source: str = "<string>"):
         """Faz parsing do texto .md e instancia objetos."""
-        self._reset_state()
-        section = None
-        buf = []
-        current = None
-
-        lines = text.splitlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i].rstrip("\n")
-
-            # Header de seção "# ..."
-            if line.strip().startswith("# "):
-                self._flush_section(section, buf)
-                buf = []
-                section = line.strip()[2:].strip().lower()
-                i += 1
-                continue
+        return self.parse_lines(text.splitlines(), source=source)
 
-            # Separador visual '---' é ignorado
-            if line.strip().startswith("---"):
-                i += 1
-                continue
-
-            # Início de item "- chave: valor"
-            if line.strip().startswith("- "):
-                if current is not None:
-                    buf.append(current)
-                current = {}
-                k, v = self._parse_key_value(line.strip()[2:])
-                if k:
-                    current[k] = v
-                i += 1
-                # consumir linhas indentadas (4 espaços ou tab)
-                while i < len(lines) and self._is_indented(lines[i]):
-                    kv_line = lines[i].strip()
-                    k2, v2 = self._parse_key_value(kv_line)
-                    if k2:
-                        current[k2] = v2
-                    i += 1
-                continue
-
-            i += 1
-
-        if current is not None:
-            buf.append(current)
-        self._flush_section(section, buf)
+    def parse_lines(self, lines, source: str = "<string>"):
+        """
+        Faz parsing de um iterável de linhas (ex.: arquivo aberto) e instancia objetos.
+        Cada registro é carregado assim que termina; só o estado da resolução
+        de vínculos (usuários/mídias por nome e playlists pendentes) fica residente.
+        """
+        self._reset_state()
+        for section, record in self._records(lines):
+            self._load_record(section, record)
 
         # Resolver vínculos (depois de todas as seções)
         self._resolve_links()
@@ -105,6 +105,9 @@ class LerMarkdown:
         # Gravar logs
         self._flush_logs_to_file(source)
 
+        return self._result()
+
+    def _result(self):
         return {
             "usuarios": list(self._usuarios_by_nome.values()),
             "musicas": [m for m in self._midias_by_titulo.values() if isinstance(m, Musica)],
@@ -114,13 +117,558 @@ class LerMarkdown:
             "errors": list(self.errors),
         }
 
+    def from_files(self, md_filenames, workers: int = None):
+        """
+        Importa vários arquivos .md (shards do catálogo) de uma vez.
+        - Leitura e validação rodam em paralelo em processos (ProcessPoolExecutor),
+          que devolvem só tuplas compactas dos registros válidos
+        - A junção é feita aqui, na ordem dos arquivos: vale a primeira
+          ocorrência de cada título/usuário, como em from_file
+        - Os vínculos playlist -> usuário/mídias são resolvidos uma vez, no fim,
+          então uma playlist pode citar mídias de outro arquivo
+        workers: quantidade de processos (None: um por núcleo; 1: sem processos).
+        Retorna o mesmo dicionário de from_file, mais "shards": lista com
+        {"fonte", "warnings", "errors"} de cada arquivo.
+        """
+        tasks = [(str(self._resolve_path(f)), self.strict) for f in md_filenames]
+        self._reset_state()
+        shards = []
+        executor = None
+        if workers == 1 or len(tasks) <= 1:
+            results = map(_parse_shard, tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(_parse_shard, tasks)
+        try:
+            for source, records, warnings, errors in results:
+                w0, e0 = len(self.warnings), len(self.errors)
+                self.warnings.extend(warnings)
+                self.errors.extend(errors)
+                for kind, data in records:
+                    self._add_record(kind, data)
+                shard = {"fonte": source, "warnings": self.warnings[w0:], "errors": self.errors[e0:]}
+                shards.append(shard)
+                self._flush_logs_to_file(source, shard["warnings"], shard["errors"])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # Resolver vínculos (uma vez, entre todos os arquivos)
+        w0, e0 = len(self.warnings), len(self.errors)
+        self._resolve_links()
+        self._flush_logs_to_file(f"vínculos entre {len(tasks)} arquivos", self.warnings[w0:], self.errors[e0:])
+
+        result = self._result()
+        result["shards"] = shards
+        return result
+
+    def iter_records(self, md_filename: str):
+        """
+        Gera (seção, registro) de um arquivo .md em streaming, sem instanciar objetos.
+        Registro é o dicionário {chave: valor} de um item "- chave: valor".
+        """
+        path_md = self._resolve_path(md_filename)
+        with path_md.open(encoding="utf-8") as f:
+            yield from self._records(f)
+
+    def reimport(self, md_filename: str):
+        """
+        Relê um arquivo .md aplicando só as diferenças em relação à leitura
+        anterior do mesmo arquivo (por seção e chave do registro: nome do
+        usuário, título da mídia, nome da playlist).
+        - usuários, mídias e playlists novos são criados e os que sumiram são
+          retirados (mídias também saem do catálogo)
+        - mídias e playlists alteradas são atualizadas no próprio objeto, sem
+          criar outra instância no catálogo
+        - só as playlists alteradas ou que citam usuários/mídias afetados têm
+          os vínculos resolvidos de novo
+        Registros com o mesmo texto da leitura anterior não passam por parsing
+        nem validação. A primeira chamada (ou após from_file/parse) importa tudo.
+        Retorna o dicionário de from_file, mais "diff": quantidades de
+        adicionados/atualizados/removidos por tipo e de playlists revinculadas.
+        warnings/errors trazem só as mensagens desta leitura.
+        É o mesmo que apply_reimport(prepare_reimport(md_filename)).
+        """
+        return self.apply_reimport(self.prepare_reimport(md_filename))
+
+    def prepare_reimport(self, md_filename: str):
+        """
+        Primeira fase do reimport: lê e valida o arquivo (custo proporcional ao
+        tamanho), sem criar nem alterar usuários, mídias ou playlists.
+        Retorna o estado lido, a ser aplicado por apply_reimport; entre as duas
+        fases não use o leitor para outra coisa.
+        """
+        path_md = self._resolve_path(md_filename)
+        if self._fonte_incremental != str(path_md):
+            self._reset_state()
+            self._fonte_incremental = str(path_md)
+        self.warnings = []
+        self.errors = []
+        st = path_md.stat()   # antes da leitura: se o arquivo mudar durante ela, a próxima relê
+        versao = (st.st_size, st.st_mtime_ns)
+        if versao == self._versao_incremental:
+            return (str(path_md), versao, None, None)   # arquivo intocado desde a última leitura
+        impressoes, registros = self._collect_records(path_md)
+        return (str(path_md), versao, impressoes, registros)
+
+    def apply_reimport(self, lido):
+        """
+        Segunda fase do reimport: aplica nos objetos a diferença do estado lido
+        por prepare_reimport (custo proporcional às alterações).
+        """
+        fonte, versao, impressoes, registros = lido
+        if fonte != self._fonte_incremental:
+            raise ValueError(f"Estado lido de '{fonte}', mas o leitor está em '{self._fonte_incremental}'.")
+        if registros is None:
+            diff = self._empty_diff()
+        else:
+            diff = self._apply_diff(registros)
+            self._impressoes = impressoes
+            self._registros = registros
+            self._versao_incremental = versao
+            self._flush_logs_to_file(fonte)
+
+        result = self._result()
+        result["diff"] = diff
+        return result
+
+    def unload_reimport(self):
+        """
+        Desfaz a importação incremental (ex.: o arquivo foi apagado): retira os
+        usuários, as playlists e as mídias (também do catálogo). Retorna o "diff".
+        """
+        diff = self._apply_diff({"usuarios": {}, "midias": {}, "playlists": {}})
+        self._reset_state()
+        return diff
+
+    # ------------------- Snapshot compilado -------------------
+    def _snapshot_path(self, path_md: Path) -> Path:
+        # nome legível + hash do caminho e do modo (arquivos de mesmo nome em pastas diferentes)
+        tag = hashlib.sha1(f"{path_md}|{self.strict}".encode("utf-8")).hexdigest()[:12]
+        return self._cache_dir / f"{path_md.stem}-{tag}.snap"
+
+    @staticmethod
+    def _file_sha256(path_md: Path) -> str:
+        h = hashlib.sha256()
+        with path_md.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _source_key(self, path_md: Path, sha256: str = None) -> tuple:
+        """
+        (tamanho, mtime_ns, sha256, strict) do .md, antes do parsing. O sha256 só é
+        conhecido se _load_snapshot precisou calculá-lo (mtime diferente); senão None.
+        """
+        st = path_md.stat()
+        return (st.st_size, st.st_mtime_ns, sha256, self.strict)
+
+    def _load_snapshot(self, path_md: Path):
+        """
+        Retorna (dados do snapshot ou None, sha256 do .md ou None). Os dados vêm se o
+        snapshot existe, é desta versão e a fonte não mudou. O sha256 só é calculado
+        quando o tamanho confere e o mtime não: é guardado no próximo snapshot.
+        """
+        snap = self._snapshot_path(path_md)
+        header = len(SNAPSHOT_MAGIC) + 1
+        try:
+            # mmap: o marshal lê direto das páginas do arquivo, sem cópia intermediária
+            with snap.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # cabeçalho incompleto, de outro formato ou de outra versão: refaz o parsing
+                if (len(mm) < header or mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC
+                        or mm[len(SNAPSHOT_MAGIC)] != SNAPSHOT_VERSION):
+                    return None, None
+                with memoryview(mm) as view, view[header:] as body:
+                    key, data = marshal.loads(body)
+            size, mtime_ns, sha256, strict = key
+        except (OSError, ValueError, EOFError, TypeError, IndexError):
+            return None, None
+
+        if strict != self.strict:
+            return None, None
+        st = path_md.stat()
+        if st.st_size != size:
+            return None, None
+        # mtime igual: confia; mtime diferente: compara o conteúdo (se o snapshot tem o sha256)
+        if st.st_mtime_ns == mtime_ns:
+            return data, None
+        atual = self._file_sha256(path_md)
+        return (data if atual == sha256 else None), atual
+
+    def _write_snapshot(self, path_md: Path, key: tuple) -> None:
+        """Grava o estado resolvido do último parsing (só tipos nativos, via marshal)."""
+        usuarios = list(self._usuarios_by_nome.values())
+        midias = list(self._midias_by_titulo.values())
+        user_index = {id(u): i for i, u in enumerate(usuarios)}
+        media_index = {id(m): i for i, m in enumerate(midias)}
+
+        media_rows = []
+        for m in midias:
+            if isinstance(m, Podcast):
+                media_rows.append(("p", m.titulo, m.artista, m.temporada, m.episodio, m.host, m.duracao))
+            else:
+                media_rows.append(("m", m.titulo, m.artista, m.genero, m.duracao))
+        playlist_rows = []
+        for pl in self._playlists:
+            owner = self._usuarios_by_nome.get(self._get_playlist_owner_name(pl))
+            itens = getattr(pl, "itens", None) or []
+            playlist_rows.append((
+                self._get_playlist_name(pl), getattr(pl, "usuario", ""),
+                tuple(getattr(pl, "_titulos_md", None) or ()),
+                tuple(media_index[id(o)] for o in itens if id(o) in media_index),
+                user_index[id(owner)] if owner is not None else -1,
+            ))
+        data = ([u.nome for u in usuarios], media_rows, playlist_rows,
+                list(self.warnings), list(self.errors))
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        snap = self._snapshot_path(path_md)
+        tmp = snap.with_suffix(".tmp")
+        try:
+            with tmp.open("wb") as f:
+                f.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]))
+                marshal.dump((key, data), f)
+            tmp.replace(snap)   # troca atômica: nunca há snapshot pela metade
+        except (OSError, ValueError) as e:
+            self._log_warn(f"Não foi possível gravar o snapshot '{snap}': {e}")
+
+    def _restore_snapshot(self, data):
+        """Recria os objetos do snapshot (vínculos já resolvidos, por índice)."""
+        nomes, media_rows, playlist_rows, warnings, errors = data
+        self._reset_state()
+        usuarios = []
+        for nome in nomes:
+            u = self._make_usuario(nome)
+            self._usuarios_by_nome[nome] = u
+            usuarios.append(u)
+        midias = []
+        for row in media_rows:
+            if row[0] == "p":
+                _, titulo, artista, temporada, episodio, host, duracao = row
+                m = self._make_podcast(titulo, duracao, artista, episodio, temporada, host)
+            else:
+                _, titulo, artista, genero, duracao = row
+                m = self._make_musica(titulo, artista, genero, duracao)
+            self._midias_by_titulo[titulo] = m
+            midias.append(m)
+        for nome, usuario, titulos, indices, owner in playlist_rows:
+            pl = self._make_playlist(nome, usuario, list(titulos))
+            pl._titulos_md = list(titulos)
+            if owner >= 0:
+                self._attach_playlist_to_user(usuarios[owner], pl)
+            self._set_playlist_items(pl, [midias[i] for i in indices])
+            self._playlists.append(pl)
+        self.warnings = list(warnings)
+        self.errors = list(errors)
+        return self._result()
+
+    # ------------------- Reimportação incremental -------------------
+    def _collect_records(self, path_md: Path):
+        """
+        Lê os registros válidos do arquivo em {grupo: {chave: (tipo, tupla)}}, na ordem
+        do arquivo (vale a primeira ocorrência, como em _add_*).
+        O arquivo é lido em streaming e cortado antes de cada linha "- " ou "# " sem
+        indentação (ver _iter_chunks); cada trecho (quase sempre um registro) é
+        identificado pela seção corrente e pelo digest BLAKE2b do texto. Trechos já
+        vistos na leitura anterior reaproveitam os itens (os mesmos objetos) sem
+        decodificar nem validar nada.
+        """
+        anteriores = self._impressoes
+        impressoes = {}    # seção -> {digest do trecho: (seção ao final, itens)}
+        usuarios, midias, playlists = {}, {}, {}
+        ocorrencias = {}   # nome da playlist -> quantas já apareceram
+        section = None
+        vistos, antigos = impressoes.setdefault(section, {}), anteriores.get(section, {})
+        for trecho in self._iter_chunks(path_md):
+            marca = hashlib.blake2b(trecho, digest_size=16).digest()
+            lido = vistos.get(marca)
+            if lido is None:
+                lido = antigos.get(marca) or self._read_chunk(trecho, section)
+                vistos[marca] = lido
+            if lido[0] != section:
+                section = lido[0]
+                vistos, antigos = impressoes.setdefault(section, {}), anteriores.get(section, {})
+
+            for item in lido[1]:
+                kind, data = item
+                if kind == "usuarios":
+                    chave, destino = data, usuarios
+                elif kind == "playlists":
+                    # playlists podem repetir o nome: a chave conta a ocorrência
+                    n = ocorrencias.get(data[0], 0)
+                    ocorrencias[data[0]] = n + 1
+                    chave, destino = (data[0], n), playlists
+                else:
+                    chave, destino = data[0], midias
+                if chave not in destino:
+                    destino[chave] = item
+                elif destino is usuarios:
+                    self._log_warn(f"Usuário duplicado '{chave}'. Mantendo o primeiro e ignorando o duplicado.")
+                else:
+                    self._log_warn(f"Mídia (título) duplicada '{chave}'. Mantendo a primeira.")
+        return impressoes, {"usuarios": usuarios, "midias": midias, "playlists": playlists}
+
+    @staticmethod
+    def _iter_chunks(path_md: Path):
+        """
+        Gera os trechos do arquivo, lido em blocos de 1 MiB: um trecho termina antes
+        de cada linha "- " ou "# " sem indentação, onde a leitura sempre recomeça.
+        O último trecho de cada bloco pode continuar no seguinte: fica para o próximo corte.
+        """
+        resto = b""
+        with path_md.open("rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                trechos = _RECORD_START.split(resto + bloco)
+                resto = trechos.pop()
+                yield from trechos
+        yield resto
+
+    def _read_chunk(self, trecho: bytes, section):
+        """Valida um trecho do arquivo: (seção ao final, ((tipo, tupla), ...))."""
+        itens = []
+        for section, raw in self._raw_records(trecho.decode("utf-8").splitlines(), section):
+            if raw is None:
+                continue
+            kind = self._section_kind(section)
+            if kind is None:
+                continue
+            data = self._validate_record(kind, self._parse_record(raw))
+            if data is not None:
+                itens.append((kind, data))
+        return section, tuple(itens)
+
+    @staticmethod
+    def _empty_diff():
+        diff = {grupo: {"adicionados": 0, "atualizados": 0, "removidos": 0}
+                for grupo in ("usuarios", "midias", "playlists")}
+        diff["playlists"]["revinculadas"] = 0
+        return diff
+
+    def _apply_diff(self, registros):
+        """Aplica a diferença entre self._registros (leitura anterior) e registros."""
+        antigos = self._registros
+        diff = self._empty_diff()
+        usuarios_afetados, titulos_afetados = set(), set()
+
+        # 1) usuários (só entram ou saem: o nome é a própria chave)
+        novos, velhos = registros["usuarios"], antigos["usuarios"]
+        for nome in velhos.keys() - novos.keys():
+            del self._usuarios_by_nome[nome]
+            usuarios_afetados.add(nome)
+            diff["usuarios"]["removidos"] += 1
+        for nome in novos:
+            if nome not in velhos:
+                self._usuarios_by_nome[nome] = self._make_usuario(nome)
+                usuarios_afetados.add(nome)
+                diff["usuarios"]["adicionados"] += 1
+        if list(novos) != list(self._usuarios_by_nome):   # entrou, saiu ou mudou de ordem
+            self._usuarios_by_nome = {nome: self._usuarios_by_nome[nome] for nome in novos}
+
+        # 2) mídias
+        novos, velhos = registros["midias"], antigos["midias"]
+        for titulo in velhos.keys() - novos.keys():
+            self._forget_midia(titulo)
+            titulos_afetados.add(titulo)
+            diff["midias"]["removidos"] += 1
+        for titulo, item in novos.items():
+            anterior = velhos.get(titulo)
+            if anterior is item:
+                continue
+            kind, data = item
+            if anterior is None:
+                self._add_record(kind, data)
+                titulos_afetados.add(titulo)
+                diff["midias"]["adicionados"] += 1
+            elif anterior != item:
+                if not self._update_midia(self._midias_by_titulo[titulo], kind, data):
+                    # mudou de tipo (música <-> podcast): troca o objeto
+                    self._forget_midia(titulo)
+                    self._add_record(kind, data)
+                    titulos_afetados.add(titulo)
+                diff["midias"]["atualizados"] += 1
+        if list(novos) != list(self._midias_by_titulo):
+            self._midias_by_titulo = {titulo: self._midias_by_titulo[titulo] for titulo in novos}
+
+        # 3) playlists
+        novos, velhos = registros["playlists"], antigos["playlists"]
+        a_resolver = {}   # id(playlist) -> playlist
+        for chave in velhos.keys() - novos.keys():
+            self._unlink_playlist(self._playlists_by_key.pop(chave))
+            diff["playlists"]["removidos"] += 1
+        for chave, item in novos.items():
+            anterior = velhos.get(chave)
+            if anterior is item:
+                continue
+            data = item[1]
+            if anterior is None:
+                nome, usuario, itens = data
+                pl = self._make_playlist(nome, usuario, list(itens))
+                self._playlists_by_key[chave] = pl
+                diff["playlists"]["adicionados"] += 1
+            elif anterior != item:
+                pl = self._playlists_by_key[chave]
+                pl.usuario = (data[1] or "Usuário não informado").strip()   # como em Playlist()
+                diff["playlists"]["atualizados"] += 1
+            else:
+                continue
+            pl._titulos_md = list(data[2])
+            a_resolver[id(pl)] = pl
+        if list(novos) != list(velhos):
+            self._playlists = [self._playlists_by_key[chave] for chave in novos]
+
+        # 4) vínculos: só as playlists alteradas ou que citam o que mudou
+        for nome in usuarios_afetados:
+            a_resolver.update(self._playlists_por_usuario.get(nome, {}))
+        for titulo in titulos_afetados:
+            a_resolver.update(self._playlists_por_titulo.get(titulo, {}))
+        for pl in a_resolver.values():
+            self._unlink_playlist(pl)
+            self._resolve_playlist(pl)
+            self._index_playlist(pl)
+        diff["playlists"]["revinculadas"] = len(a_resolver)
+        return diff
+
+    def _forget_midia(self, titulo):
+        """Retira a mídia do leitor e do catálogo em que foi cadastrada."""
+        m = self._midias_by_titulo.pop(titulo)
+        if m._catalogo is not None:
+            m._catalogo.remover(m)
+
+    def _update_midia(self, m, kind, data):
+        """Atualiza a mídia com os dados novos; False se o tipo mudou (precisa de outro objeto)."""
+        if kind == "musicas":
+            if not isinstance(m, Musica):
+                return False
+            _, artista, genero, duracao = data
+            m.genero = sys.intern((genero or "Não informado").strip().title())
+        else:
+            if not isinstance(m, Podcast):
+                return False
+            _, temporada, episodio, host, duracao = data
+            artista = host
+            m.episodio = max(episodio, 1)   # mesmos ajustes do construtor de Podcast
+            m.temporada = sys.intern((temporada or "Temporada").strip())
+            m.host = sys.intern((host or "Não informado").strip())
+        m.duracao = duracao
+        # o setter de artista já reindexa; senão reindexa pelos demais campos
+        if m.artista != artista:
+            m.artista = artista
+        elif m._catalogo is not None:
+            m._catalogo.reindexar(m)
+        return True
+
+    def _index_playlist(self, pl):
+        """Guarda por quais usuário/títulos a playlist foi resolvida (índice reverso)."""
+        uname = self._get_playlist_owner_name(pl)
+        titles = tuple(self._get_playlist_titles(pl))
+        pl._vinculos_md = (uname, self._usuarios_by_nome.get(uname), titles)
+        self._playlists_por_usuario.setdefault(uname, {})[id(pl)] = pl
+        for t in titles:
+            self._playlists_por_titulo.setdefault(t, {})[id(pl)] = pl
+
+    def _unlink_playlist(self, pl):
+        """Desfaz o que _index_playlist e a resolução fizeram (usuário e índice reverso)."""
+        vinculos = getattr(pl, "_vinculos_md", None)
+        if vinculos is None:
+            return
+        uname, owner, titles = vinculos
+        if owner is not None:
+            self._detach_playlist_from_user(owner, pl)
+        self._discard_ref(self._playlists_por_usuario, uname, pl)
+        for t in titles:
+            self._discard_ref(self._playlists_por_titulo, t, pl)
+        pl._vinculos_md = None
+
+    @staticmethod
+    def _discard_ref(indice, chave, pl):
+        refs = indice.get(chave)
+        if refs is not None:
+            refs.pop(id(pl), None)
+            if not refs:
+                del indice[chave]
+
     # ------------------- Parsing helpers -------------------
+    def _resolve_path(self, md_filename: str) -> Path:
+        path_md = (self._here.parent / md_filename).resolve()
+        if not path_md.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {path_md}")
+        return path_md
+
     def _reset_state(self):
         self.warnings = []
         self.errors = []
         self._usuarios_by_nome = {}
         self._midias_by_titulo = {}
         self._playlists = []
+        self._ignored_sections = set()
+        # estado da reimportação incremental (ver reimport)
+        self._fonte_incremental = None
+        self._versao_incremental = None   # (tamanho, mtime_ns) da última leitura
+        self._impressoes = {}          # seção -> {digest do trecho: (seção ao final, itens)}
+        self._registros = {"usuarios": {}, "midias": {}, "playlists": {}}   # chave -> (tipo, tupla)
+        self._playlists_by_key = {}    # (nome, ocorrência) -> playlist
+        self._playlists_por_titulo = {}    # título -> {id(playlist): playlist}
+        self._playlists_por_usuario = {}   # nome do usuário -> {id(playlist): playlist}
+
+    def _records(self, lines):
+        """Gerador de (seção, registro) a partir de linhas, com um registro por vez na memória."""
+        for section, raw in self._raw_records(lines):
+            if raw is not None:
+                yield section, self._parse_record(raw)
+
+    def _raw_records(self, lines, section=None):
+        """
+        Gerador de (seção, linhas do registro), sem interpretar os campos.
+        Ao abrir uma seção gera (seção, None), para quem acompanha a seção corrente.
+        - "# Título" abre uma seção (e encerra o registro corrente)
+        - "- chave: valor" abre um registro; as linhas indentadas logo abaixo
+          (4 espaços ou tab) são os demais campos
+        - separadores '---' e demais linhas são ignorados
+        As linhas vêm sem espaços nas pontas (e o primeiro campo sem o "- "),
+        numa tupla: dá para comparar registros entre leituras pelo texto.
+        """
+        current = None
+        collecting = False      # logo após "- ...": linhas indentadas pertencem ao registro
+        for line in lines:
+            line = line.rstrip("\n")
+
+            if collecting and self._is_indented(line):
+                current.append(line.strip())
+                continue
+            collecting = False
+            stripped = line.strip()
+
+            # Header de seção "# ..."
+            if stripped.startswith("# "):
+                if current is not None:
+                    yield section, tuple(current)
+                    current = None
+                section = stripped[2:].strip().lower()
+                yield section, None
+                continue
+
+            # Separador visual '---' é ignorado
+            if stripped.startswith("---"):
+                continue
+
+            # Início de item "- chave: valor"
+            if stripped.startswith("- "):
+                if current is not None:
+                    yield section, tuple(current)
+                current = [stripped[2:]]
+                collecting = True
+
+        if current is not None:
+            yield section, tuple(current)
+
+    def _parse_record(self, raw):
+        """Monta o registro {chave: valor} a partir das linhas de _raw_records."""
+        record = {}
+        for line in raw:
+            k, v = self._parse_key_value(line)
+            if k:
+                record[k] = v
+        return record
 
     def _is_indented(self, line: str) -> bool:
         if not line.strip():
@@ -144,168 +692,198 @@ class LerMarkdown:
 
         return key, value
 
-    def _flush_section(self, section, records):
-        if not section or not records:
-            return
+    def _load_record(self, section, record):
+        """Carrega um registro conforme a seção em que ele aparece."""
+        kind = self._section_kind(section)
+        if kind is not None:
+            self._add_record(kind, self._validate_record(kind, record))
+
+    def _section_kind(self, section):
+        """Tipo de registro da seção: 'usuarios', 'musicas', 'podcasts', 'playlists' ou None."""
+        if not section:
+            return None
         s = section.lower()
         if "usuário" in s or "usuarios" in s or "usuários" in s:
-            self._load_usuarios(records)
-        elif "música" in s or "musicas" in s or "músicas" in s:
-            self._load_musicas(records)
-        elif "podcast" in s or "podcasts" in s:
-            self._load_podcasts(records)
-        elif "playlist" in s or "playlists" in s:
-            self._load_playlists(records)
-        else:
+            return "usuarios"
+        if "música" in s or "musicas" in s or "músicas" in s:
+            return "musicas"
+        if "podcast" in s or "podcasts" in s:
+            return "podcasts"
+        if "playlist" in s or "playlists" in s:
+            return "playlists"
+        if section not in self._ignored_sections:
+            # avisa uma vez por seção
+            self._ignored_sections.add(section)
             self._log_warn(f"Seção desconhecida ignorada: {section!r}")
+        return None
+
+    # Cada registro passa por duas etapas:
+    # 1) _validate_*: valida o dicionário do MD e devolve uma tupla compacta (ou None);
+    #    não depende do estado do leitor, então pode rodar em outro processo
+    # 2) _add_*: trata duplicados e instancia o objeto (sempre no processo principal)
+    def _validate_record(self, kind, record):
+        return getattr(self, "_validate_" + kind)(record)
+
+    def _add_record(self, kind, data):
+        if data is not None:
+            getattr(self, "_add_" + kind)(data)
 
     # ------------------- Carregadores de seção -------------------
-    def _load_usuarios(self, records):
-        for r in records:
-            nome = (r.get("nome") or "").strip()
-            if not nome:
-                self._log_err("Usuário sem nome; registro ignorado.", r)
-                continue
-            if nome in self._usuarios_by_nome:
-                self._log_warn(f"Usuário duplicado '{nome}'. Mantendo o primeiro e ignorando o duplicado.")
-                continue
-            u = self._make_usuario(nome)
-            # playl. listadas no md serão associadas na _resolve_links
-            self._usuarios_by_nome[nome] = u
+    def _validate_usuarios(self, r):
+        nome = (r.get("nome") or "").strip()
+        if not nome:
+            self._log_err("Usuário sem nome; registro ignorado.", r)
+            return None
+        return nome
 
-    def _load_musicas(self, records):
-        for r in records:
-            titulo  = (r.get("titulo")  or "").strip()
-            artista = (r.get("artista") or "").strip()
-            genero  = (r.get("genero")  or "").strip()
-            dur_raw = (r.get("duracao") or "").strip()
+    def _add_usuarios(self, nome):
+        if nome in self._usuarios_by_nome:
+            self._log_warn(f"Usuário duplicado '{nome}'. Mantendo o primeiro e ignorando o duplicado.")
+            return
+        u = self._make_usuario(nome)
+        # playl. listadas no md serão associadas na _resolve_links
+        self._usuarios_by_nome[nome] = u
 
-            if not titulo:
-                self._log_err("Música sem título; ignorada.", r)
-                continue
-            if titulo in self._midias_by_titulo:
-                self._log_warn(f"Mídia (título) duplicada '{titulo}'. Mantendo a primeira.")
-                continue
+    def _validate_musicas(self, r):
+        titulo  = (r.get("titulo")  or "").strip()
+        artista = (r.get("artista") or "").strip()
+        genero  = (r.get("genero")  or "").strip()
+        dur_raw = (r.get("duracao") or "").strip()
 
-            dur_int = self._to_int(dur_raw, default=None)
-            if dur_int is None or dur_int <= 0:
-                msg = f"Duração inválida para música '{titulo}': {dur_raw!r}."
-                if self.strict:
-                    self._log_err(msg + " Registro ignorado.", r)
-                    continue
-                else:
-                    self._log_warn(msg + " Ignorada (strict=False).")
-                    continue
+        if not titulo:
+            self._log_err("Música sem título; ignorada.", r)
+            return None
 
-            m = self._make_musica(titulo, artista, genero, dur_int)
-            self._midias_by_titulo[titulo] = m
+        dur_int = self._to_int(dur_raw, default=None)
+        if dur_int is None or dur_int <= 0:
+            msg = f"Duração inválida para música '{titulo}': {dur_raw!r}."
+            if self.strict:
+                self._log_err(msg + " Registro ignorado.", r)
+            else:
+                self._log_warn(msg + " Ignorada (strict=False).")
+            return None
+        return (titulo, artista, genero, dur_int)
 
-    def _load_podcasts(self, records):
-        for r in records:
-            titulo     = (r.get("titulo")     or "").strip()
-            temporada  = (r.get("temporada")  or "").strip()
-            ep_raw     = (r.get("episodio")   or "").strip()
-            host       = (r.get("host")       or "").strip()
-            dur_raw    = (r.get("duracao")    or "").strip()
+    def _add_musicas(self, dados):
+        titulo, artista, genero, dur_int = dados
+        if titulo in self._midias_by_titulo:
+            self._log_warn(f"Mídia (título) duplicada '{titulo}'. Mantendo a primeira.")
+            return
+        m = self._make_musica(titulo, artista, genero, dur_int)
+        self._midias_by_titulo[titulo] = m
 
-            if not titulo:
-                self._log_err("Podcast sem título; ignorado.", r)
-                continue
-            if titulo in self._midias_by_titulo:
-                self._log_warn(f"Mídia (título) duplicada '{titulo}'. Mantendo a primeira.")
-                continue
+    def _validate_podcasts(self, r):
+        titulo     = (r.get("titulo")     or "").strip()
+        temporada  = (r.get("temporada")  or "").strip()
+        ep_raw     = (r.get("episodio")   or "").strip()
+        host       = (r.get("host")       or "").strip()
+        dur_raw    = (r.get("duracao")    or "").strip()
 
-            ep_int = self._to_int(ep_raw, default=None)
-            if ep_int is None or ep_int < 0:
-                if self.strict:
-                    self._log_err(f"Episódio inválido em '{titulo}': {ep_raw!r}.", r)
-                    continue
-                else:
-                    self._log_warn(f"Episódio inválido em '{titulo}': {ep_raw!r}. Usando 0.")
-                    ep_int = 0
-
-            dur_int = self._to_int(dur_raw, default=None)
-            if dur_int is None or dur_int <= 0:
-                msg = f"Duração inválida para podcast '{titulo}': {dur_raw!r}."
-                if self.strict:
-                    self._log_err(msg + " Registro ignorado.", r)
-                    continue
-                else:
-                    self._log_warn(msg + " Ignorado (strict=False).")
-                    continue
+        if not titulo:
+            self._log_err("Podcast sem título; ignorado.", r)
+            return None
 
-            p = self._make_podcast(titulo, temporada, ep_int, host, dur_int)
-            self._midias_by_titulo[titulo] = p
+        ep_int = self._to_int(ep_raw, default=None)
+        if ep_int is None or ep_int < 0:
+            if self.strict:
+                self._log_err(f"Episódio inválido em '{titulo}': {ep_raw!r}.", r)
+                return None
+            else:
+                self._log_warn(f"Episódio inválido em '{titulo}': {ep_raw!r}. Usando 0.")
+                ep_int = 0
 
-    def _load_playlists(self, records):
-        for r in records:
-            nome    = (r.get("nome")    or "").strip()
-            usuario = (r.get("usuario") or "").strip()
-            itens   = [ (x or "").strip() for x in (r.get("itens") or []) ]
+        dur_int = self._to_int(dur_raw, default=None)
+        if dur_int is None or dur_int <= 0:
+            msg = f"Duração inválida para podcast '{titulo}': {dur_raw!r}."
+            if self.strict:
+                self._log_err(msg + " Registro ignorado.", r)
+            else:
+                self._log_warn(msg + " Ignorado (strict=False).")
+            return None
+        return (titulo, temporada, ep_int, host, dur_int)
 
-            if not nome:
-                self._log_err("Playlist sem nome; ignorada.", r)
-                continue
+    def _add_podcasts(self, dados):
+        titulo, temporada, ep_int, host, dur_int = dados
+        if titulo in self._midias_by_titulo:
+            self._log_warn(f"Mídia (título) duplicada '{titulo}'. Mantendo a primeira.")
+            return
+        p = self._make_podcast(titulo, dur_int, host, ep_int, temporada, host)
+        self._midias_by_titulo[titulo] = p
 
-            # Normaliza itens duplicados dentro da mesma playlist
-            seen, dups, itens_unique = set(), [], []
-            for t in itens:
-                if t in seen:
-                    dups.append(t)
-                else:
-                    seen.add(t)
-                    itens_unique.append(t)
-            if dups:
-                self._log_warn(f"Playlist '{nome}' tem itens repetidos: {dups}. Mantendo uma ocorrência de cada.")
+    def _validate_playlists(self, r):
+        nome    = (r.get("nome")    or "").strip()
+        usuario = (r.get("usuario") or "").strip()
+        itens   = [ (x or "").strip() for x in (r.get("itens") or []) ]
 
-            # Instancia playlist (usuario ainda é string; resolvemos depois)
-            pl = self._make_playlist(nome, usuario, itens_unique)
-            self._playlists.append(pl)
+        if not nome:
+            self._log_err("Playlist sem nome; ignorada.", r)
+            return None
+
+        # Normaliza itens duplicados dentro da mesma playlist
+        seen, dups, itens_unique = set(), [], []
+        for t in itens:
+            if t in seen:
+                dups.append(t)
+            else:
+                seen.add(t)
+                itens_unique.append(t)
+        if dups:
+            self._log_warn(f"Playlist '{nome}' tem itens repetidos: {dups}. Mantendo uma ocorrência de cada.")
+        return (nome, usuario, tuple(itens_unique))
+
+    def _add_playlists(self, dados):
+        nome, usuario, itens_unique = dados
+        # Instancia playlist (usuario ainda é string; resolvemos depois)
+        pl = self._make_playlist(nome, usuario, list(itens_unique))
+        # títulos do MD ficam guardados até a resolução dos vínculos
+        pl._titulos_md = list(itens_unique)
+        self._playlists.append(pl)
 
     # ------------------- Resolvedor de vínculos -------------------
     def _resolve_links(self):
         # Vincular playlists ao usuário e aos itens (músicas/podcasts)
         for pl in self._playlists:
-            # 1) usuário
-            uname = self._get_playlist_owner_name(pl)
-            if not uname:
-                self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' sem usuário definido no objeto; tentando o nome do MD se disponível.")
-            if uname and uname not in self._usuarios_by_nome:
-                self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' referencia usuário inexistente '{uname}'.")
-                owner = None
+            self._resolve_playlist(pl)
+
+    def _resolve_playlist(self, pl):
+        # 1) usuário
+        uname = self._get_playlist_owner_name(pl)
+        if not uname:
+            self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' sem usuário definido no objeto; tentando o nome do MD se disponível.")
+        if uname and uname not in self._usuarios_by_nome:
+            self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' referencia usuário inexistente '{uname}'.")
+            owner = None
+        else:
+            owner = self._usuarios_by_nome.get(uname)
+            if owner:
+                self._attach_playlist_to_user(owner, pl)
+
+        # 2) itens (por título)
+        titles = self._get_playlist_titles(pl)
+        resolved, missing = [], []
+        for t in titles:
+            obj = self._midias_by_titulo.get(t)
+            if obj is None:
+                missing.append(t)
             else:
-                owner = self._usuarios_by_nome.get(uname)
-                if owner:
-                    self._attach_playlist_to_user(owner, pl)
-
-            # 2) itens (por título)
-            titles = self._get_playlist_titles(pl)
-            resolved, missing = [], []
-            for t in titles:
-                obj = self._midias_by_titulo.get(t)
-                if obj is None:
-                    missing.append(t)
-                else:
-                    resolved.append(obj)
-            if missing:
-                self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' contém itens inexistentes: {missing}. Ignorados.")
+                resolved.append(obj)
+        if missing:
+            self._log_warn(f"Playlist '{self._get_playlist_name(pl)}' contém itens inexistentes: {missing}. Ignorados.")
 
-            self._set_playlist_items(pl, resolved)
+        self._set_playlist_items(pl, resolved)
 
     # ------------------- Criação segura de objetos -------------------
     def _make_usuario(self, nome):
-        try:
-            return Usuario(nome)
-        except TypeError:
-            # Caso sua classe exija mais args, tente variações simples aqui
-            return Usuario(nome=nome)
+        fn = self._bindings["new_usuario"].get(Usuario) or self._bind("new_usuario", Usuario)
+        return fn(nome)
 
     def _make_musica(self, titulo, artista, genero, duracao):
         return Musica(
                 titulo=titulo, 
                 duracao=duracao, 
                 artista=artista, 
-                genero=genero)
+                genero=genero,
+                catalogo=self.catalogo)
 
     def _make_podcast(self, titulo, duracao, artista, episodio, temporada, host):
         return Podcast(
@@ -314,32 +892,13 @@ class LerMarkdown:
             artista=artista,
             episodio=episodio,
             temporada=temporada,
-            host=host
+            host=host,
+            catalogo=self.catalogo
         )
 
     def _make_playlist(self, nome, usuario_nome, itens_titles):
-        """
-        Tenta múltiplas assinaturas:
-        1) Playlist(nome, usuario_nome, itens_titles)
-        2) Playlist(nome, usuario_nome)
-        3) Playlist(nome=..., usuario=..., itens=...)
-        """
-        # tentativa 1
-        try:
-            return Playlist(nome, usuario_nome, itens_titles)
-        except TypeError:
-            pass
-        # tentativa 2
-        try:
-            return Playlist(nome, usuario_nome)
-        except TypeError:
-            pass
-        # tentativa 3 (nomeados)
-        try:
-            return Playlist(nome=nome, usuario=usuario_nome, itens=itens_titles)
-        except TypeError:
-            # último recurso: nome + usuario nomeado
-            return Playlist(nome=nome, usuario=usuario_nome)
+        fn = self._bindings["new_playlist"].get(Playlist) or self._bind("new_playlist", Playlist)
+        return fn(nome, usuario_nome, itens_titles)
 
     # ------------------- Operações robustas de Playlist/Usuario -------------------
     def _get_playlist_owner_name(self, pl):
@@ -378,76 +937,130 @@ class LerMarkdown:
 
     def _set_playlist_items(self, pl, objetos):
         """
-        Define os itens resolvidos na playlist tentando:
-        - método adicionar_item / add_item por elemento
-        - método adicionar_itens / set_itens em lote
-        - atributo lista 'itens' / 'midias'
+        Define os itens resolvidos na playlist (estratégia em _bind_set_items).
         Além disso, guarda títulos originais do MD em pl._titulos_md (para depuração).
         """
         # preserva títulos originais para debug
-        orig = getattr(pl, "_titulos_md", None)
-        if orig is None:
+        if getattr(pl, "_titulos_md", None) is None:
             # melhor esforço de descobrir títulos originais
             setattr(pl, "_titulos_md", [getattr(o, "titulo", "") for o in objetos])
+        fn = self._bindings["set_items"].get(type(pl)) or self._bind("set_items", type(pl), pl)
+        fn(pl, objetos)
 
-        # métodos de adição unitária
-        if hasattr(pl, "adicionar_item"):
-            for o in objetos:
-                try:
-                    pl.adicionar_item(o)
-                except Exception:
-                    pass
-            return
+    def _attach_playlist_to_user(self, user_obj, playlist_obj):
+        """Acopla a playlist ao usuário (estratégia em _bind_attach)."""
+        fn = self._bindings["attach"].get(type(user_obj)) or self._bind("attach", type(user_obj), user_obj)
+        fn(user_obj, playlist_obj)
 
-        if hasattr(pl, "add_item"):
-            for o in objetos:
-                try:
-                    pl.add_item(o)
-                except Exception:
-                    pass
-            return
+    def _detach_playlist_from_user(self, user_obj, playlist_obj):
+        """Desacopla a playlist do usuário (atributo lista), pela identidade do objeto."""
+        aname = self._bind("user_list", type(user_obj), user_obj)
+        lst = getattr(user_obj, aname, None) if aname else None
+        if isinstance(lst, list):
+            for i, p in enumerate(lst):
+                if p is playlist_obj:
+                    del lst[i]
+                    break
+
+    # ------------------- Vínculos por classe (resolvidos uma vez) -------------------
+    # As operações acima aceitam classes de formatos diferentes (assinaturas,
+    # métodos e atributos variados). Em vez de sondar cada objeto com hasattr e
+    # try/except, a estratégia é escolhida na primeira vez que a classe aparece
+    # (pela assinatura do construtor e pelos atributos do primeiro objeto) e
+    # reaproveitada para todos os outros: self._bindings[operação][classe].
+    def _bind(self, op, cls, obj=None):
+        """Resolve (uma vez) e retorna a estratégia da operação para a classe; obj é uma instância."""
+        por_classe = self._bindings[op]
+        if cls not in por_classe:
+            por_classe[cls] = getattr(self, "_bind_" + op)(cls, obj)
+        return por_classe[cls]
+
+    @staticmethod
+    def _accepts(cls, *args, **kwargs):
+        """True se o construtor da classe aceita os argumentos (sem instanciar)."""
+        try:
+            inspect.signature(cls).bind(*args, **kwargs)
+            return True
+        except (TypeError, ValueError):
+            return False
+
+    def _bind_new_usuario(self, cls, _):
+        # Usuario(nome) ou Usuario(nome=...)
+        if self._accepts(cls, "nome") or not self._accepts(cls, nome="nome"):
+            return cls
+        return lambda nome: cls(nome=nome)
+
+    def _bind_new_playlist(self, cls, _):
+        """
+        Primeira assinatura aceita:
+        1) Playlist(nome, usuario_nome, itens_titles)
+        2) Playlist(nome, usuario_nome)
+        3) Playlist(nome=..., usuario=..., itens=...)
+        4) Playlist(nome=..., usuario=...)
+        """
+        if self._accepts(cls, "nome", "usuario", []):
+            return cls
+        if self._accepts(cls, "nome", "usuario"):
+            return lambda nome, usuario, itens: cls(nome, usuario)
+        if self._accepts(cls, nome="nome", usuario="usuario", itens=[]):
+            return lambda nome, usuario, itens: cls(nome=nome, usuario=usuario, itens=itens)
+        return lambda nome, usuario, itens: cls(nome=nome, usuario=usuario)
+
+    def _bind_set_items(self, cls, pl):
+        """
+        Estratégia, na ordem:
+        - método adicionar_item / add_item por elemento
+        - método adicionar_itens / set_itens / set_midias em lote
+        - atributo lista 'itens' / 'midias'
+        - __dict__ direto
+        """
+        for mname in ("adicionar_item", "add_item"):
+            metodo = getattr(cls, mname, None)
+            if callable(metodo):
+                def add_each(pl, objetos, metodo=metodo):
+                    for o in objetos:
+                        try:
+                            metodo(pl, o)
+                        except Exception:
+                            pass
+                return add_each
 
-        # métodos/lotes
         for mname in ("adicionar_itens", "set_itens", "set_midias"):
-            if hasattr(pl, mname):
-                try:
-                    getattr(pl, mname)(objetos)
-                    return
-                except Exception:
-                    pass
-
-        # atributos mutáveis
+            metodo = getattr(cls, mname, None)
+            if callable(metodo):
+                return metodo
+
         for aname in ("itens", "midias"):
             if hasattr(pl, aname):
-                try:
-                    setattr(pl, aname, list(objetos))
-                    return
-                except Exception:
-                    pass
+                return lambda pl, objetos: setattr(pl, aname, list(objetos))
 
-        # se nada funcionou, tente __dict__ direto
-        try:
-            pl.__dict__["itens"] = list(objetos)
-        except Exception:
-            self._log_warn(f"Não foi possível anexar itens na playlist '{self._get_playlist_name(pl)}' (adicione um método add/adicionar_itens na sua classe).")
+        if hasattr(pl, "__dict__"):
+            return lambda pl, objetos: pl.__dict__.__setitem__("itens", list(objetos))
+        return lambda pl, objetos: self._log_warn(f"Não foi possível anexar itens na playlist '{self._get_playlist_name(pl)}' (adicione um método add/adicionar_itens na sua classe).")
 
-    def _attach_playlist_to_user(self, user_obj, playlist_obj):
-        """Acopla a playlist ao usuário, tentando os métodos/atributos mais comuns."""
+    def _bind_user_list(self, cls, user_obj):
+        """Nome do atributo lista de playlists do usuário (ou None)."""
+        for aname in ("playlists", "listas", "colecoes"):
+            if isinstance(getattr(user_obj, aname, None), list):
+                return aname
+        return None
+
+    def _bind_attach(self, cls, user_obj):
         # método
         for mname in ("adicionar_playlist", "add_playlist", "registrar_playlist"):
-            if hasattr(user_obj, mname):
-                try:
-                    getattr(user_obj, mname)(playlist_obj)
-                    return
-                except Exception:
-                    pass
+            metodo = getattr(cls, mname, None)
+            if callable(metodo):
+                return metodo
         # atributo lista
-        for aname in ("playlists", "listas", "colecoes"):
-            lst = getattr(user_obj, aname, None)
-            if isinstance(lst, list):
-                if playlist_obj not in lst:
-                    lst.append(playlist_obj)
-                return
+        aname = self._bind("user_list", cls, user_obj)
+        if aname is None:
+            return lambda user_obj, playlist_obj: None
+
+        def append(user_obj, playlist_obj):
+            lst = getattr(user_obj, aname)
+            if playlist_obj not in lst:
+                lst.append(playlist_obj)
+        return append
 
     # ------------------- Utilidades -------------------
     def _to_int(self, value, default=None):
@@ -464,29 +1077,44 @@ class LerMarkdown:
             msg = f"{msg} | Registro: {record}"
         self.errors.append(msg)
 
-    def _flush_logs_to_file(self, source: str):
-        if not self.warnings and not self.errors:
-            return
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        lines = [f"[{now}] Fonte: {source}"]
-        if self.warnings:
-            lines.append("WARNINGS:")
-            lines.extend(f" - {w}" for w in self.warnings)
-        if self.errors:
-            lines.append("ERRORS:")
-            lines.extend(f" - {e}" for e in self.errors)
-        lines.append("")  # quebra de linha final
-        existing = self._log_file.exists()
-        with self._log_file.open("a", encoding="utf-8") as f:
-            if not existing:
-                f.write("# Log de erros/avisos do parser Markdown\n\n")
-            f.write("\n".join(lines))
+    def _flush_logs_to_file(self, source: str, warnings=None, errors=None):
+        # Entrega os avisos/erros ao log ativo (um item da fila por nível; a
+        # gravação, a rotação e o limite de repetições ficam com o RegistroErros)
+        warnings = self.warnings if warnings is None else warnings
+        errors = self.errors if errors is None else errors
+        if warnings:
+            RegistroErros.ativo.registrar_varias(warnings, "AVISO", source)
+        if errors:
+            RegistroErros.ativo.registrar_varias(errors, "ERRO", source)
+
+# ------------------- Importação em lote (processos) -------------------
+def _parse_shard(task):
+    """
+    Executado em um processo do pool: lê e valida um arquivo .md.
+    Retorna (fonte, [(tipo, tupla), ...], warnings, errors), sem instanciar objetos.
+    """
+    path_md, strict = task
+    leitor = LerMarkdown(strict=strict)
+    records = []
+    with open(path_md, encoding="utf-8") as f:
+        for section, record in leitor._records(f):
+            kind = leitor._section_kind(section)
+            if kind is None:
+                continue
+            data = leitor._validate_record(kind, record)
+            if data is not None:
+                records.append((kind, data))
+    return path_md, records, leitor.warnings, leitor.errors
+
 
 # ------------------- Execução direta (opcional p/ teste rápido) -------------------
 if __name__ == "__main__":
     leitor = LerMarkdown(strict=False)
     # se nenhum argumento, tenta um dos exemplos na pasta config
+    # --lote: importa todos os arquivos juntos, em paralelo (from_files)
     args = sys.argv[1:]
+    lote = "--lote" in args
+    args = [a for a in args if a != "--lote"]
     if not args:
         candidatos = [
             Path(__file__).parent / "Exemplo Entrada - 1.md",
@@ -501,9 +1129,20 @@ if __name__ == "__main__":
     else:
         arquivos = [ (Path(__file__).parent / a) for a in args ]
 
+    if lote:
+        print(f"\n=== Lendo em lote: {len(arquivos)} arquivos ===")
+        result = leitor.from_files(arquivos)
+        print(f"Usuarios:  {len(result['usuarios'])}")
+        print(f"Musicas:   {len(result['musicas'])}")
+        print(f"Podcasts:  {len(result['podcasts'])}")
+        print(f"Playlists: {len(result['playlists'])}")
+        for shard in result["shards"]:
+            print(f" - {Path(shard['fonte']).name}: {len(shard['warnings'])} warnings, {len(shard['errors'])} errors")
+        sys.exit(0)
+
     for arq in arquivos:
         print(f"\n=== Lendo: {arq.name} ===")
-        result = leitor.from_file(arq.name)
+        result = leitor.from_file(arq.name, cache=True)
         print(f"Usuarios:  {len(result['usuarios'])}")
         print(f"Musicas:   {len(result['musicas'])}")
         print(f"Podcasts:  {len(result['podcasts'])}")
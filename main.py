@@ -1,30 +1,255 @@
 # main.py
+import argparse
+import asyncio
+import threading
+import time
 from pathlib import Path
 
 # Importações da classes do pacote
 from Streaming.menu import Menu
-from Streaming.usuarios import Usuario
+from Streaming.usuario import Usuario
 from Streaming.arquivo_midia import ArquivoDeMidia
 from Streaming.arquivo_midia import Musica
 from Streaming.arquivo_midia import Podcast
 from Streaming.playlist import Playlist
 from Streaming.analises import Analises
+from Streaming.catalogo import CatalogoMidia
+from Streaming.eventos import BarramentoEventos, USUARIO_ADICIONADO, PLAYLIST_ADICIONADA, PLAYLIST_SUBSTITUIDA
+from Streaming.metricas import MetricasIncrementais
+from Streaming.observador import ObservadorCatalogo
+from Streaming.persistencia import PersistenciaSQLite
+from Streaming.diario import DiarioReproducoes
+from Streaming.reprodutor import ReprodutorAssincrono
+from Streaming.servidor import ServidorSessoes
+from Streaming.saida import Saida, SaidaConsole, SaidaEstruturada, SaidaSilenciosa
+from Streaming.registro_erros import RegistroErros
+from config.lermarkdown import LerMarkdown
 
 
 # Controlador do APP (local de toda a regra de negócio)
 class StreamingApp:
-    def __init__(self):
+    def __init__(self, colunar: bool = False, banco=None, diario=None, saida: Saida = None):
         self.usuarios: list[Usuario] = []
         self.musicas: list[Musica] = []
         self.podcasts: list[Podcast] = []
         self.playlists: list[Playlist] = []
+        # Catálogo de mídias do app: passa a ser o catálogo ativo, onde as novas
+        # mídias são cadastradas; guarda só referências fracas (as listas acima
+        # é que mantêm as mídias vivas)
+        self.catalogo = CatalogoMidia()
+        ArquivoDeMidia.usar_catalogo(self.catalogo)
+        # Índice de busca por prefixo/substring (sugestões quando o título não é exato)
+        self.busca = self.catalogo.ativar_busca()
+        # Colunas opcionais para relatórios vetorizados em catálogos grandes
+        self.colunas = self.catalogo.ativar_colunas(Musica) if colunar else None
+        # Placar das músicas mais reproduzidas, atualizado a cada reprodução
+        self.ranking = self.catalogo.ativar_ranking(Musica)
+        # Barramento de eventos do app e métricas do relatório mantidas por ele
+        self.eventos = BarramentoEventos()
+        BarramentoEventos.usar(self.eventos)
+        self.metricas = MetricasIncrementais(self.eventos, self.ranking)
+        # Saída das mensagens do modelo (reproduzindo, mídia adicionada...): console
+        # em lotes por padrão; SaidaSilenciosa para cargas/servidor, SaidaEstruturada (JSON)
+        self.saida = saida or SaidaConsole()
+        Saida.usar(self.saida)
+        # Persistência opcional em SQLite (arquivo .db): o estado sobrevive ao fim do
+        # programa e as listagens/buscas passam a ler do banco, sob demanda
+        self.banco = PersistenciaSQLite(banco, self.eventos, self.catalogo) if banco else None
+        # Diário opcional (pasta) com cada reprodução: quem ouviu, o quê, de qual playlist e quando
+        self.diario = DiarioReproducoes(diario, self.eventos) if diario else None
+        # Recarga ao vivo dos catálogos .md (ver iniciar_observador): a trava
+        # separa a troca do catálogo dos comandos do loop interativo
+        self.trava = threading.RLock()
+        self.observador = None
+        self._leitores = {}      # caminho do .md -> LerMarkdown (reimportação incremental)
+        self._fontes = {}        # caminho do .md -> último resultado do leitor
+        self._ids_fontes = set() # id() dos objetos vindos dos .md (o resto foi criado no app)
+        self.pausas = {"comandos": 0, "total_ms": 0.0, "max_ms": 0.0}   # espera do loop pela trava
+        # Playlists tocam em segundo plano (loop asyncio numa thread, iniciada no
+        # primeiro pedido); contadores e eventos das reproduções respeitam a trava
+        self.reprodutor = ReprodutorAssincrono(trava=self.trava)
 
     # Método para criar um novo usuário e adicioná-lo à lista
     def criar_novo_usuario(self, nome: str) -> Usuario:
         u = Usuario(nome)
         self.usuarios.append(u)
+        self.eventos.publicar(USUARIO_ADICIONADO, u)
         return u
 
+    # Métodos para manter a lista de playlists (e avisar as métricas)
+    def adicionar_playlist(self, pl: Playlist) -> None:
+        self.playlists.append(pl)
+        self.eventos.publicar(PLAYLIST_ADICIONADA, pl)
+
+    def substituir_playlist(self, antiga: Playlist, nova: Playlist) -> None:
+        """Coloca a nova playlist no lugar da antiga (mesma posição da lista)."""
+        self.playlists = [p if p is not antiga else nova for p in self.playlists]
+        self.eventos.publicar(PLAYLIST_SUBSTITUIDA, antiga, nova)
+
+    # Métodos de recarga ao vivo do catálogo
+    def iniciar_observador(self, pasta: Path = Path("config"), intervalo: float = 0.5) -> ObservadorCatalogo:
+        """
+        Carrega os .md da pasta e passa a recarregá-los (numa thread) sempre que
+        forem alterados, criados ou apagados, sem reiniciar o app.
+        """
+        self.observador = ObservadorCatalogo(pasta, self.preparar_recarga, self.aplicar_recarga,
+                                             trava=self.trava, intervalo=intervalo)
+        self.observador.verificar()   # primeira varredura: só registra os arquivos
+        self.observador.verificar()   # segunda: carrega os que estão estáveis
+        return self.observador.iniciar()
+
+    def preparar_recarga(self, caminho: Path):
+        """Fase sem trava: lê e valida o .md (não mexe no estado do app)."""
+        leitor = self._leitores.get(caminho)
+        if leitor is None:
+            leitor = self._leitores[caminho] = LerMarkdown(catalogo=self.catalogo)
+        return leitor.prepare_reimport(str(caminho))
+
+    def aplicar_recarga(self, caminho: Path, lido) -> dict:
+        """Fase com a trava: aplica a diferença lida e troca as coleções do app."""
+        if lido is None:   # arquivo apagado
+            leitor = self._leitores.pop(caminho, None)
+            diff = leitor.unload_reimport() if leitor is not None else None
+            self._fontes.pop(caminho, None)
+        else:
+            resultado = self._leitores[caminho].apply_reimport(lido)
+            diff = resultado["diff"]
+            self._fontes[caminho] = resultado
+        self._trocar_colecoes()
+        return diff
+
+    def _trocar_colecoes(self) -> None:
+        """
+        Remonta usuarios/musicas/podcasts/playlists: primeiro os objetos dos .md
+        (arquivos em ordem de nome; usuário/título repetido vale o do primeiro
+        arquivo), depois os criados no app. As listas são alteradas no lugar,
+        então quem guardou uma referência a elas continua vendo o catálogo atual.
+        """
+        colecoes = {"usuarios": self.usuarios, "musicas": self.musicas,
+                    "podcasts": self.podcasts, "playlists": self.playlists}
+        chaves = {"usuarios": lambda u: u.nome, "musicas": lambda m: m.titulo, "podcasts": lambda p: p.titulo}
+        ids = set()
+        for nome, lista in colecoes.items():
+            proprios = [x for x in lista if id(x) not in self._ids_fontes]
+            chave = chaves.get(nome)
+            vistos = set()
+            novos = []
+            for caminho in sorted(self._fontes):
+                for x in self._fontes[caminho][nome]:
+                    if chave is not None:
+                        if chave(x) in vistos:
+                            continue
+                        vistos.add(chave(x))
+                    novos.append(x)
+            ids.update(map(id, novos))
+            lista[:] = novos + proprios
+        self._ids_fontes = ids
+        self.metricas.recalcular(self.usuarios, self.playlists, self.musicas)
+        if self.banco is not None:
+            self.banco.salvar_colecoes(self.usuarios, self.musicas + self.podcasts, self.playlists)
+            self.banco.gravar()
+
+    def ocupar(self) -> None:
+        """
+        Chamado pelo loop antes da parte de um comando que lê ou altera o estado
+        (depois das perguntas ao usuário): espera uma troca em andamento.
+        """
+        t0 = time.perf_counter()
+        self.trava.acquire()
+        espera = (time.perf_counter() - t0) * 1000
+        self.pausas["comandos"] += 1
+        self.pausas["total_ms"] += espera
+        self.pausas["max_ms"] = max(self.pausas["max_ms"], espera)
+
+    def liberar(self) -> None:
+        """Chamado pelo loop ao terminar essa parte do comando (sem efeito se não estava ocupado)."""
+        self.saida.descarregar()
+        try:
+            self.trava.release()
+        except RuntimeError:
+            pass
+
+    def relatar_recargas(self) -> int:
+        """Mostra as recargas feitas pelo observador desde a última chamada e retorna quantas foram."""
+        if self.observador is None:
+            return 0
+        recargas = self.observador.recargas()
+        for r in recargas:
+            if r["erro"]:
+                print(f"[catálogo] {r['arquivo']}: recarga falhou ({r['erro']}); mantido o catálogo anterior.")
+                continue
+            print(f"[catálogo] {r['arquivo']} recarregado: {r['resumo']} | "
+                  f"leitura {r['leitura_ms']:.1f} ms, troca {r['aplicacao_ms']:.1f} ms"
+                  + (f", latência {r['latencia_ms']:.0f} ms" if "latencia_ms" in r else "")
+                  + f" | pausa máx. do menu: {self.pausas['max_ms']:.1f} ms")
+        return len(recargas)
+
+    # Métodos de consulta (das listas ou, com banco, do banco sob demanda)
+    def iterar(self, colecao: str):
+        """Percorre 'usuarios', 'musicas', 'podcasts' ou 'playlists'."""
+        if self.banco is None:
+            return iter(getattr(self, colecao))
+        if colecao == "usuarios":
+            return self.banco.iterar_usuarios()
+        if colecao == "playlists":
+            return self.banco.iterar_playlists()
+        return self.banco.iterar_midias({"musicas": "musica", "podcasts": "podcast"}[colecao])
+
+    def nomes_usuarios(self) -> list:
+        if self.banco is not None:
+            return list(self.banco.nomes_usuarios())
+        return [u.nome for u in self.usuarios]
+
+    def obter_usuario(self, nome: str):
+        """Usuário com o nome ou None."""
+        if self.banco is not None:
+            return self.banco.buscar_usuario(nome)
+        return next((u for u in self.usuarios if u.nome == nome), None)
+
+    def buscar_playlist(self, nome: str):
+        """Primeira playlist com o nome ou None."""
+        if self.banco is not None:
+            return self.banco.buscar_playlist(nome)
+        return next((p for p in self.playlists if p.nome == nome), None)
+
+    def usuario_removido(self, usuario) -> bool:
+        """True se uma recarga do catálogo tirou o usuário do app (o banco não perde usuários)."""
+        return self.banco is None and all(u is not usuario for u in self.usuarios)
+
+    def gerar_relatorio(self) -> Path:
+        """Gera o relatório de análises e retorna o caminho do arquivo."""
+        if self.banco is not None:
+            # Uma passada por cada tabela do banco (sem carregar tudo na memória)
+            return Analises.salvar_relatorio(
+                musicas=self.banco.iterar_midias("musica"),
+                playlists=self.banco.iterar_playlists(),
+                usuarios=self.banco.iterar_usuarios(),
+                top_n=10,
+                pasta="Relatório",
+                arquivo="relatorio.txt",
+            )
+        return Analises.salvar_relatorio(
+            musicas=self.colunas if self.colunas is not None else self.musicas,
+            playlists=self.playlists,
+            usuarios=self.usuarios,
+            top_n=10,
+            pasta="Relatório",
+            arquivo="relatorio.txt",
+            ranking=self.ranking,
+            metricas=self.metricas,
+        )
+
+    def encerrar(self) -> None:
+        """Para o reprodutor e o observador, fecha o diário e grava/fecha o banco."""
+        self.reprodutor.parar(espera=1)
+        if self.observador is not None:
+            self.observador.parar(espera=1)
+        if self.diario is not None:
+            self.diario.fechar()
+        if self.banco is not None:
+            self.banco.fechar()
+        self.saida.descarregar()
+
     def salvar_relatorio_txt(self, caminho: Path = Path("relatorios/relatorio.txt")):
         linhas = []
         linhas.append("Relatório do Streaming")
@@ -44,20 +269,50 @@ class StreamingApp:
         caminho.write_text("\n".join(linhas), encoding="utf-8")
         print("Relatório salvo em relatorios/relatorio.txt")
 
+# Saídas de mensagens escolhidas por --saida
+SAIDAS = {"console": SaidaConsole, "silenciosa": SaidaSilenciosa, "json": SaidaEstruturada}
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Streaming de músicas e podcasts")
+    parser.add_argument("pasta", nargs="?", help="pasta de catálogos .md, recarregados ao vivo")
+    parser.add_argument("--banco", help="arquivo SQLite onde o estado do app é guardado")
+    parser.add_argument("--diario", help="pasta do diário de reproduções")
+    parser.add_argument("--servidor", metavar="[HOST:]PORTA",
+                        help="modo servidor: sessões de vários usuários por TCP (linhas JSON) em vez do menu")
+    parser.add_argument("--saida", choices=sorted(SAIDAS), default="console",
+                        help="mensagens do modelo: console (em lotes), silenciosa ou json (uma linha por evento)")
+    parser.add_argument("--log", help="arquivo do log de erros (padrão: logs/erros.log)")
+    args = parser.parse_args()
+
+    if args.log:
+        RegistroErros.usar(RegistroErros(args.log))
+
     menu = Menu()
-    app = StreamingApp()
+    app = StreamingApp(banco=args.banco, diario=args.diario, saida=SAIDAS[args.saida]())
+    if args.pasta:
+        app.iniciar_observador(Path(args.pasta))
+
+    if args.servidor:
+        servir(app, args.servidor)
+        return
 
     # # (opcional) dados de exemplo para testar rápido
     # app.musicas.append(Musica("Song A", 180, "Artist X"))
     # app.musicas.append(Musica("Song B", 200, "Artist Y"))
     # app.podcasts.append(Podcast("Pod 1", 1200, "Host Z"))
 
-    # Para manter a compatibilidade com fluxo atual
-    usuarios = app.usuarios          
     usuario_logado: Usuario | None = None
 
+    # A trava só é tomada (app.ocupar) depois das perguntas de cada comando: enquanto
+    # o usuário digita, o observador do catálogo e o servidor de sessões seguem livres
     while True:
+        # Fim do comando anterior: libera a troca do catálogo e mostra as recargas
+        app.liberar()
+        if app.relatar_recargas() and usuario_logado and app.usuario_removido(usuario_logado):
+            print(f"Usuário '{usuario_logado.nome}' saiu do catálogo; faça login novamente.")
+            usuario_logado = None
+
         if not usuario_logado:
             # Manipulação do menu inicial: menu.py exibe; main.py controla
             opcao = menu.exibir_menu_inicial()
@@ -65,20 +320,28 @@ def main():
             match opcao:
                 # "1": "Fazer login":
                 case "1":
-                    if not usuarios:
+                    app.ocupar()
+                    nomes = app.nomes_usuarios()
+                    app.liberar()
+                    if not nomes:
                         print("Nenhum usuário cadastrado. Crie um novo usuário primeiro.")
                     else:
                         print("Usuários disponíveis:")
-                        for i, u in enumerate(usuarios, start=1):
-                            print(f"{i} - {u.nome}")
+                        for i, nome in enumerate(nomes, start=1):
+                            print(f"{i} - {nome}")
                         try:
                             escolha = int(input("Digite o número do usuário: "))
                         except ValueError:
                             print("Entrada inválida. Digite apenas números.")
                             continue
-                        if 1 <= escolha <= len(usuarios):
-                            usuario_logado = usuarios[escolha - 1]
-                            print(f"Usuário '{usuario_logado.nome}' logado com sucesso!")
+                        if 1 <= escolha <= len(nomes):
+                            app.ocupar()
+                            usuario_logado = app.obter_usuario(nomes[escolha - 1])
+                            if usuario_logado:
+                                print(f"Usuário '{usuario_logado.nome}' logado com sucesso!")
+                            else:
+                                # saiu do catálogo (recarga) enquanto o número era digitado
+                                print("Usuário não encontrado.")
                         else:
                             print("Opção inválida.")
 
@@ -86,6 +349,7 @@ def main():
                 case "2":
                     novo_nome = input("Digite o nome do novo usuário: ").strip()
                     if novo_nome:
+                        app.ocupar()
                         u = app.criar_novo_usuario(novo_nome)
                         print(f"Usuário '{u.nome}' criado com sucesso!")
                     else:
@@ -93,16 +357,20 @@ def main():
 
                 # "3": "Listar usuários":
                 case "3":
-                    if not usuarios:
+                    app.ocupar()
+                    nomes = app.nomes_usuarios()
+                    if not nomes:
                         print("Nenhum usuário cadastrado.")
                     else:
                         print("=== LISTA DE USUÁRIOS ===")
-                        for u in usuarios:
-                            print("-", u.nome)
+                        for nome in nomes:
+                            print("-", nome)
 
                 # "4": "Sair do sistema":
                 case "4":
                     print("Saindo do sistema...")
+                    app.liberar()
+                    app.encerrar()
                     return
 
                 case _:
@@ -116,41 +384,57 @@ def main():
                 # "1": "Reproduzir uma música":
                 case "1":
                     titulo = input("Título da música a reproduzir: ").strip()
-                    midia = ArquivoDeMidia.buscar_por_titulo(titulo)
+                    app.ocupar()
+                    midia = app.catalogo.buscar(titulo)
                     if midia:
-                        midia.reproduzir()
+                        midia.reproduzir(usuario_logado)
                     else:
                         print("Música não encontrada.")
+                        # Sugere as mídias mais ouvidas que contêm o texto digitado
+                        sugestoes = app.busca.buscar(titulo, k=5)
+                        if sugestoes:
+                            print("Você quis dizer:")
+                            for m in sugestoes:
+                                print(f"  - {m.titulo} ({m.artista})")
 
                 # "2": "Listar músicas":
                 case "2":
-                    if not app.musicas:
+                    app.ocupar()
+                    vazia = True
+                    for m in app.iterar("musicas"):
+                        if vazia:
+                            print("\nMÚSICAS:")
+                            vazia = False
+                        # Usa o toString __str__ de Musica
+                        print(m)
+                    if vazia:
                         print("Nenhuma música cadastrada.")
-                    else:
-                        print("\nMÚSICAS:")
-                        for m in app.musicas:
-                            # Usa o toString __str__ de Musica
-                            print(m)
 
                 # "3": "Listar podcasts":
                 case "3":
-                    if not app.podcasts:
+                    app.ocupar()
+                    vazia = True
+                    for p in app.iterar("podcasts"):
+                        if vazia:
+                            print("\nPODCASTS:")
+                            vazia = False
+                        # Usa o toString __str__ de Podcast
+                        print(p)
+                    if vazia:
                         print("Nenhum podcast cadastrado.")
-                    else:
-                        print("\nPODCASTS:")
-                        for p in app.podcasts:
-                            # Usa o toString __str__ de Podcast
-                            print(p)
 
                 # "4": "Listar playlists":
                 case "4":
-                    if not app.playlists:
+                    app.ocupar()
+                    vazia = True
+                    for pl in app.iterar("playlists"):
+                        if vazia:
+                            print("\nPLAYLISTS:")
+                            vazia = False
+                        # Usa o toString __str__ de Playlist
+                        print(pl)
+                    if vazia:
                         print("Nenhuma playlist cadastrada.")
-                    else:
-                        print("\nPLAYLISTS:")
-                        for pl in app.playlists:
-                            # Usa o toString __str__ de Playlist
-                            print(pl)
 
                 # "5": "Reproduzir uma playlist":
                 case "5":
@@ -161,11 +445,16 @@ def main():
                             print("Nome inválido.")
                             continue
                     
-                    pl = next((p for p in app.playlists if p.nome == nome_pl), None)
+                    app.ocupar()
+                    pl = app.buscar_playlist(nome_pl)
                     
                     if pl:
-                        print(f"Reproduzindo playlist '{pl.nome}':")
-                        pl.reproduzir()   # chama o método da classe Playlist
+                        # Entra na fila do usuário e toca em segundo plano (o menu continua livre)
+                        try:
+                            app.reprodutor.enfileirar(usuario_logado, pl)
+                            print(f"Playlist '{pl.nome}' na fila de reprodução (opção 10 para controlar).")
+                        except TimeoutError as e:
+                            print(f"{e} Tente novamente.")
                     else:
                         print("Playlist não encontrada.")
 
@@ -177,32 +466,37 @@ def main():
                             continue
 
                         # Chama o construtor da playlist
+                        app.ocupar()
                         pl = Playlist(nome, usuario_logado)
-                        app.playlists.append(pl)
+                        app.adicionar_playlist(pl)
                         print(f"Playlist '{pl.nome}' criada.")
+                        app.liberar()
 
                         add = input("Adicionar uma mídia agora? (s/N) ").strip().lower()
                         if add == "s":
                             titulo = input("Título exato da música/podcast: ").strip()
                             # Chama o método adicionar_midia_da_playlist
+                            app.ocupar()
                             pl.adicionar_midia(titulo) 
+                            app.saida.descarregar()
 
                 # "7": "Concatenar playlists":
                 case "7":
                     # Solicita os nomes das playlists
                     destino = input("Playlist 1 destino: ").strip()
                     juntar = input("Playlist 2 a ser juntada: ").strip()
+                    app.ocupar()
 
                     # Encontra as playlists pelos nomes
-                    p1_destino = next((p for p in app.playlists if p.nome == destino), None)
-                    p2_juntar  = next((p for p in app.playlists if p.nome == juntar), None)
+                    p1_destino = app.buscar_playlist(destino)
+                    p2_juntar  = app.buscar_playlist(juntar)
 
                     if p1_destino and p2_juntar:
                         # Chama o método __add__ para concatenar
                         nova = p1_destino + p2_juntar
 
                         # Remove a antiga da lista e põe a nova concatenada no mesmo lugar de p1_destino
-                        app.playlists = [p if p is not p1_destino else nova for p in app.playlists]
+                        app.substituir_playlist(p1_destino, nova)
 
                         print(f"Playlists '{p1_destino.nome}' e '{p2_juntar.nome}' concatenadas em '{p1_destino.nome}'.")
                         print(f"A nova playlist tem {len(nova)} mídias.")   # usa __len__
@@ -213,16 +507,40 @@ def main():
 
                 # "8": "Gerar relatório":
                 case "8":
-                    destino = Analises.salvar_relatorio(
-                        musicas=app.musicas,
-                        playlists=app.playlists,
-                        usuarios=app.usuarios,
-                        top_n=10,               
-                        pasta="Relatório",
-                        arquivo="relatorio.txt",
-                    )
+                    app.ocupar()
+                    destino = app.gerar_relatorio()
                     print(f"Relatório salvo em {destino}")
 
+                # "10": "Controlar reprodução":
+                case "10":
+                    estado = app.reprodutor.estado(usuario_logado)
+                    if estado["midia"] is None:
+                        print("Nada tocando agora.")
+                        continue
+                    print(f"{'Pausado' if estado['pausado'] else 'Tocando'}: '{estado['midia'].titulo}' "
+                          f"({estado['posicao']:.0f}/{estado['duracao']} s) da playlist '{estado['playlist'].nome}'"
+                          f" | {estado['fila']} playlist(s) na fila")
+                    acao = input("[p]ausar, [c]ontinuar, pul[a]r, [b]uscar posição, pa[r]ar ou Enter: ").strip().lower()
+                    if acao == "b":
+                        segundo = input("Ir para o segundo: ")
+                    app.ocupar()
+                    try:
+                        if acao == "p":
+                            app.reprodutor.pausar(usuario_logado)
+                        elif acao == "c":
+                            app.reprodutor.continuar(usuario_logado)
+                        elif acao == "a":
+                            app.reprodutor.pular(usuario_logado)
+                        elif acao == "b":
+                            try:
+                                app.reprodutor.posicionar(usuario_logado, float(segundo))
+                            except ValueError:
+                                print("Entrada inválida. Digite apenas números.")
+                        elif acao == "r":
+                            app.reprodutor.interromper(usuario_logado)
+                    except TimeoutError as e:
+                        print(f"{e} Tente novamente.")
+
                 # "9": "Sair":
                 case "9":
                     print(f"👤 Usuário '{usuario_logado.nome}' saiu da conta.")
@@ -232,5 +550,30 @@ def main():
                     print("Opção inválida. Tente novamente.")
 
 
+def servir(app: StreamingApp, endereco: str) -> None:
+    """Roda o ServidorSessoes até Ctrl+C e encerra o app."""
+    host, _, porta = endereco.rpartition(":")
+    servidor = ServidorSessoes(app, host or "127.0.0.1", int(porta))
+    app.reprodutor.exibir = False   # muitos ouvintes: sem uma linha na tela por música
+    if type(app.saida) is SaidaConsole:
+        app.saida = SaidaSilenciosa()   # nem pelas playlists criadas/alteradas pelas sessões
+        Saida.usar(app.saida)
+
+    async def executar():
+        await servidor.iniciar()
+        print(f"Servidor de sessões em {servidor.host}:{servidor.porta} (Ctrl+C para sair)")
+        try:
+            await servidor.servir()
+        finally:
+            await servidor.parar()
+
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        pass
+    print(servidor)
+    app.encerrar()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,39 @@
+# tests/conftest.py
+# Testes de comportamento (pytest). Uso: python -m pytest tests
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Streaming.arquivo_midia import ArquivoDeMidia
+from Streaming.eventos import BarramentoEventos
+from Streaming.registro_erros import RegistroErros
+from Streaming.saida import Saida, SaidaSilenciosa
+
+EXEMPLO = Path(__file__).resolve().parent.parent / "config" / "Exemplo Entrada - 1.md"
+
+
+@pytest.fixture(autouse=True)
+def ambiente_isolado(tmp_path):
+    """Log de erros e saída temporários; o catálogo, o barramento e a saída ativos voltam ao fim."""
+    registro = RegistroErros(tmp_path / "erros.log")
+    log = RegistroErros.usar(registro)
+    saida = Saida.usar(SaidaSilenciosa())
+    catalogo = ArquivoDeMidia.usar_catalogo(ArquivoDeMidia.catalogo)
+    barramento = BarramentoEventos.usar(BarramentoEventos.ativo)
+    try:
+        yield registro
+    finally:
+        BarramentoEventos.usar(barramento)
+        ArquivoDeMidia.usar_catalogo(catalogo)
+        Saida.usar(saida)
+        RegistroErros.usar(log)
+        registro.fechar()
+
+
+@pytest.fixture
+def exemplo() -> str:
+    return EXEMPLO.read_text(encoding="utf-8")
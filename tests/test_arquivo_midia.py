@@ -0,0 +1,124 @@
+# tests/test_arquivo_midia.py
+# Avaliações de Musica: notas e histograma (acima de LIMITE_NOTAS) comparados com cálculos sobre a lista de notas.
+
+import random
+
+import pytest
+
+from Streaming.arquivo_midia import Musica
+
+PERCENTIS = [0, 1, 10, 25, 33.3, 50, 66.7, 75, 90, 99, 100]
+
+
+def percentil(notas: list, p: float):
+    """Menor nota com pelo menos p% das notas menores ou iguais (mesma definição de percentil_avaliacoes)."""
+    if not notas:
+        return None
+    ordenadas = sorted(notas)
+    alvo = max(1, -(-len(ordenadas) * p // 100))
+    return ordenadas[int(alvo) - 1]
+
+
+def conferir(musica: Musica, notas: list) -> None:
+    assert musica.quantidade_avaliacoes == len(notas)
+    assert musica.soma_avaliacoes == sum(notas)
+    assert musica.media_avaliacoes() == pytest.approx(sum(notas) / len(notas) if notas else 0.0)
+    assert musica.distribuicao_avaliacoes() == [notas.count(n) for n in range(6)]
+    for p in PERCENTIS:
+        assert musica.percentil_avaliacoes(p) == percentil(notas, p), p
+
+
+@pytest.fixture
+def musica():
+    return Musica("Yesterday", 125, "The Beatles", "Pop")
+
+
+def test_histograma_so_acima_do_limite(musica):
+    notas = [5, 0, 3, 3, 1, 4, 2, 5, 5, 0, 1, 2, 3, 4, 5, 1]
+    assert len(notas) == Musica.LIMITE_NOTAS
+    for nota in notas:
+        assert musica.avaliar(nota)
+    assert musica._histograma is None
+    assert list(musica.avaliacoes) == notas
+    conferir(musica, notas)
+
+    musica.avaliar(2)
+    notas.append(2)
+    assert musica._histograma is not None
+    assert list(musica.avaliacoes) == notas   # as notas continuam guardadas, na ordem
+    conferir(musica, notas)
+
+
+def test_agregados_iguais_aos_da_lista(musica):
+    aleatorio = random.Random(7)
+    notas = []
+    for tamanho in [1, 2, 3, 15, 16, 17, 40, 500]:
+        while len(notas) < tamanho:
+            nota = aleatorio.choice([0, 1, 2, 3, 4, 5, 5, 5, 4])
+            musica.avaliar(nota)
+            notas.append(nota)
+        conferir(musica, notas)
+
+
+def test_notas_invalidas_sao_ignoradas(musica, ambiente_isolado):
+    assert musica.avaliar(3)
+    assert not musica.avaliar(6) and not musica.avaliar(-1) and not musica.avaliar(2.5) and not musica.avaliar("5")
+
+    conferir(musica, [3])
+    ambiente_isolado.descarregar()
+    assert ambiente_isolado.caminho.read_text(encoding="utf-8").count("Musica.avaliar") == 4
+
+
+def test_sem_avaliacoes(musica):
+    conferir(musica, [])
+    assert len(musica.avaliacoes) == 0
+
+
+def test_sem_guardar_avaliacoes_so_o_histograma(monkeypatch, musica):
+    monkeypatch.setattr(Musica, "guardar_avaliacoes", False)
+    aleatorio = random.Random(11)
+    notas = [aleatorio.randrange(6) for _ in range(300)]
+
+    for i, nota in enumerate(notas, start=1):
+        musica.avaliar(nota)
+        if i in (1, 16, 17, 300):
+            conferir(musica, notas[:i])
+    assert musica._avaliacoes is None
+    assert list(musica.avaliacoes) == sorted(notas)   # cópia montada do histograma
+
+    # Notas passadas no construtor também viram só histograma
+    outra = Musica("Help", 140, "The Beatles", avaliacoes=[5, 1, 9, 4])
+    assert outra._avaliacoes is None
+    conferir(outra, [5, 1, 4])
+
+
+def test_descartar_avaliacoes_mantem_os_agregados(musica):
+    notas = [4, 5, 1, 1, 3]
+    for nota in notas:
+        musica.avaliar(nota)
+
+    musica.descartar_avaliacoes()
+
+    assert musica._avaliacoes is None
+    conferir(musica, notas)
+    musica.avaliar(0)
+    conferir(musica, notas + [0])
+
+
+def test_definir_distribuicao(musica):
+    musica.definir_distribuicao([1, 0, 2, 0, 0, 3])
+    assert list(musica.avaliacoes) == [0, 2, 2, 5, 5, 5] and musica._histograma is None
+    conferir(musica, [0, 2, 2, 5, 5, 5])
+
+    grande = [10, 0, 5, 7, 100, 3]
+    musica.definir_distribuicao(grande)
+    notas = [nota for nota, qtd in enumerate(grande) for _ in range(qtd)]
+    assert musica._avaliacoes is None
+    conferir(musica, notas)
+    musica.avaliar(1)
+    conferir(musica, notas + [1])
+
+    musica.definir_distribuicao([0] * 6)
+    conferir(musica, [])
+    with pytest.raises(ValueError):
+        musica.definir_distribuicao([1, 2, 3])
@@ -0,0 +1,137 @@
+# tests/test_busca.py
+# Índice de busca (prefixo/substring, top-k por reproduções) comparado com uma varredura simples.
+
+import random
+
+import pytest
+
+from Streaming.arquivo_midia import Musica, Podcast
+from Streaming.busca import normalizar_busca
+from Streaming.catalogo import CatalogoMidia
+
+PALAVRAS = ["Amor", "Ária", "Canção", "Noite", "Nova", "Mar", "Rock", "Sol", "Solidão", "Saudade",
+            "Coração", "Rio", "Ritmo", "Balada", "Bala"]
+GENEROS = ["Rock", "Pop", "Samba", "Forró", "MPB"]
+
+
+def referencia(midias, consulta: str, k: int, prefixo: bool = False, tipo=None) -> list:
+    """Reproduções das k mídias que casam, por varredura de todas (o que buscar() deve devolver)."""
+    q = normalizar_busca(consulta)
+    if not q:
+        return []
+    if prefixo or len(q) < 3:
+        casa = lambda campo: (" " + q) in " " + normalizar_busca(campo)
+    else:
+        casa = lambda campo: q in normalizar_busca(campo)
+    achadas = [m for m in midias if (tipo is None or isinstance(m, tipo)) and any(map(casa, m.campos_busca()))]
+    return sorted((m.reproducoes for m in achadas), reverse=True)[:k]
+
+
+def conferir(indice, midias, consulta: str, k: int, prefixo: bool = False, tipo=None) -> None:
+    resultado = indice.buscar(consulta, k=k, prefixo=prefixo, tipo=tipo)
+    assert [m.reproducoes for m in resultado] == referencia(midias, consulta, k, prefixo, tipo), consulta
+    assert len(set(map(id, resultado))) == len(resultado)
+    assert all(referencia([m], consulta, 1, prefixo, tipo) for m in resultado)
+
+
+def consultas(aleatorio, midias, n: int) -> list:
+    """Pedaços de títulos/artistas (com e sem acento, maiúsculas) e alguns sem resultado."""
+    saida = ["xyz", "ção", "sol", "a", "no", "bala", "  Rock  "]
+    for _ in range(n):
+        texto = aleatorio.choice(aleatorio.choice(midias).campos_busca())
+        i = aleatorio.randrange(len(texto))
+        pedaco = texto[i:i + aleatorio.randint(1, 6)]
+        saida.append(pedaco.upper() if aleatorio.random() < 0.3 else pedaco)
+    return saida
+
+
+@pytest.fixture
+def aleatorio():
+    return random.Random(2024)
+
+
+@pytest.fixture
+def catalogo_grande(aleatorio):
+    catalogo = CatalogoMidia()
+    midias = []
+    for i in range(400):
+        titulo = " ".join(aleatorio.sample(PALAVRAS, aleatorio.randint(1, 3))) + f" {i}"
+        reproducoes = aleatorio.randrange(1000)
+        if i % 5 == 0:
+            midias.append(Podcast(titulo, 1800, "CineCast", i, aleatorio.choice(PALAVRAS),
+                                  "João Oliveira", reproducoes=reproducoes, catalogo=catalogo))
+        else:
+            midias.append(Musica(titulo, 200, aleatorio.choice(PALAVRAS), aleatorio.choice(GENEROS),
+                                 reproducoes=reproducoes, catalogo=catalogo))
+    return catalogo, midias
+
+
+def test_prefixo_e_substring_iguais_a_varredura(catalogo_grande, aleatorio):
+    catalogo, midias = catalogo_grande
+    indice = catalogo.ativar_busca()
+
+    for consulta in consultas(aleatorio, midias, 150):
+        k = aleatorio.choice([1, 5, 10, 500])
+        conferir(indice, midias, consulta, k)
+        conferir(indice, midias, consulta, k, prefixo=True)
+        conferir(indice, midias, consulta, k, tipo=Podcast)
+
+
+def test_camada_delta_acompanha_reproducoes_e_cadastros(catalogo_grande, aleatorio):
+    catalogo, midias = catalogo_grande
+    indice = catalogo.ativar_busca()
+
+    # Reproduções mudam o ranking de mídias da camada principal; cadastros novos entram na delta
+    for m in aleatorio.sample(midias, 40):
+        m.incrementar_reproducoes(aleatorio.randrange(1, 2000))
+    for i in range(20):
+        midias.append(Musica(f"Saudade Nova {i}", 200, "Rio", "Samba",
+                             reproducoes=aleatorio.randrange(3000), catalogo=catalogo))
+    assert indice._delta and indice._lapides
+
+    for consulta in consultas(aleatorio, midias, 100) + ["saudade", "nova"]:
+        conferir(indice, midias, consulta, 10)
+        conferir(indice, midias, consulta, 10, prefixo=True)
+
+
+def test_remocao_e_alteracao_de_texto(catalogo_grande, aleatorio):
+    catalogo, midias = catalogo_grande
+    indice = catalogo.ativar_busca()
+
+    for m in midias[:50]:
+        catalogo.remover(m)
+    midias = midias[50:]
+    alvo = midias[0]
+    alvo.titulo = "Zumbido Distante"
+    assert len(indice) == len(midias)
+
+    assert indice.buscar("zumbido") == [alvo]
+    for consulta in consultas(aleatorio, midias, 80):
+        conferir(indice, midias, consulta, 10)
+
+
+def test_reordenar_mantem_os_resultados(catalogo_grande, aleatorio):
+    catalogo, midias = catalogo_grande
+    indice = catalogo.ativar_busca()
+    for m in aleatorio.sample(midias, 60):
+        m.incrementar_reproducoes(aleatorio.randrange(1, 2000))
+    perguntas = consultas(aleatorio, midias, 100)
+    antes = [[id(m) for m in indice.buscar(q, k=500)] for q in perguntas]
+
+    indice.reordenar()
+
+    assert not indice._delta and not indice._lapides and len(indice) == len(midias)
+    for q, ids in zip(perguntas, antes):
+        assert sorted(id(m) for m in indice.buscar(q, k=500)) == sorted(ids)
+        conferir(indice, midias, q, 10)
+
+
+def test_limite_da_delta_dispara_reordenacao(catalogo_grande):
+    catalogo, midias = catalogo_grande
+    indice = catalogo.ativar_busca()
+    limite = max(1024, indice.LIMITE_DELTA * len(midias))
+
+    novas = [Musica(f"Extra {i}", 100, "Banda", reproducoes=i, catalogo=catalogo) for i in range(int(limite) + 1)]
+
+    assert len(indice._delta) < limite and len(indice) == len(midias) + len(novas)
+    assert [m.reproducoes for m in indice.buscar("extra", k=3)] == [len(novas) - 1, len(novas) - 2, len(novas) - 3]
@@ -0,0 +1,94 @@
+# tests/test_contadores.py
+# Contadores disputados por várias threads: nenhum incremento perdido.
+
+import gc
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.contadores import ContadorFragmentado, TravasParticionadas
+from Streaming.playlist import Playlist
+
+THREADS = 8
+POR_THREAD = 20_000
+
+
+def em_paralelo(funcao, vezes: int = POR_THREAD, threads: int = THREADS) -> None:
+    barreira = threading.Barrier(threads)
+
+    def tarefa():
+        barreira.wait()   # todas começam juntas: máxima disputa
+        for _ in range(vezes):
+            funcao()
+
+    with ThreadPoolExecutor(threads) as pool:
+        for futuro in [pool.submit(tarefa) for _ in range(threads)]:
+            futuro.result()
+
+
+def test_contagem_exata_num_pool_de_threads():
+    contador = ContadorFragmentado(5)
+
+    em_paralelo(contador.incrementar)
+
+    assert contador.valor == int(contador) == 5 + THREADS * POR_THREAD
+
+
+def test_threads_que_terminam_deixam_o_valor_na_base():
+    contador = ContadorFragmentado()
+
+    for rodada in range(5):
+        threads = [threading.Thread(target=lambda: [contador.incrementar(2) for _ in range(1000)])
+                   for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        gc.collect()
+        assert contador.valor == (rodada + 1) * 20 * 2000
+
+    # Os fragmentos das threads encerradas foram somados e descartados
+    assert contador._estado[1] == ()
+
+
+def test_definir_mantem_incrementos_de_outras_threads():
+    contador = ContadorFragmentado(100)
+    pronto, continuar = threading.Event(), threading.Event()
+
+    def tarefa():
+        contador.incrementar(7)
+        pronto.set()
+        continuar.wait(5)
+        contador.incrementar(3)
+
+    t = threading.Thread(target=tarefa)
+    t.start()
+    pronto.wait(5)
+    contador.definir(10)
+    assert contador.valor == 10
+    continuar.set()
+    t.join()
+
+    assert contador.valor == 13
+
+
+def test_reproducoes_de_playlist_e_midia_em_paralelo():
+    catalogo = CatalogoMidia()
+    musica = Musica("Yesterday", 125, "The Beatles", catalogo=catalogo)
+    playlist = Playlist("Popular", "Ana", [musica])
+
+    em_paralelo(playlist.contar_reproducao, vezes=5_000)
+    em_paralelo(musica.incrementar_reproducoes, vezes=5_000)
+
+    assert playlist.reproducoes == THREADS * 5_000
+    assert musica.reproducoes == THREADS * 5_000
+
+
+def test_travas_particionadas():
+    travas = TravasParticionadas(50)
+    objetos = [object() for _ in range(1000)]
+
+    assert len(travas) == 64
+    assert all(travas.para(o) is travas.para(o) for o in objetos)
+    assert len({id(travas.para(o)) for o in objetos}) > 32   # objetos espalhados pelas faixas
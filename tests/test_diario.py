@@ -0,0 +1,70 @@
+# tests/test_diario.py
+# Diário de reproduções: o que é gravado pelos eventos e a reconstrução com reaplicar().
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.diario import DiarioReproducoes
+from Streaming.eventos import BarramentoEventos
+from Streaming.playlist import Playlist
+from Streaming.usuario import Usuario
+
+
+def gravar_sessao(pasta):
+    """Algumas reproduções com o diário inscrito no barramento ativo; devolve catálogo, mídias e usuário."""
+    BarramentoEventos.usar(BarramentoEventos())
+    diario = DiarioReproducoes(pasta, BarramentoEventos.ativo)
+    catalogo = CatalogoMidia()
+    yesterday = Musica("Yesterday", 125, "The Beatles", "Pop", catalogo=catalogo)
+    help_ = Musica("Help", 140, "The Beatles", "Rock", catalogo=catalogo)
+    ana = Usuario("Ana")
+    yesterday.reproduzir(ana)
+    Playlist("Beatles", "Ana", [yesterday, help_]).reproduzir(ana)
+    ana.registrar_reproducao("Help")
+    diario.fechar()
+    return catalogo, yesterday, help_, ana
+
+
+def test_reaplicar_reconstroi_contadores_e_historico(tmp_path):
+    catalogo, yesterday, help_, ana = gravar_sessao(tmp_path)
+    contadores = (yesterday.reproducoes, help_.reproducoes)
+    historico = list(ana.historico)
+
+    # Estado perdido: o diário é a fonte
+    yesterday.reproducoes = help_.reproducoes = 99
+    ana.historico = []
+    resumo = DiarioReproducoes(tmp_path, BarramentoEventos()).reaplicar(catalogo, [ana])
+
+    assert (yesterday.reproducoes, help_.reproducoes) == contadores == (2, 1)
+    assert list(ana.historico) == historico == ["Help"]
+    assert resumo == {"reproducoes": 3, "historico": 1, "midias_ausentes": 0, "usuarios_ausentes": 0}
+
+
+def test_reaplicar_sem_zerar_soma_e_conta_ausentes(tmp_path):
+    catalogo, yesterday, help_, _ = gravar_sessao(tmp_path)
+    catalogo.remover(help_)
+
+    resumo = DiarioReproducoes(tmp_path, BarramentoEventos()).reaplicar(catalogo, [], zerar=False)
+
+    assert yesterday.reproducoes == 4
+    assert resumo["midias_ausentes"] == 1 and resumo["usuarios_ausentes"] == 1
+
+
+def test_registro_cortado_no_fim_e_ignorado(tmp_path):
+    catalogo, yesterday, help_, ana = gravar_sessao(tmp_path)
+    segmento = max(tmp_path.glob("*.log"), key=lambda p: p.stat().st_size)
+    segmento.write_bytes(segmento.read_bytes()[:-5])   # queda no meio da última gravação
+
+    eventos = list(DiarioReproducoes(tmp_path, BarramentoEventos()).ler())
+
+    assert [e[0] for e in eventos] == ["reproducao"] * 3
+
+
+def test_nome_longo_cortado_em_fronteira_de_caractere(tmp_path):
+    BarramentoEventos.usar(BarramentoEventos())
+    diario = DiarioReproducoes(tmp_path, BarramentoEventos.ativo)
+    Musica("a" * 0xFFFE + "é", 100, "X", catalogo=CatalogoMidia()).reproduzir()
+    diario.fechar()
+
+    (evento,) = DiarioReproducoes(tmp_path, BarramentoEventos()).ler()
+
+    assert evento[2] == ("a" * 0xFFFE, "")   # o artista não coube no nome
@@ -0,0 +1,122 @@
+# tests/test_historico.py
+# HistoricoCompacto (buffer circular + excedente em disco) comparado com uma lista de (instante, título).
+
+import gc
+import random
+from datetime import datetime
+
+import pytest
+
+from Streaming import historico
+from Streaming.historico import HistoricoCompacto, TabelaTitulos
+
+BASE = 1_700_000_000.0
+
+
+@pytest.fixture
+def tabela():
+    tabela = TabelaTitulos()
+    anterior = TabelaTitulos.usar(tabela)
+    yield tabela
+    TabelaTitulos.usar(anterior)
+
+
+@pytest.fixture
+def excedente(tmp_path, monkeypatch):
+    pasta = tmp_path / "historico"
+    monkeypatch.setattr(HistoricoCompacto, "pasta_excedente", str(pasta))
+    return pasta
+
+
+def registrar(h: HistoricoCompacto, n: int) -> list:
+    """Registra n reproduções (instantes crescentes) e devolve a referência (instante, título)."""
+    referencia = [(BASE + i * 1.5, f"Faixa {i % 37}") for i in range(n)]
+    h.extend((titulo, instante) for instante, titulo in referencia)
+    return referencia
+
+
+def como_datas(entradas) -> list:
+    return [(datetime.fromtimestamp(t), titulo) for t, titulo in entradas]
+
+
+def conferir(h: HistoricoCompacto, referencia: list) -> None:
+    titulos = [titulo for _, titulo in referencia]
+    assert len(h) == len(referencia)
+    assert list(h) == titulos
+    aleatorio = random.Random(len(referencia))
+    for _ in range(50):
+        i = aleatorio.randrange(-len(titulos), len(titulos))
+        assert h[i] == titulos[i]
+        a, b = sorted(aleatorio.randrange(len(titulos) + 1) for _ in range(2))
+        assert h[a:b] == titulos[a:b]
+    assert h[::7] == titulos[::7]
+    with pytest.raises(IndexError):
+        h[len(titulos)]
+
+
+def test_buffer_circular_guarda_as_ultimas(tabela):
+    h = HistoricoCompacto(capacidade=10)
+    referencia = registrar(h, 25)
+
+    assert h.total == 25
+    conferir(h, referencia[-10:])
+    # Títulos que saíram do buffer saem da tabela (só os 10 últimos seguem em uso)
+    assert len(tabela) == len({titulo for _, titulo in referencia[-10:]})
+
+    h.append("Nova", BASE + 100)
+    conferir(h, referencia[-9:] + [(BASE + 100, "Nova")])
+
+
+def test_excedente_vai_para_o_disco_em_blocos(tabela, excedente):
+    # Mais de dois blocos de leitura, com parte ainda pendente (não gravada)
+    n = 2 * historico._REGISTROS_POR_BLOCO + 1234
+    h = HistoricoCompacto(capacidade=100, nome="Ana")
+    referencia = registrar(h, n)
+
+    assert h._no_disco == n - 100 and h._pendente
+    assert len(list(excedente.glob("*.hist"))) == 1
+    conferir(h, referencia)
+    assert h.contagem_por_titulo() == {t: sum(1 for _, x in referencia[-100:] if x == t)
+                                       for t in {x for _, x in referencia[-100:]}}
+
+    # Sem referências ao histórico: arquivo apagado e títulos devolvidos à tabela
+    del h
+    gc.collect()
+    assert not list(excedente.glob("*.hist"))
+    assert len(tabela) == 0
+
+
+def test_pagina_mais_recentes_primeiro(excedente):
+    h = HistoricoCompacto(capacidade=30)
+    referencia = registrar(h, 205)
+    recentes = como_datas(reversed(referencia))
+
+    assert h.pagina() == recentes[:50]
+    assert h.pagina(2, 40) == recentes[80:120]
+    assert h.pagina(5, 40) == recentes[200:]
+    assert h.pagina(6, 40) == []
+
+
+def test_entre_por_intervalo_de_tempo(excedente):
+    h = HistoricoCompacto(capacidade=30)
+    referencia = registrar(h, 205)
+
+    aleatorio = random.Random(3)
+    for _ in range(40):
+        de, ate = sorted(BASE + aleatorio.uniform(-10, 320) for _ in range(2))
+        esperado = como_datas((t, x) for t, x in referencia if de <= t < ate)
+        assert h.entre(de, ate) == esperado
+        assert h.entre(datetime.fromtimestamp(de), datetime.fromtimestamp(ate)) == esperado
+    assert h.entre() == como_datas(referencia)
+    assert h.entre(BASE + 300) == como_datas((t, x) for t, x in referencia if t >= BASE + 300)
+
+
+def test_limpar(tabela, excedente):
+    h = HistoricoCompacto(capacidade=10)
+    registrar(h, 50)
+
+    h.limpar()
+
+    assert h.total == 0 and len(h) == 0 and list(h) == [] and len(tabela) == 0
+    referencia = registrar(h, 15)
+    conferir(h, referencia)
@@ -0,0 +1,118 @@
+# tests/test_importacao_paralela.py
+# Importação de vários .md (LerMarkdown.from_files) comparada com a leitura sequencial.
+
+import pytest
+
+from Streaming.catalogo import CatalogoMidia
+from config.lermarkdown import LerMarkdown
+
+SHARDS = {
+    "a.md": """# Usuários
+
+- nome: Ana
+    playlists: [Mista]
+
+# Músicas
+
+- titulo: Yesterday
+    artista: The Beatles
+    genero: Pop
+    duracao: 125
+
+- titulo: Ruim
+    artista: X
+    duracao: abc
+""",
+    "b.md": """# Músicas
+
+- titulo: Yesterday
+    artista: Outro
+    genero: Rock
+    duracao: 999
+
+- titulo: Help
+    artista: The Beatles
+    genero: Rock
+    duracao: 140
+
+# Playlists
+
+- nome: Mista
+    usuario: Ana
+    itens: [Yesterday, Help, Cinema em Debate, Inexistente]
+""",
+    "c.md": """# Usuários
+
+- nome: Ana
+    playlists: []
+
+# Podcasts
+
+- titulo: Cinema em Debate
+    temporada: CineCast
+    episodio: 42
+    host: João Oliveira
+    duracao: 1800
+""",
+}
+
+
+def estado(resultado) -> tuple:
+    usuarios = [(u.nome, [p.nome for p in u.playlists]) for u in resultado["usuarios"]]
+    midias = [(type(m).__name__, m.titulo, m.artista, m.duracao) for m in resultado["musicas"] + resultado["podcasts"]]
+    playlists = [(p.nome, p.usuario, [m.titulo for m in p.itens]) for p in resultado["playlists"]]
+    return usuarios, midias, playlists
+
+
+@pytest.fixture
+def arquivos(tmp_path) -> list:
+    caminhos = []
+    for nome, texto in SHARDS.items():
+        (tmp_path / nome).write_text(texto, encoding="utf-8")
+        caminhos.append(str(tmp_path / nome))
+    return caminhos
+
+
+@pytest.fixture
+def sequencial(tmp_path):
+    """from_file de um arquivo com os shards em ordem (a leitura que from_files deve reproduzir)."""
+    junto = tmp_path / "junto.md"
+    junto.write_text("\n".join(SHARDS.values()), encoding="utf-8")
+    return LerMarkdown(catalogo=CatalogoMidia()).from_file(str(junto))
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_equivale_a_leitura_sequencial(arquivos, sequencial, workers):
+    r = LerMarkdown(catalogo=CatalogoMidia()).from_files(arquivos, workers=workers)
+
+    assert estado(r) == estado(sequencial)
+    assert r["warnings"] == sequencial["warnings"] and r["errors"] == sequencial["errors"]
+
+
+def test_primeira_ocorrencia_e_vinculos_entre_shards(arquivos):
+    r = LerMarkdown(catalogo=CatalogoMidia()).from_files(arquivos, workers=3)
+
+    # Yesterday de a.md vale; a de b.md é descartada
+    (yesterday,) = [m for m in r["musicas"] if m.titulo == "Yesterday"]
+    assert (yesterday.artista, yesterday.duracao) == ("The Beatles", 125)
+    # Playlist de b.md com usuário de a.md e mídias de a.md, b.md e c.md
+    (mista,) = r["playlists"]
+    assert [m.titulo for m in mista.itens] == ["Yesterday", "Help", "Cinema em Debate"]
+    assert mista.itens[0] is yesterday
+    (ana,) = r["usuarios"]
+    assert ana.playlists == [mista]
+
+
+def test_avisos_por_shard(arquivos):
+    r = LerMarkdown(catalogo=CatalogoMidia()).from_files(arquivos, workers=3)
+    avisos = {s["fonte"]: s["warnings"] for s in r["shards"]}
+
+    # Avisos do próprio arquivo: os mesmos de um from_file só dele
+    sozinho = LerMarkdown(catalogo=CatalogoMidia()).from_file(arquivos[0])
+    assert avisos[arquivos[0]] == sozinho["warnings"] == ["Duração inválida para música 'Ruim': 'abc'. Ignorada (strict=False)."]
+    # Duplicatas entre arquivos: no shard onde a repetição aparece
+    assert avisos[arquivos[1]] == ["Mídia (título) duplicada 'Yesterday'. Mantendo a primeira."]
+    assert avisos[arquivos[2]] == ["Usuário duplicado 'Ana'. Mantendo o primeiro e ignorando o duplicado."]
+    # Vínculos são resolvidos uma vez, no fim: o aviso fica no total, não num shard
+    assert r["warnings"][-1] == "Playlist 'Mista' contém itens inexistentes: ['Inexistente']. Ignorados."
+    assert sum(len(a) for a in avisos.values()) == len(r["warnings"]) - 1
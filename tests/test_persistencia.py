@@ -0,0 +1,167 @@
+# tests/test_persistencia.py
+# Ida e volta pelo SQLite: o que é gravado numa execução volta, sob demanda, na seguinte.
+
+import gc
+import sqlite3
+
+from Streaming import eventos
+from Streaming.arquivo_midia import ArquivoDeMidia, Musica, Podcast
+from Streaming.catalogo import CatalogoMidia
+from Streaming.eventos import BarramentoEventos
+from Streaming.persistencia import VERSAO_ESQUEMA, PersistenciaSQLite
+from Streaming.playlist import Playlist
+from Streaming.usuario import Usuario
+
+
+def abrir(caminho):
+    barramento = BarramentoEventos()
+    BarramentoEventos.usar(barramento)
+    catalogo = CatalogoMidia()
+    return PersistenciaSQLite(caminho, barramento, catalogo), catalogo
+
+
+def gravar_execucao(caminho) -> None:
+    banco, catalogo = abrir(caminho)
+    queen = Musica("Bohemian Rhapsody", 354, "Queen", "Rock", catalogo=catalogo)
+    adele = Musica("Rolling in the Deep", 228, "Adele", "Pop", catalogo=catalogo)
+    podcast = Podcast("Cinema em Debate", 1800, "CineCast", 42, "CineCast", "João Oliveira", catalogo=catalogo)
+    ana = Usuario("ana")
+    favoritas = Playlist("Favoritas", "Ana", [queen, podcast, adele])
+    banco.salvar_colecoes(usuarios=[ana], midias=[queen, adele, podcast], playlists=[favoritas])
+
+    queen.reproduzir(ana, exibir=False)
+    favoritas.reproduzir(ana)
+    queen.avaliar(5)
+    queen.avaliar(3)
+    ana.registrar_reproducao("Bohemian Rhapsody")
+    banco.fechar()
+
+
+def test_estado_volta_ao_reabrir(tmp_path):
+    gravar_execucao(tmp_path / "streaming.db")
+    gc.collect()
+
+    banco, catalogo = abrir(tmp_path / "streaming.db")
+    try:
+        assert banco.contar("midias") == 3 and banco.contar("playlists") == 1
+        assert list(banco.nomes_usuarios()) == ["Ana"]
+
+        # O catálogo vazio busca no banco (carregador) e guarda o objeto carregado
+        queen = catalogo.buscar("bohemian rhapsody")
+        assert (queen.titulo, queen.artista, queen.genero, queen.duracao) == ("Bohemian Rhapsody", "Queen", "Rock", 354)
+        assert queen.reproducoes == 2
+        assert queen.distribuicao_avaliacoes() == [0, 0, 0, 1, 0, 1] and queen.media_avaliacoes() == 4
+        assert catalogo.buscar("Bohemian Rhapsody") is queen
+
+        ana = banco.buscar_usuario("ana")
+        assert list(ana.historico) == ["Bohemian Rhapsody"]
+        (favoritas,) = ana.playlists
+        assert favoritas.reproducoes == 1
+        assert [m.titulo for m in favoritas.itens] == ["Bohemian Rhapsody", "Cinema em Debate", "Rolling in the Deep"]
+        assert favoritas.itens[0] is queen
+        podcast = favoritas.itens[1]
+        assert (podcast.episodio, podcast.temporada, podcast.host) == (42, "CineCast", "João Oliveira")
+    finally:
+        banco.fechar()
+
+
+def test_objeto_de_fora_assume_contadores_do_banco(tmp_path):
+    gravar_execucao(tmp_path / "streaming.db")
+    gc.collect()
+
+    banco, catalogo = abrir(tmp_path / "streaming.db")
+    try:
+        # Mesma chave natural (título, artista) de uma linha gravada: os contadores passam para o objeto
+        queen = Musica("Bohemian Rhapsody", 354, "Queen", "Rock", catalogo=catalogo)
+        banco.salvar_midia(queen)
+        assert queen.reproducoes == 2 and queen.quantidade_avaliacoes == 2
+        assert banco.contar("midias") == 3
+    finally:
+        banco.fechar()
+
+
+def comandos_gravados(banco) -> list:
+    """Liga o rastreio da conexão: a lista recebe cada comando SQL executado."""
+    comandos = []
+    banco.conexao.set_trace_callback(comandos.append)
+    return comandos
+
+
+def test_reproducao_nao_regrava_avaliacoes(tmp_path):
+    banco, catalogo = abrir(tmp_path / "streaming.db")
+    try:
+        musica = Musica("Muito Avaliada", 200, "Banda", catalogo=catalogo)
+        banco.salvar_midia(musica)
+        for i in range(100_000):
+            musica.avaliar(i % 6)
+        banco.gravar()
+        (tamanho,) = banco.conexao.execute("SELECT length(histograma) FROM midias").fetchone()
+        assert tamanho == 48   # histograma de 6 notas, não uma nota por byte
+
+        comandos = comandos_gravados(banco)
+        musica.reproduzir(exibir=False)
+        banco.gravar()
+        assert any(c.startswith("UPDATE midias SET reproducoes") for c in comandos)
+        assert not any("histograma" in c for c in comandos)
+    finally:
+        banco.fechar()
+
+    banco, catalogo = abrir(tmp_path / "streaming.db")
+    try:
+        musica = catalogo.buscar("Muito Avaliada")
+        assert musica.reproducoes == 1
+        assert musica.distribuicao_avaliacoes() == [16667] * 4 + [16666] * 2
+    finally:
+        banco.fechar()
+
+
+def test_alteracao_de_playlist_grava_so_o_item(tmp_path):
+    banco, catalogo = abrir(tmp_path / "streaming.db")
+    ArquivoDeMidia.usar_catalogo(catalogo)   # adicionar_midia procura no catálogo ativo
+    try:
+        musicas = [Musica(f"Faixa {i}", 100, "Banda", catalogo=catalogo) for i in range(50)]
+        playlist = Playlist("Longa", "Ana", musicas[:40])
+        BarramentoEventos.ativo.publicar(eventos.PLAYLIST_ADICIONADA, playlist)
+        banco.gravar()
+
+        comandos = comandos_gravados(banco)
+        for i in range(40, 50):
+            playlist.adicionar_midia(f"Faixa {i}")
+        playlist.remover_midia("Faixa 3")
+        playlist.remover_midia("Faixa 45")
+        banco.gravar()
+        escritas = [c for c in comandos if "playlist_itens" in c and not c.startswith("SELECT")]
+        assert len(escritas) == 12
+        assert not any(c.startswith("DELETE FROM playlist_itens WHERE playlist_id = 1") and "posicao" not in c
+                       for c in escritas)
+        esperado = [m.titulo for m in playlist.itens]
+    finally:
+        banco.fechar()
+    del playlist, musicas
+    gc.collect()
+
+    banco, _ = abrir(tmp_path / "streaming.db")
+    try:
+        assert [m.titulo for m in banco.buscar_playlist("Longa").itens] == esperado
+        assert "Faixa 3" not in esperado and "Faixa 45" not in esperado and len(esperado) == 48
+    finally:
+        banco.fechar()
+
+
+def test_banco_v1_converte_notas_em_histograma(tmp_path):
+    caminho = tmp_path / "streaming.db"
+    gravar_execucao(caminho)
+    gc.collect()
+    # Volta o banco ao formato v1: uma nota por byte na coluna 'notas'
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute("ALTER TABLE midias RENAME COLUMN histograma TO notas")
+        conexao.execute("UPDATE midias SET notas = ? WHERE titulo = 'Bohemian Rhapsody'", (bytes([5, 3, 3]),))
+        conexao.execute("PRAGMA user_version = 1")
+    conexao.close()
+
+    banco, catalogo = abrir(caminho)
+    try:
+        assert banco.conexao.execute("PRAGMA user_version").fetchone()[0] == VERSAO_ESQUEMA
+        assert catalogo.buscar("Bohemian Rhapsody").distribuicao_avaliacoes() == [0, 0, 0, 2, 0, 1]
+    finally:
+        banco.fechar()
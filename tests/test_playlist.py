@@ -0,0 +1,142 @@
+# tests/test_playlist.py
+# Itens de playlist (corda, remoção com compactação, assinatura de títulos) comparados com listas comuns.
+
+import random
+
+import pytest
+
+from Streaming.arquivo_midia import ArquivoDeMidia, Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import ItensPlaylist, Playlist
+
+
+@pytest.fixture
+def musicas():
+    catalogo = CatalogoMidia()
+    ArquivoDeMidia.usar_catalogo(catalogo)   # adicionar_midia procura no catálogo ativo
+    return [Musica(f"Faixa {i}", 100 + i, "Artista", "Pop", catalogo=catalogo) for i in range(12)]
+
+
+def test_soma_estende_a_primeira_e_devolve_copia(musicas):
+    p = Playlist("Manhã", "Ana", musicas[:5], reproducoes=2)
+    q = Playlist("Tarde", "Ana", musicas[5:8], reproducoes=3)
+
+    r = p + q
+
+    assert list(p.itens) == list(r.itens) == musicas[:8]
+    assert list(q.itens) == musicas[5:8]
+    assert p.reproducoes == r.reproducoes == 5
+    assert r == Playlist("Manhã", "Ana", musicas[:8])
+
+    # A cópia não acompanha alterações posteriores de nenhum dos lados
+    p.remover_midia("Faixa 6")
+    q.adicionar_midia("Faixa 9")
+    assert "Faixa 6" not in p and "Faixa 6" in r
+    assert list(r.itens) == musicas[:8]
+    assert list(q.itens) == musicas[5:8] + [musicas[9]]
+
+
+def test_somas_encadeadas(musicas):
+    q = Playlist("Curta", "Ana", musicas[5:8])
+    x = Playlist("Longa", "Ana", musicas[:2])
+    for _ in range(2000):
+        x = x + q
+
+    assert len(x) == 2 + 3 * 2000
+    assert x[0] is musicas[0] and x[-1] is musicas[7]
+    assert list(x.itens)[-3:] == musicas[5:8]
+    assert x.itens.ocorrencias("Faixa 6") == 2000
+
+
+def test_corda_equivale_a_lista(musicas):
+    # Rodadas curtas: cada extend pode dobrar o tamanho
+    rnd = random.Random(7)
+    for _ in range(40):
+        cordas = [ItensPlaylist(rnd.sample(musicas, rnd.randint(0, 6))) for _ in range(4)]
+        listas = [list(c) for c in cordas]
+        for _ in range(40):
+            a, b = rnd.randrange(4), rnd.randrange(4)
+            operacao = rnd.random()
+            if operacao < 0.3:
+                cordas[a].extend(cordas[b])
+                listas[a] = listas[a] + listas[b]
+            elif operacao < 0.4:
+                cordas[a] = ItensPlaylist(cordas[b])
+                listas[a] = list(listas[b])
+            elif operacao < 0.7:
+                titulo = f"Faixa {rnd.randrange(12)}"
+                removida = cordas[a].remover_titulo(titulo)
+                indice = next((i for i, m in enumerate(listas[a]) if m.titulo == titulo), None)
+                assert removida is (None if indice is None else listas[a].pop(indice))
+            else:
+                midia = rnd.choice(musicas)
+                cordas[a].append(midia)
+                listas[a].append(midia)
+            for corda, lista in zip(cordas, listas):
+                assert len(corda) == len(lista)
+                assert ("Faixa 3" in corda) == any(m.titulo == "Faixa 3" for m in lista)
+        for corda, lista in zip(cordas, listas):
+            assert list(corda) == lista
+            assert corda[1:3] == lista[1:3]
+
+
+def test_remocao_e_compactacao_equivalem_a_lista(musicas):
+    rnd = random.Random(3)
+    repetidas = musicas * 30   # títulos repetidos: a remoção tira a 1ª ocorrência
+    rnd.shuffle(repetidas)
+    itens = ItensPlaylist(repetidas)
+    lista = list(repetidas)
+
+    for _ in range(300):
+        if rnd.random() < 0.8:
+            titulo = f"Faixa {rnd.randrange(14)}"   # Faixa 12 e 13 não existem
+            removida = itens.remover_titulo(f"  {titulo} ")
+            indice = next((i for i, m in enumerate(lista) if m.titulo == titulo), None)
+            assert removida is (None if indice is None else lista.pop(indice))
+        else:
+            midia = rnd.choice(musicas)
+            itens.append(midia)
+            lista.append(midia)
+        # As marcas não passam do limite nem de metade da lista
+        assert len(itens._removidas) <= ItensPlaylist.limite_removidas
+        assert len(itens._removidas) * 2 <= len(itens._lista)
+        assert len(itens) == len(lista)
+        i = rnd.randrange(-len(lista), len(lista))
+        assert itens[i] is lista[i]
+
+    assert list(itens) == lista and itens[5:40] == lista[5:40]
+    for m in musicas:
+        assert itens.ocorrencias(m.titulo.upper()) == lista.count(m)
+        assert (m in itens) == (m in lista) and itens.contem_titulo(m.titulo) == (m in lista)
+    with pytest.raises(IndexError):
+        itens[len(lista)]
+
+
+def assinatura(titulos) -> list:
+    return sorted((t or "").strip().lower() for t in titulos)
+
+
+def test_igualdade_compara_titulos_como_multiconjunto(musicas):
+    a = Playlist("Manhã", "Ana", ["Faixa 1", "Faixa 2", "Faixa 2", "Faixa 3"])
+
+    assert a == Playlist(" manhã ", "ANA", ["faixa 2", "Faixa 3", "  FAIXA 1", "Faixa 2"])
+    assert a != Playlist("Manhã", "Ana", ["Faixa 1", "Faixa 1", "Faixa 2", "Faixa 3"])   # mesmas, outras quantidades
+    assert a != Playlist("Manhã", "Ana", ["Faixa 1", "Faixa 2", "Faixa 3"])
+    assert a != Playlist("Tarde", "Ana", list(a.itens))
+    assert a != Playlist("Manhã", "Bia", list(a.itens))
+    assert a != list(a.itens)
+
+    # Listas aleatórias: mesmo resultado que comparar as listas de títulos ordenadas
+    rnd = random.Random(5)
+    for _ in range(300):
+        x = rnd.choices(musicas[:4], k=rnd.randint(0, 6))
+        y = rnd.sample(x, len(x)) if rnd.random() < 0.4 else rnd.choices(musicas[:4], k=rnd.randint(0, 6))
+        px, py = Playlist("P", "Ana", x), Playlist("P", "Ana", y)
+        if rnd.random() < 0.5 and x:
+            # Depois de remoções e compactação a assinatura continua a mesma
+            titulo = rnd.choice(x).titulo
+            px.remover_midia(titulo)
+            x.remove(next(m for m in x if m.titulo == titulo))
+        esperado = assinatura(m.titulo for m in x) == assinatura(m.titulo for m in y)
+        assert (px == py) == esperado
+        assert (py == px) == esperado
@@ -0,0 +1,128 @@
+# tests/test_registro_erros.py
+# Log de erros com gravação em segundo plano: rotação, limite por mensagem e fila cheia.
+
+import re
+import threading
+import time
+
+import pytest
+
+from Streaming.registro_erros import RegistroErros
+
+
+def mensagens(caminho) -> list:
+    """Textos gravados no arquivo (sem cabeçalho, carimbo e nível)."""
+    if not caminho.exists():
+        return []
+    return [re.sub(r"^\[[\d: -]+\] \w+(?: \([^)]*\))?: ", "", linha)
+            for linha in caminho.read_text(encoding="utf-8").splitlines() if linha.startswith("[")]
+
+
+@pytest.fixture
+def criar(tmp_path):
+    registros = []
+
+    def criar(**opcoes) -> RegistroErros:
+        registro = RegistroErros(tmp_path / "logs" / "erros.log", **opcoes)
+        registros.append(registro)
+        return registro
+
+    yield criar
+    for registro in registros:
+        registro.fechar()
+
+
+def test_formato_das_linhas(criar):
+    registro = criar()
+    registro.registrar("falhou", fonte="Importação")
+    registro.registrar_varias(["aviso 1", "aviso 2"])
+    registro.fechar()
+
+    texto = registro.caminho.read_text(encoding="utf-8")
+    assert texto.startswith("# Log de erros/avisos\n\n")
+    linhas = texto.splitlines()[2:]
+    assert re.fullmatch(r"\[\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\] ERRO \(Importação\): falhou", linhas[0])
+    assert [l.split("] ", 1)[1] for l in linhas[1:]] == ["AVISO: aviso 1", "AVISO: aviso 2"]
+
+
+def test_rotacao_guarda_as_ultimas_copias(criar):
+    registro = criar(tamanho_max=2000, copias=2)
+    textos = [f"mensagem número {i:04d} " + "x" * 40 for i in range(300)]
+    for texto in textos:
+        registro.registrar(texto)
+    registro.fechar()
+
+    arquivos = [registro.caminho.with_name("erros.log.2"), registro.caminho.with_name("erros.log.1"), registro.caminho]
+    assert all(a.exists() for a in arquivos) and not registro.caminho.with_name("erros.log.3").exists()
+    assert all(a.stat().st_size <= 2000 for a in arquivos)
+    # As mais antigas saíram; as que restam estão em ordem, sem falhas, do .2 ao atual
+    guardadas = sum((mensagens(a) for a in arquivos), [])
+    assert guardadas == textos[-len(guardadas):]
+    assert len(guardadas) > 2 * 20
+
+
+def test_rotacao_sem_copias(criar):
+    registro = criar(tamanho_max=1000, copias=0)
+    textos = [f"mensagem {i} " + "y" * 50 for i in range(100)]
+    for texto in textos:
+        registro.registrar(texto)
+    registro.fechar()
+
+    assert list(registro.caminho.parent.iterdir()) == [registro.caminho]
+    guardadas = mensagens(registro.caminho)
+    assert guardadas and guardadas == textos[-len(guardadas):]
+
+
+def test_limite_por_mensagem_resume_as_repeticoes(criar):
+    registro = criar(limite_repeticoes=3)
+    for _ in range(10):
+        registro.registrar("disco lento")
+        registro.registrar("disco lento", nivel="AVISO")   # outro nível: outro limite
+    registro.registrar("outra")
+    registro.fechar()
+
+    assert registro.suprimidas == 14
+    gravadas = mensagens(registro.caminho)
+    assert gravadas.count("disco lento") == 6 and "outra" in gravadas
+    assert gravadas.count("(+7 repetições suprimidas) disco lento") == 2
+
+
+def test_janela_vencida_libera_a_mensagem(criar):
+    registro = criar(limite_repeticoes=2, janela=0.2, intervalo=0.05)
+    for _ in range(5):
+        registro.registrar("instável")
+    time.sleep(0.5)   # a thread grava o resumo da janela vencida sem esperar nova mensagem
+    registro.descarregar()
+    assert mensagens(registro.caminho) == ["instável", "instável", "(+3 repetições suprimidas) instável"]
+
+    registro.registrar("instável")
+    registro.fechar()
+    assert mensagens(registro.caminho)[-1] == "instável"
+
+
+def test_fila_cheia_descarta_sem_travar(criar):
+    registro = criar(capacidade=10)
+    gravando, liberar = threading.Event(), threading.Event()
+    gravar_linhas = registro._gravar_linhas
+
+    def gravar_devagar(linhas):
+        gravando.set()
+        liberar.wait(5)   # disco travado
+        gravar_linhas(linhas)
+
+    registro._gravar_linhas = gravar_devagar
+    registro.registrar("primeira")
+    assert gravando.wait(5)
+
+    inicio = time.perf_counter()
+    for i in range(25):
+        registro.registrar(f"mensagem {i}")
+    registro.registrar_varias([f"lote {i}" for i in range(4)])   # um item com 4 mensagens
+    assert time.perf_counter() - inicio < 1
+    liberar.set()
+    registro.fechar()
+
+    assert registro.descartadas == 15 + 4
+    gravadas = mensagens(registro.caminho)
+    assert gravadas[:11] == ["primeira"] + [f"mensagem {i}" for i in range(10)]
+    assert "19 mensagens descartadas (fila do log cheia)" in gravadas
@@ -0,0 +1,69 @@
+# tests/test_reimportacao.py
+# Reimportação incremental (LerMarkdown.reimport) comparada com a leitura completa.
+
+from Streaming.catalogo import CatalogoMidia
+from config.lermarkdown import LerMarkdown
+
+
+def estado(resultado) -> tuple:
+    usuarios = sorted((u.nome, sorted(p.nome for p in u.playlists)) for u in resultado["usuarios"])
+    midias = sorted((type(m).__name__, m.titulo, m.artista, m.duracao, getattr(m, "genero", None),
+                     getattr(m, "episodio", None), getattr(m, "temporada", None))
+                    for m in resultado["musicas"] + resultado["podcasts"])
+    playlists = sorted((p.nome, p.usuario, tuple(m.titulo for m in p.itens)) for p in resultado["playlists"])
+    return usuarios, midias, playlists
+
+
+def leitura_completa(texto: str):
+    return LerMarkdown(catalogo=CatalogoMidia()).parse(texto)
+
+
+def test_primeira_reimportacao_importa_tudo(tmp_path, exemplo):
+    arquivo = tmp_path / "catalogo.md"
+    arquivo.write_text(exemplo, encoding="utf-8")
+    catalogo = CatalogoMidia()
+    r = LerMarkdown(catalogo=catalogo).reimport(str(arquivo))
+
+    assert estado(r) == estado(leitura_completa(exemplo))
+    assert r["diff"]["midias"]["adicionados"] == 8
+    assert r["diff"]["playlists"]["adicionados"] == 5
+    assert len(catalogo) == 8
+
+
+def test_arquivo_intocado_nao_gera_diferencas(tmp_path, exemplo):
+    arquivo = tmp_path / "catalogo.md"
+    arquivo.write_text(exemplo, encoding="utf-8")
+    leitor = LerMarkdown(catalogo=CatalogoMidia())
+    leitor.reimport(str(arquivo))
+    r = leitor.reimport(str(arquivo))
+
+    for grupo in ("usuarios", "midias", "playlists"):
+        assert r["diff"][grupo]["adicionados"] == r["diff"][grupo]["atualizados"] == r["diff"][grupo]["removidos"] == 0
+
+
+def test_alteracoes_mantem_objetos_e_equivalem_a_leitura_completa(tmp_path, exemplo):
+    arquivo = tmp_path / "catalogo.md"
+    arquivo.write_text(exemplo, encoding="utf-8")
+    catalogo = CatalogoMidia()
+    leitor = LerMarkdown(catalogo=catalogo)
+    antes = {m.titulo: m for m in leitor.reimport(str(arquivo))["musicas"]}
+
+    # Artista alterado, uma música removida (e tirada das playlists) e uma nova
+    texto = (exemplo.replace("artista: Queen", "artista: Queen + Adam Lambert")
+                    .replace("- titulo: Fur Elise  \n    artista: Beethoven  \n    genero: Classico  \n    duracao: 180\n", "")
+                    .replace("[Fur Elise, Inteligência Artificial Hoje]", "[Inteligência Artificial Hoje, Yesterday]")
+                    .replace("[História da Música, Fur Elise]", "[História da Música]")
+                    .replace("\n---\n\n# Podcasts", "- titulo: Yesterday  \n    artista: The Beatles  \n"
+                                                     "    genero: Pop  \n    duracao: 125\n\n---\n\n# Podcasts"))
+    arquivo.write_text(texto, encoding="utf-8")
+    r = leitor.reimport(str(arquivo))
+
+    assert estado(r) == estado(leitura_completa(texto))
+    assert r["diff"]["midias"] == {"adicionados": 1, "atualizados": 1, "removidos": 1}
+    depois = {m.titulo: m for m in r["musicas"]}
+    assert depois["Bohemian Rhapsody"] is antes["Bohemian Rhapsody"]
+    assert depois["Bohemian Rhapsody"].artista == "Queen + Adam Lambert"
+    assert depois["Shape of You"] is antes["Shape of You"]
+    assert catalogo.buscar("Fur Elise") is None
+    assert catalogo.buscar("yesterday") is depois["Yesterday"]
+    assert len(catalogo) == len(r["musicas"]) + len(r["podcasts"])
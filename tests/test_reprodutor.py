@@ -0,0 +1,63 @@
+# tests/test_reprodutor.py
+# Comandos do reprodutor chamados de outra thread (o menu): resultado, erro e loop ocupado.
+
+import threading
+import time
+
+import pytest
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from Streaming.reprodutor import ReprodutorAssincrono
+from Streaming.usuario import Usuario
+
+
+@pytest.fixture
+def reprodutor():
+    reprodutor = ReprodutorAssincrono(exibir=False).iniciar()
+    yield reprodutor
+    reprodutor.parar(espera=1)
+
+
+@pytest.fixture
+def ana():
+    return Usuario("Ana")
+
+
+@pytest.fixture
+def playlist():
+    catalogo = CatalogoMidia()
+    return Playlist("Longas", "Ana", [Musica(f"Faixa {i}", 600, "Banda", catalogo=catalogo) for i in range(3)])
+
+
+def test_comando_ja_aparece_no_estado(reprodutor, ana, playlist):
+    reprodutor.enfileirar(ana, playlist)
+    reprodutor.pausar(ana)
+    assert reprodutor.estado(ana)["pausado"] is True
+
+    reprodutor.pular(ana)
+    assert reprodutor.estado(ana)["midia"] is playlist.itens[1]
+
+
+def test_erro_do_comando_volta_para_quem_chamou(reprodutor, ana):
+    with pytest.raises(AttributeError):
+        reprodutor.enfileirar(ana, "não é playlist")
+
+
+def test_loop_ocupado_vira_timeout_e_comando_nao_roda_depois(reprodutor, ana, playlist, ambiente_isolado):
+    reprodutor.enfileirar(ana, playlist)
+    reprodutor.espera_comando = 0.1
+    liberar = threading.Event()
+    reprodutor._loop.call_soon_threadsafe(liberar.wait, 5)   # prende o loop
+
+    try:
+        with pytest.raises(TimeoutError, match="pausar"):
+            reprodutor.pausar(ana)
+    finally:
+        liberar.set()
+    time.sleep(0.1)
+
+    assert reprodutor.estado(ana)["pausado"] is False
+    ambiente_isolado.descarregar()
+    assert "comando 'pausar' não executado" in ambiente_isolado.caminho.read_text(encoding="utf-8")
@@ -0,0 +1,108 @@
+# tests/test_saida.py
+# Saída do console em lotes: poucas escritas, nenhuma linha perdida ou fora de ordem.
+
+import io
+import json
+import threading
+
+from Streaming.arquivo_midia import Musica
+from Streaming.catalogo import CatalogoMidia
+from Streaming.playlist import Playlist
+from Streaming.saida import MIDIA_ADICIONADA, REPRODUZINDO, Saida, SaidaConsole, SaidaEstruturada
+
+
+class Fluxo(io.StringIO):
+    """StringIO que conta as chamadas de write."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, texto):
+        self.writes += 1
+        return super().write(texto)
+
+
+def linhas_esperadas(n: int, inicio: int = 0) -> list:
+    return [f"Mídia 'Faixa {i}' adicionada à playlist 'Lote'." for i in range(inicio, inicio + n)]
+
+
+def emitir_varias(saida, n: int, inicio: int = 0) -> list:
+    for i in range(inicio, inicio + n):
+        saida.emitir(MIDIA_ADICIONADA, titulo=f"Faixa {i}", playlist="Lote")
+    return linhas_esperadas(n, inicio)
+
+
+def test_lotes_e_descarregar():
+    fluxo = Fluxo()
+    saida = SaidaConsole(fluxo, linhas_lote=100)
+
+    esperado = emitir_varias(saida, 250)
+    assert fluxo.writes == saida.escritas == 2
+    assert fluxo.getvalue().splitlines() == esperado[:200]   # as 50 últimas ainda no buffer
+
+    saida.descarregar()
+    assert fluxo.writes == 3 and fluxo.getvalue().splitlines() == esperado
+    saida.descarregar()   # buffer vazio: nenhuma escrita
+    assert fluxo.writes == 3
+
+
+def test_trocar_a_saida_ativa_descarrega_a_anterior():
+    fluxo = Fluxo()
+    console = SaidaConsole(fluxo)
+    anterior = Saida.usar(console)
+    esperado = emitir_varias(Saida.ativa, 10)
+    assert fluxo.writes == 0
+
+    Saida.usar(anterior)
+
+    assert fluxo.writes == 1 and fluxo.getvalue().splitlines() == esperado
+
+
+def test_emissao_de_varias_threads():
+    fluxo = Fluxo()
+    saida = SaidaConsole(fluxo, linhas_lote=64)
+    esperados = [linhas_esperadas(1000, t * 1000) for t in range(8)]
+    threads = [threading.Thread(target=emitir_varias, args=(saida, 1000, t * 1000)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    saida.descarregar()
+
+    linhas = fluxo.getvalue().splitlines()
+    assert sorted(linhas) == sorted(sum(esperados, []))
+    # Cada thread mantém a sua ordem, e as escritas são uma por lote
+    for esperado in esperados:
+        conjunto = set(esperado)
+        assert [l for l in linhas if l in conjunto] == esperado
+    assert fluxo.writes == saida.escritas <= 8000 // 64 + 1
+
+
+def test_playlist_longa_em_poucas_escritas():
+    fluxo = Fluxo()
+    Saida.usar(SaidaConsole(fluxo))
+    catalogo = CatalogoMidia()
+    playlist = Playlist("Longa", "Ana", [Musica(f"Faixa {i}", 100, "Banda", catalogo=catalogo) for i in range(2000)])
+
+    playlist.reproduzir()
+    Saida.ativa.descarregar()
+
+    linhas = fluxo.getvalue().splitlines()
+    assert len(linhas) == 2000 and linhas[0].startswith("-> Reproduzindo: 'Faixa 0'")
+    assert fluxo.writes == -(-2000 // SaidaConsole.linhas_lote)
+
+
+def test_saida_estruturada_uma_linha_json_por_mensagem():
+    fluxo = Fluxo()
+    saida = SaidaEstruturada(fluxo)
+
+    saida.emitir(REPRODUZINDO, titulo="Ária", artista="Banda", duracao=100, reproducoes=3)
+    emitir_varias(saida, 2)
+    saida.descarregar()
+
+    registros = [json.loads(l) for l in fluxo.getvalue().splitlines()]
+    assert [r["evento"] for r in registros] == [REPRODUZINDO, MIDIA_ADICIONADA, MIDIA_ADICIONADA]
+    assert registros[0]["titulo"] == "Ária" and registros[0]["reproducoes"] == 3
+    assert all(isinstance(r["instante"], float) for r in registros)
+    assert fluxo.writes == 1
@@ -0,0 +1,91 @@
+# tests/test_servidor.py
+# Servidor de sessões em localhost: respostas de erro do protocolo sem derrubar a conexão.
+
+import asyncio
+import json
+
+import pytest
+
+from main import StreamingApp
+from Streaming.arquivo_midia import Musica
+from Streaming.saida import SaidaSilenciosa
+from Streaming.servidor import ServidorSessoes
+
+
+@pytest.fixture
+def app():
+    app = StreamingApp(saida=SaidaSilenciosa())
+    app.musicas.append(Musica("Yesterday", 125, "The Beatles", "Pop"))
+    app.criar_novo_usuario("Ana")
+    yield app
+    app.encerrar()
+
+
+def conversar(app, linhas, fechar_escrita: bool = False) -> list:
+    """Envia as linhas (bytes) numa conexão e devolve as respostas, uma por linha enviada."""
+    async def sessao():
+        servidor = await ServidorSessoes(app, porta=0).iniciar()
+        try:
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", servidor.porta)
+            respostas = []
+            for linha in linhas:
+                escritor.write(linha)
+                await escritor.drain()
+                if fechar_escrita and linha is linhas[-1]:
+                    escritor.write_eof()
+                respostas.append(json.loads(await asyncio.wait_for(leitor.readline(), 10)))
+            escritor.close()
+            return respostas
+        finally:
+            await servidor.parar()
+    return asyncio.run(sessao())
+
+
+def pedido(**campos) -> bytes:
+    return json.dumps(campos).encode("utf-8") + b"\n"
+
+
+def test_pedidos_invalidos_recebem_erro_e_a_conexao_continua(app):
+    respostas = conversar(app, [
+        b"{nao e json\n",
+        b"[1, 2]\n",
+        pedido(id=3, op="voar"),
+        pedido(id=4, op="listar_musicas"),
+        pedido(id=5, op="entrar"),
+        pedido(id=6, op="entrar", nome="ana"),
+        pedido(id=7, op="listar_musicas"),
+    ])
+
+    assert [r["ok"] for r in respostas] == [False] * 5 + [True, True]
+    assert [r["id"] for r in respostas[2:]] == [3, 4, 5, 6, 7]
+    assert "login" in respostas[3]["erro"] and "nome" in respostas[4]["erro"]
+    assert [m["titulo"] for m in respostas[6]["dados"]] == ["Yesterday"]
+
+
+def test_falha_inesperada_vira_erro_interno_e_vai_para_o_log(app, ambiente_isolado):
+    # int(1e400) estoura em _pagina (OverflowError, fora dos erros de pedido)
+    respostas = conversar(app, [
+        pedido(id=1, op="entrar", nome="Ana"),
+        b'{"id": 2, "op": "listar_musicas", "tamanho": 1e400}\n',
+        pedido(id=3, op="ping"),
+    ])
+
+    assert respostas[1] == {"id": 2, "ok": False, "erro": "erro interno (OverflowError)"}
+    assert respostas[2]["ok"] is True
+    ambiente_isolado.descarregar()
+    assert "OverflowError" in ambiente_isolado.caminho.read_text(encoding="utf-8")
+
+
+def test_pedido_acima_do_limite_e_descartado_inteiro(app):
+    gigante = b'{"op": "ping", "x": "' + b"a" * (ServidorSessoes.limite_pedido * 3) + b'"}\n'
+
+    respostas = conversar(app, [gigante, pedido(id=2, op="ping")])
+
+    assert respostas[0]["ok"] is False and "maior que" in respostas[0]["erro"]
+    assert respostas[1]["id"] == 2 and respostas[1]["ok"] is True
+
+
+def test_ultima_linha_sem_quebra_e_respondida(app):
+    respostas = conversar(app, [b'{"id": 9, "op": "ping"}'], fechar_escrita=True)
+
+    assert respostas[0]["id"] == 9 and respostas[0]["ok"] is True
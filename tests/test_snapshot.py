@@ -0,0 +1,88 @@
+# tests/test_snapshot.py
+# Snapshot binário do LerMarkdown: quando é reaproveitado e quando o parsing é refeito.
+
+import os
+
+import pytest
+
+from Streaming.catalogo import CatalogoMidia
+from config import lermarkdown
+from config.lermarkdown import LerMarkdown
+
+
+def estado(resultado) -> tuple:
+    midias = sorted((type(m).__name__, m.titulo, m.artista, m.duracao)
+                    for m in resultado["musicas"] + resultado["podcasts"])
+    playlists = sorted((p.nome, p.usuario, tuple(m.titulo for m in p.itens)) for p in resultado["playlists"])
+    return sorted(u.nome for u in resultado["usuarios"]), midias, playlists
+
+
+@pytest.fixture
+def arquivo(tmp_path, exemplo):
+    caminho = tmp_path / "catalogo.md"
+    caminho.write_text(exemplo, encoding="utf-8")
+    return caminho
+
+
+def leitor(tmp_path) -> LerMarkdown:
+    ler = LerMarkdown(catalogo=CatalogoMidia())
+    ler._cache_dir = tmp_path / "cache"   # fora do cache/ do projeto
+    return ler
+
+
+def test_segunda_leitura_vem_do_snapshot(tmp_path, arquivo):
+    primeira = leitor(tmp_path).from_file(str(arquivo), cache=True)
+    segunda = leitor(tmp_path).from_file(str(arquivo), cache=True)
+
+    assert primeira["snapshot"] is False and segunda["snapshot"] is True
+    assert estado(segunda) == estado(primeira)
+    assert len(list((tmp_path / "cache").glob("*.snap"))) == 1
+
+
+def test_sem_cache_nao_grava_snapshot(tmp_path, arquivo):
+    leitor(tmp_path).from_file(str(arquivo))
+
+    assert not (tmp_path / "cache").exists()
+
+
+def test_fonte_editada_refaz_o_parsing(tmp_path, arquivo, exemplo):
+    leitor(tmp_path).from_file(str(arquivo), cache=True)
+    st = arquivo.stat()
+
+    # Mesmo tamanho, mtime diferente, conteúdo diferente: o sha256 decide
+    editado = exemplo.replace("duracao: 354", "duracao: 355")
+    arquivo.write_text(editado, encoding="utf-8")
+    os.utime(arquivo, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    r = leitor(tmp_path).from_file(str(arquivo), cache=True)
+    assert r["snapshot"] is False
+    assert next(m.duracao for m in r["musicas"] if m.titulo == "Bohemian Rhapsody") == 355
+
+    # Só o mtime muda (conteúdo igual): o sha256 gravado no último snapshot confirma
+    os.utime(arquivo, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+    r = leitor(tmp_path).from_file(str(arquivo), cache=True)
+    assert r["snapshot"] is True
+    assert next(m.duracao for m in r["musicas"] if m.titulo == "Bohemian Rhapsody") == 355
+
+
+def test_snapshot_de_outra_versao_refaz_o_parsing(tmp_path, arquivo):
+    esperado = estado(leitor(tmp_path).from_file(str(arquivo), cache=True))
+    (snap,) = (tmp_path / "cache").glob("*.snap")
+    dados = bytearray(snap.read_bytes())
+    dados[len(lermarkdown.SNAPSHOT_MAGIC)] = lermarkdown.SNAPSHOT_VERSION + 1
+    snap.write_bytes(bytes(dados))
+
+    r = leitor(tmp_path).from_file(str(arquivo), cache=True)
+
+    assert r["snapshot"] is False and estado(r) == esperado
+    assert leitor(tmp_path).from_file(str(arquivo), cache=True)["snapshot"] is True   # regravado
+
+
+@pytest.mark.parametrize("tamanho", [0, 4, len(lermarkdown.SNAPSHOT_MAGIC), len(lermarkdown.SNAPSHOT_MAGIC) + 1, 40])
+def test_snapshot_cortado_refaz_o_parsing(tmp_path, arquivo, tamanho):
+    esperado = estado(leitor(tmp_path).from_file(str(arquivo), cache=True))
+    (snap,) = (tmp_path / "cache").glob("*.snap")
+    snap.write_bytes(snap.read_bytes()[:tamanho])
+
+    r = leitor(tmp_path).from_file(str(arquivo), cache=True)
+
+    assert r["snapshot"] is False and estado(r) == esperado